@@ -8,7 +8,9 @@
 
 """
 
+import os
 import sys
+import logging
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
@@ -16,6 +18,9 @@ sys.path.insert(0, str(Path(__file__).parent))
 from rag.graph import createRAGGraph
 from rag.constants import HOTEL_KEYWORDS
 
+# CLI는 디버깅용 → 기본 DEBUG (노드별 진단 로그 출력)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "DEBUG").upper(), format="%(message)s")
+
 
 # 호텔 목록
 HOTELS = [
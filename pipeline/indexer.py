@@ -5,10 +5,12 @@ Vector DB 인덱싱 모듈
 - 다국어 임베딩 모델 사용 (한/영/일 지원)
 """
 
+import os
 import json
 import re
 import pickle
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from concurrent.futures import ThreadPoolExecutor
@@ -18,6 +20,11 @@ from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 from rank_bm25 import BM25Okapi
 
+# 임베딩 디바이스 (cuda / mps / cpu, 미지정 시 sentence-transformers 자동 선택)
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE") or None
+# 쿼리 임베딩 캐시 크기 (폴백 재검색/호텔별 병렬 검색에서 동일 쿼리 재인코딩 방지)
+QUERY_EMBEDDING_CACHE_SIZE = 256
+
 
 def tokenizeKorean(text: str) -> list[str]:
     """한국어 토크나이저 (간단한 형태소 분리)"""
@@ -44,8 +51,16 @@ class Indexer:
         # 임베딩 모델 로드
         self.modelName = modelName or self.DEFAULT_MODEL
         print(f"[모델 로딩] {self.modelName}...")
-        self.model = SentenceTransformer(self.modelName)
-        print(f"  -> 로딩 완료 (차원: {self.model.get_sentence_embedding_dimension()})")
+        try:
+            self.model = SentenceTransformer(self.modelName, device=EMBEDDING_DEVICE)
+        except RuntimeError as e:
+            # 지정 디바이스(GPU) 사용 불가 → CPU 폴백
+            print(f"  -> {EMBEDDING_DEVICE} 사용 불가, CPU로 폴백: {e}")
+            self.model = SentenceTransformer(self.modelName, device="cpu")
+        print(f"  -> 로딩 완료 (차원: {self.model.get_sentence_embedding_dimension()}, 디바이스: {self.model.device})")
+
+        # 쿼리 임베딩 캐시 (인스턴스별)
+        self._encodeQuery = lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)(self._encodeQueryUncached)
 
         # Chroma DB 초기화 (영구 저장)
         self.client = chromadb.PersistentClient(
@@ -195,6 +210,19 @@ class Indexer:
         )
         print(f"[삭제 완료] {hotelKey}")
 
+    def _encodeQueryUncached(self, queryText: str) -> tuple:
+        """쿼리 임베딩 생성 (캐시 공유를 위해 불변 tuple 반환)"""
+        return tuple(self.model.encode(queryText).tolist())
+
+    def encodeQuery(self, query: str) -> list[float]:
+        """쿼리 임베딩 (동일 쿼리는 캐시 재사용)"""
+        # E5 모델용 query prefix
+        if "e5" in self.modelName.lower():
+            queryText = f"query: {query}"
+        else:
+            queryText = query
+        return list(self._encodeQuery(queryText))
+
     def searchVector(
         self,
         query: str,
@@ -203,14 +231,7 @@ class Indexer:
         topK: int = 5
     ) -> list[dict]:
         """벡터 검색 (Semantic)"""
-        # E5 모델용 query prefix
-        if "e5" in self.modelName.lower():
-            queryText = f"query: {query}"
-        else:
-            queryText = query
-
-        # 임베딩 생성
-        queryEmbedding = self.model.encode(queryText).tolist()
+        queryEmbedding = self.encodeQuery(query)
 
         # 필터 조건 구성
         whereFilter = None
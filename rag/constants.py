@@ -232,6 +232,15 @@ MIN_CHUNKS_REQUIRED = 1   # 최소 필요 청크 수
 LLM_MODEL = "qwen2.5:7b"
 LLM_ENABLED = True  # LLM 사용 여부 (False면 검색 결과 직접 반환)
 
+# 카테고리별 답변 생성 토큰 상한 (단답형 카테고리는 디코드 길이 축소, 미지정 카테고리는 동적 값 그대로)
+ANSWER_TOKEN_BUDGET = {
+    "체크인/아웃": 150,
+    "주차": 150,
+    "예약/조회": 180,
+    "조식": 180,
+    "반려동물": 180,
+}
+
 # 호텔 키워드 매핑 (오타/변형/지역명 포함)
 HOTEL_KEYWORDS = {
     "josun_palace": [
@@ -320,6 +329,18 @@ CATEGORY_KEYWORDS = {
     ],
 }
 
+# 소문자 키워드 테이블 (전처리 매칭용, 요청마다 keyword.lower() 반복 방지)
+HOTEL_KEYWORDS_LOWER = {
+    hotelKey: tuple(kw.lower() for kw in keywords)
+    for hotelKey, keywords in HOTEL_KEYWORDS.items()
+}
+CATEGORY_KEYWORDS_LOWER = {
+    category: tuple(kw.lower() for kw in keywords)
+    for category, keywords in CATEGORY_KEYWORDS.items()
+}
+# 여러 분류에 중복 등록된 키워드는 1회만 유지 (순서 보존)
+VALID_QUERY_KEYWORDS_LOWER = tuple(dict.fromkeys(kw.lower() for kw in VALID_QUERY_KEYWORDS))
+
 # 동의어 사전 (쿼리 확장용) - 동의어 = 같은 것의 다른 표현만 등록
 _RAW_SYNONYM_DICT = {
     # ===== 1. 숙박/체크인 =====
@@ -1,22 +1,58 @@
 """
 LangGraph 기반 RAG 플로우 오케스트레이터
-- 9개 노드를 조합하여 RAG 파이프라인 구성
+- 10개 노드를 조합하여 RAG 파이프라인 구성
 - 노드 구현은 nodes_*.py 모듈에 분리
 """
 
+import logging
 import time
+import asyncio
 from functools import partial
-from typing import Literal
+from typing import Literal, Optional
 from pathlib import Path
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 
 from rag.state import RAGState
-from rag.nodes_preprocess import queryRewriteNode, preprocessNode, clarificationCheckNode
+from rag.semantic_cache import getSemanticCache
+from rag.nodes_preprocess import (
+    queryRewriteNode, preprocessNode, clarificationCheckNode, clarificationGateNode,
+)
 from rag.nodes_retrieve import retrieveNode, evidenceGateNode
-from rag.nodes_compose import answerComposeNode
+from rag.nodes_compose import answerComposeNode, answerComposeNodeAsync
 from rag.nodes_verify import answerVerifyNode, policyFilterNode, logNode
 
+logger = logging.getLogger(__name__)
+
+# 초기 상태의 불변 기본값 (요청마다 dict 복사로 시작, 가변 컨테이너는 요청별로 새로 생성)
+_INITIAL_STATE_DEFAULTS = {
+    "rewritten_query": "",
+    "language": "",
+    "detected_hotel": None,
+    "category": None,
+    "normalized_query": "",
+    "query_lower": "",
+    "original_query_lower": "",
+    "is_valid_query": True,
+    "needs_clarification": False,
+    "clarification_question": "",
+    "clarification_type": None,
+    "retrieved_chunks_count": 0,
+    "top_score": 0.0,
+    "evidence_passed": False,
+    "evidence_reason": "",
+    "answer": "",
+    "verification_passed": True,
+    "verified_answer": "",
+    "grounding_result": None,
+    "conversation_topic": None,
+    "effective_category": None,
+    "policy_passed": False,
+    "policy_reason": "",
+    "final_answer": "",
+}
+
 
 class RAGGraph:
     """LangGraph RAG 그래프 오케스트레이터"""
@@ -27,6 +63,9 @@ class RAGGraph:
         self.logPath = self.basePath / "data" / "logs"
         self.logPath.mkdir(parents=True, exist_ok=True)
 
+        # 시맨틱 캐시 임베딩 함수 주입 (인덱서 임베딩 모델 공유)
+        getSemanticCache().setEncoder(indexer.encodeQuery)
+
         # 그래프 생성
         self.graph = self._buildGraph()
 
@@ -39,29 +78,35 @@ class RAGGraph:
         workflow.add_node("preprocess", preprocessNode)
         workflow.add_node("clarification_check", clarificationCheckNode)
         workflow.add_node("retrieve", partial(retrieveNode, indexer=self.indexer))
+        workflow.add_node("clarification_gate", clarificationGateNode)
         workflow.add_node("evidence_gate", evidenceGateNode)
-        workflow.add_node("answer_compose", answerComposeNode)
+        # invoke → 동기 노드, ainvoke → 비동기 노드 (Ollama 병렬 슬롯 활용)
+        workflow.add_node("answer_compose", RunnableLambda(answerComposeNode, afunc=answerComposeNodeAsync))
         workflow.add_node("answer_verify", answerVerifyNode)
         workflow.add_node("policy_filter", policyFilterNode)
         workflow.add_node("log", partial(logNode, logPath=self.logPath))
 
         # 엣지 정의
         workflow.set_entry_point("query_rewrite")
+        # preprocess는 재작성된 질문 기준으로 호텔/카테고리/유효성을 판정하므로 순차 실행
+        # (예: "그럼 수영장은?" → 재작성 "조선 팰리스 수영장" 에서 호텔 감지)
         workflow.add_edge("query_rewrite", "preprocess")
+        # 명확화 체크와 검색을 병렬 실행 (선행 검색)
+        # 대부분 질문은 명확화가 불필요하므로 검색을 미리 시작하고, 명확화 시에만 결과 폐기
         workflow.add_edge("preprocess", "clarification_check")
+        workflow.add_edge("preprocess", "retrieve")
+        workflow.add_edge(["clarification_check", "retrieve"], "clarification_gate")
 
         # 명확화 필요 여부에 따른 분기
         workflow.add_conditional_edges(
-            "clarification_check",
+            "clarification_gate",
             self._clarificationRouter,
             {
-                "clarify": "log",      # 명확화 필요 → 바로 로그로 (질문 반환)
-                "proceed": "retrieve"  # 명확화 불필요 → 검색 진행
+                "clarify": "log",           # 명확화 필요 → 바로 로그로 (질문 반환)
+                "proceed": "evidence_gate"  # 명확화 불필요 → 선행 검색 결과로 진행
             }
         )
 
-        workflow.add_edge("retrieve", "evidence_gate")
-
         # evidence_gate 조건부 분기
         workflow.add_conditional_edges(
             "evidence_gate",
@@ -87,84 +132,96 @@ class RAGGraph:
         """명확화 필요 여부에 따른 라우팅"""
         return "clarify" if state.get("needs_clarification", False) else "proceed"
 
-    def chat(self, query: str, hotel: str = None, history: list = None,
-             sessionCtx=None) -> dict:
-        """채팅 실행
-
-        Args:
-            query: 사용자 질문
-            hotel: 호텔 ID (선택)
-            history: 대화 히스토리 (선택)
-            sessionCtx: 세션 컨텍스트 객체 (선택, ConversationContext)
-        """
-        pipelineStart = time.time()
-
-        initialState: RAGState = {
+    def _buildInitialState(self, query: str, hotel: str, history: list,
+                           sessionCtx, pipelineStart: float) -> RAGState:
+        """그래프 초기 상태 구성"""
+        return {
+            **_INITIAL_STATE_DEFAULTS,
             "query": query,
             "hotel": hotel,
             "history": history,
-            "rewritten_query": "",
-            "language": "",
-            "detected_hotel": None,
-            "category": None,
-            "normalized_query": "",
-            "is_valid_query": True,
-            "needs_clarification": False,
-            "clarification_question": "",
+            "candidate_hotels": [],
             "clarification_options": [],
-            "clarification_type": None,
             "retrieved_chunks": [],
-            "top_score": 0.0,
-            "evidence_passed": False,
-            "evidence_reason": "",
-            "answer": "",
             "sources": [],
-            "verification_passed": True,
             "verification_issues": [],
-            "verified_answer": "",
-            "grounding_result": None,
             "query_intents": [],
-            "conversation_topic": None,
-            "effective_category": None,
             "session_context": sessionCtx,
-            "policy_passed": False,
-            "policy_reason": "",
-            "final_answer": "",
             "log": {},
             "_pipeline_start": pipelineStart,
         }
 
-        # 그래프 실행
-        result = self.graph.invoke(initialState)
-
+    def _finalizeResult(self, finalState: dict, query: str, sessionCtx,
+                        pipelineStart: float) -> dict:
+        """세션 업데이트 + 응답 dict 구성"""
         pipelineElapsed = time.time() - pipelineStart
-        print(f"[타이밍] 전체 파이프라인: {pipelineElapsed:.1f}s")
+        logger.info("[타이밍] 전체 파이프라인: %.1fs", pipelineElapsed)
 
         # 세션 업데이트
         if sessionCtx:
-            detectedTopic = result.get("category") or result.get("conversation_topic")
-            sessionCtx.updateTopic(detectedTopic, result.get("detected_hotel"))
+            detectedTopic = finalState.get("category") or finalState.get("conversation_topic")
+            sessionCtx.updateTopic(detectedTopic, finalState.get("detected_hotel"))
             sessionCtx.cacheChunks(
-                result.get("retrieved_chunks", []),
+                finalState.get("retrieved_chunks", []),
                 query
             )
 
         return {
-            "answer": result["final_answer"],
-            "hotel": result["detected_hotel"],
-            "category": result["category"],
-            "evidence_passed": result["evidence_passed"],
-            "verification_passed": result.get("verification_passed", True),
-            "sources": result["sources"],
-            "score": result["top_score"],
-            "needs_clarification": result.get("needs_clarification", False),
-            "clarification_question": result.get("clarification_question", ""),
-            "clarification_options": result.get("clarification_options", []),
-            "clarification_type": result.get("clarification_type"),
-            "clarification_subject": result.get("clarification_subject"),
+            "answer": finalState.get("final_answer", ""),
+            "hotel": finalState.get("detected_hotel"),
+            "category": finalState.get("category"),
+            "evidence_passed": finalState.get("evidence_passed", False),
+            "verification_passed": finalState.get("verification_passed", True),
+            "sources": finalState.get("sources", []),
+            "score": finalState.get("top_score", 0),
+            "needs_clarification": finalState.get("needs_clarification", False),
+            "clarification_question": finalState.get("clarification_question", ""),
+            "clarification_options": finalState.get("clarification_options", []),
+            "clarification_type": finalState.get("clarification_type"),
+            "clarification_subject": finalState.get("clarification_subject"),
             "original_query": query,
         }
 
+    def chat(self, query: str, hotel: str = None, history: list = None,
+             sessionCtx=None) -> dict:
+        """채팅 실행
+
+        Args:
+            query: 사용자 질문
+            hotel: 호텔 ID (선택)
+            history: 대화 히스토리 (선택)
+            sessionCtx: 세션 컨텍스트 객체 (선택, ConversationContext)
+        """
+        pipelineStart = time.time()
+        initialState = self._buildInitialState(query, hotel, history, sessionCtx, pipelineStart)
+
+        # 그래프 실행
+        result = self.graph.invoke(initialState)
+
+        return self._finalizeResult(result, query, sessionCtx, pipelineStart)
+
+    async def chatAsync(self, query: str, hotel: str = None, history: list = None,
+                        sessionCtx=None) -> dict:
+        """채팅 실행 (비동기)
+
+        동기 노드는 LangGraph가 스레드풀에서 실행하고, 답변 생성 LLM 호출은
+        AsyncClient로 수행하여 동시 사용자 요청이 Ollama 병렬 슬롯
+        (OLLAMA_NUM_PARALLEL)에서 함께 처리되도록 한다.
+
+        Args:
+            query: 사용자 질문
+            hotel: 호텔 ID (선택)
+            history: 대화 히스토리 (선택)
+            sessionCtx: 세션 컨텍스트 객체 (선택, ConversationContext)
+        """
+        pipelineStart = time.time()
+        initialState = self._buildInitialState(query, hotel, history, sessionCtx, pipelineStart)
+
+        # 그래프 실행
+        result = await self.graph.ainvoke(initialState)
+
+        return self._finalizeResult(result, query, sessionCtx, pipelineStart)
+
 
     def chatWithProgress(self, query: str, hotel: str = None, history: list = None,
                          sessionCtx=None, progressCallback=None) -> dict:
@@ -178,80 +235,42 @@ class RAGGraph:
             progressCallback: (nodeName: str) -> None, 각 노드 시작 시 호출
         """
         pipelineStart = time.time()
-
-        initialState: RAGState = {
-            "query": query,
-            "hotel": hotel,
-            "history": history,
-            "rewritten_query": "",
-            "language": "",
-            "detected_hotel": None,
-            "category": None,
-            "normalized_query": "",
-            "is_valid_query": True,
-            "needs_clarification": False,
-            "clarification_question": "",
-            "clarification_options": [],
-            "clarification_type": None,
-            "retrieved_chunks": [],
-            "top_score": 0.0,
-            "evidence_passed": False,
-            "evidence_reason": "",
-            "answer": "",
-            "sources": [],
-            "verification_passed": True,
-            "verification_issues": [],
-            "verified_answer": "",
-            "grounding_result": None,
-            "query_intents": [],
-            "conversation_topic": None,
-            "effective_category": None,
-            "session_context": sessionCtx,
-            "policy_passed": False,
-            "policy_reason": "",
-            "final_answer": "",
-            "log": {},
-            "_pipeline_start": pipelineStart,
-        }
+        initialState = self._buildInitialState(query, hotel, history, sessionCtx, pipelineStart)
 
         # 노드별 스트리밍으로 진행 상황 보고
-        finalState = None
-        for event in self.graph.stream(initialState):
-            nodeName = list(event.keys())[0]
-            finalState = event[nodeName]
-            if progressCallback:
-                progressCallback(nodeName)
+        # 노드는 변경된 키만 반환 → updates를 직접 누적 (values 모드의 단계별 전체 상태 스냅샷 생략)
+        # 모든 키는 단일 노드만 기록하므로 덮어쓰기 병합 결과가 최종 상태와 동일
+        finalState = dict(initialState)
+        for event in self.graph.stream(initialState, stream_mode="updates"):
+            for nodeName, update in event.items():
+                if update:
+                    finalState.update(update)
+                if progressCallback:
+                    progressCallback(nodeName)
 
-        if finalState is None:
-            finalState = initialState
+        return self._finalizeResult(finalState, query, sessionCtx, pipelineStart)
 
-        pipelineElapsed = time.time() - pipelineStart
-        print(f"[타이밍] 전체 파이프라인: {pipelineElapsed:.1f}s")
+    def chatBatch(self, queries: list[tuple[str, Optional[str]]]) -> list[dict]:
+        """여러 독립 질문을 동시에 실행 (평가/warm-up용)
 
-        # 세션 업데이트
-        if sessionCtx:
-            detectedTopic = finalState.get("category") or finalState.get("conversation_topic")
-            sessionCtx.updateTopic(detectedTopic, finalState.get("detected_hotel"))
-            sessionCtx.cacheChunks(
-                finalState.get("retrieved_chunks", []),
-                query
-            )
+        각 질문을 chatAsync로 동시에 실행하여 LLM 호출이 Ollama 병렬 슬롯에서
+        겹쳐 처리되도록 한다. 히스토리/세션 없이 단발 질문만 지원.
 
-        return {
-            "answer": finalState.get("final_answer", ""),
-            "hotel": finalState.get("detected_hotel"),
-            "category": finalState.get("category"),
-            "evidence_passed": finalState.get("evidence_passed", False),
-            "verification_passed": finalState.get("verification_passed", True),
-            "sources": finalState.get("sources", []),
-            "score": finalState.get("top_score", 0),
-            "needs_clarification": finalState.get("needs_clarification", False),
-            "clarification_question": finalState.get("clarification_question", ""),
-            "clarification_options": finalState.get("clarification_options", []),
-            "clarification_type": finalState.get("clarification_type"),
-            "clarification_subject": finalState.get("clarification_subject"),
-            "original_query": query,
-        }
+        Args:
+            queries: [(질문, 호텔 ID 또는 None), ...]
+
+        Returns:
+            입력 순서와 같은 순서의 chat() 결과 목록
+        """
+        async def _runAll():
+            return await asyncio.gather(*[
+                self.chatAsync(query, hotel) for query, hotel in queries
+            ])
+
+        batchStart = time.time()
+        results = asyncio.run(_runAll())
+        logger.info("[타이밍] 배치 %s건: %.1fs", len(queries), time.time() - batchStart)
+        return list(results)
 
 
 def createRAGGraph():
@@ -275,9 +294,10 @@ if __name__ == "__main__":
         "환불 정책이 어떻게 되나요?",
     ]
 
-    for query in testQueries:
+    results = rag.chatBatch([(query, None) for query in testQueries])
+
+    for query, result in zip(testQueries, results):
         print(f"\n{'='*50}")
         print(f"Q: {query}")
-        result = rag.chat(query)
         print(f"A: {result['answer']}")
         print(f"호텔: {result['hotel']}, 점수: {result['score']:.3f}")
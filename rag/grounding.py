@@ -8,10 +8,12 @@ Grounding Gate 모듈
 """
 
 import re
+from functools import lru_cache
 from typing import Optional, List
 from dataclasses import dataclass, field
 
 from rag.constants import GROUNDING_THRESHOLD
+from rag.keyword_matcher import KeywordMatcher
 
 
 @dataclass
@@ -35,6 +37,60 @@ class GroundingResult:
     confidence: str = ""  # "확실", "불확실", "근거없음"
 
 
+# 근거 매칭용 토큰 정규식
+_KO_WORD_RE = re.compile(r'[가-힣]{2,}')
+_EN_WORD_RE = re.compile(r'[a-z]+')
+_NUMBER_RE = re.compile(r'\d[\d,]*')
+_SENTENCE_SPLIT_RE = re.compile(r'[.\n]')
+
+# 수치/전화번호/날짜 검증 및 claim 분리용 정규식 (답변마다 호출 → 미리 컴파일)
+_NON_DIGIT_RE = re.compile(r'[^\d]')
+_DIGITS_RE = re.compile(r'\d+')
+_BULLET_PREFIX_RE = re.compile(r'^[-•*]\s*')
+_CLAIM_SPLIT_RE = re.compile(r'[.。]\s*')
+_FULL_DATE_RE = re.compile(r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일')
+_MONTH_DAY_RE = re.compile(r'(\d{1,2})월\s*(\d{1,2})일')
+
+
+@dataclass(frozen=True)
+class _ContextProfile:
+    """컨텍스트 분석 결과 (claim마다 반복하던 소문자 변환/토큰화를 1회로)"""
+    lower: str
+    numbers: frozenset
+    words: frozenset
+    # 근거 스팬 후보: (원문 문장 strip, 단어 집합, 숫자 집합) — 5자 미만 문장 제외
+    spans: tuple
+    # 뉘앙스 역전 검사용: (소문자 문장 strip, 한글 단어 집합) — 빈 문장 제외
+    lowerSentences: tuple
+
+
+@lru_cache(maxsize=8)
+def _analyzeContext(context: str) -> _ContextProfile:
+    """컨텍스트 1개당 1회 분석 (한 답변의 모든 claim이 같은 컨텍스트를 공유)"""
+    contextLower = context.lower()
+    spans = []
+    lowerSentences = []
+    for sentence in _SENTENCE_SPLIT_RE.split(context):
+        sentenceLower = sentence.lower()
+        if len(sentence.strip()) >= 5:
+            spans.append((
+                sentence.strip(),
+                frozenset(_KO_WORD_RE.findall(sentenceLower)) | frozenset(_EN_WORD_RE.findall(sentenceLower)),
+                frozenset(_NUMBER_RE.findall(sentence)),
+            ))
+        strippedLower = sentenceLower.strip()
+        if strippedLower:
+            lowerSentences.append((strippedLower, frozenset(_KO_WORD_RE.findall(strippedLower))))
+
+    return _ContextProfile(
+        lower=contextLower,
+        numbers=frozenset(_NUMBER_RE.findall(context)),
+        words=frozenset(_KO_WORD_RE.findall(contextLower)) | frozenset(_EN_WORD_RE.findall(contextLower)),
+        spans=tuple(spans),
+        lowerSentences=tuple(lowerSentences),
+    )
+
+
 class GroundingGate:
     """근거 검증 게이트"""
 
@@ -95,6 +151,9 @@ class GroundingGate:
         "입장 가능", "반려", "펫", "pet", "애완", "어린이", "미성년자",
         "휠체어", "장애인", "흡연", "음식물",
     ]
+    # 의도 키워드/rule 트리거 매칭 오토마톤 (질문 1회 선형 탐색)
+    _INTENT_MATCHER = KeywordMatcher(INTENT_KEYWORDS)
+    _RULE_TRIGGER_MATCHER = KeywordMatcher(RULE_TRIGGER_PATTERNS)
 
     # 근거 검증 임계값 (constants.py에서 관리)
     EVIDENCE_THRESHOLD = GROUNDING_THRESHOLD
@@ -118,14 +177,15 @@ class GroundingGate:
         """질문 의도 분류"""
         intents = []
         queryLower = query.lower()
+        matchedIntents = set(self._INTENT_MATCHER.matchedGroups(queryLower))
 
         # 우선순위 기반 분류 (rental_items > fee_rental > rule 등)
         # 1. 먼저 rental_items 체크 (대여 물품 관련)
-        if any(kw in queryLower for kw in self.INTENT_KEYWORDS["rental_items"]):
+        if "rental_items" in matchedIntents:
             intents.append("rental_items")
 
         # 2. 나머지 의도 분류
-        for intent, keywords in self.INTENT_KEYWORDS.items():
+        for intent in self.INTENT_KEYWORDS:
             if intent == "rental_items":
                 continue  # 이미 처리함
 
@@ -139,11 +199,11 @@ class GroundingGate:
 
                 # "가능" 키워드는 RULE_TRIGGER_PATTERNS와 함께 있을 때만 rule로 분류
                 if "가능" in queryLower:
-                    if any(p in queryLower for p in self.RULE_TRIGGER_PATTERNS):
+                    if self._RULE_TRIGGER_MATCHER.matches(queryLower):
                         intents.append("rule")
                     continue
 
-            if any(kw in queryLower for kw in keywords):
+            if intent in matchedIntents:
                 intents.append(intent)
 
         return intents if intents else ["general"]
@@ -165,15 +225,15 @@ class GroundingGate:
             return None, 0.0
 
         claimLower = claim.lower()
-        contextLower = context.lower()
+        profile = _analyzeContext(context)
 
         # 1. 정확 매칭
-        if claimLower in contextLower:
+        if claimLower in profile.lower:
             return claim, 1.0
 
         # 2. 핵심 정보(숫자/가격/시간) 매칭 - 높은 가중치
-        claimNumbers = set(re.findall(r'\d[\d,]*', claim))
-        contextNumbers = set(re.findall(r'\d[\d,]*', context))
+        claimNumbers = set(_NUMBER_RE.findall(claim))
+        contextNumbers = profile.numbers
 
         numberMatchScore = 0.0
         if claimNumbers:
@@ -189,13 +249,11 @@ class GroundingGate:
 
         # 3. 키워드 오버랩 기반 매칭 (한글 단어 분리 개선)
         # 한글은 2글자 이상만, 영어는 단어 단위
-        claimWordsKo = set(re.findall(r'[가-힣]{2,}', claimLower))
-        claimWordsEn = set(re.findall(r'[a-z]+', claimLower))
+        claimWordsKo = set(_KO_WORD_RE.findall(claimLower))
+        claimWordsEn = set(_EN_WORD_RE.findall(claimLower))
         claimWords = claimWordsKo | claimWordsEn
 
-        contextWordsKo = set(re.findall(r'[가-힣]{2,}', contextLower))
-        contextWordsEn = set(re.findall(r'[a-z]+', contextLower))
-        contextWords = contextWordsKo | contextWordsEn
+        contextWords = profile.words
 
         if not claimWords:
             # 숫자만 있는 경우 숫자 매칭으로 판단
@@ -204,23 +262,15 @@ class GroundingGate:
         overlap = claimWords & contextWords
         wordOverlapScore = len(overlap) / len(claimWords)
 
-        # 4. 문장 단위 근거 스팬 추출
-        sentences = re.split(r'[.\n]', context)
+        # 4. 문장 단위 근거 스팬 추출 (문장 토큰은 컨텍스트 분석 시 1회 계산)
         bestSpan = None
         bestScore = 0.0
 
-        for sentence in sentences:
-            if len(sentence.strip()) < 5:
-                continue
-            sentWordsKo = set(re.findall(r'[가-힣]{2,}', sentence.lower()))
-            sentWordsEn = set(re.findall(r'[a-z]+', sentence.lower()))
-            sentWords = sentWordsKo | sentWordsEn
-
+        for sentenceStripped, sentWords, sentNumbers in profile.spans:
             sentOverlap = claimWords & sentWords
             sentScore = len(sentOverlap) / len(claimWords) if claimWords else 0
 
             # 숫자 매칭 보너스
-            sentNumbers = set(re.findall(r'\d[\d,]*', sentence))
             if claimNumbers and sentNumbers:
                 for num in claimNumbers:
                     numClean = num.replace(',', '')
@@ -232,7 +282,7 @@ class GroundingGate:
 
             if sentScore > bestScore:
                 bestScore = sentScore
-                bestSpan = sentence.strip()
+                bestSpan = sentenceStripped
 
         # 최종 점수: 숫자 매칭과 키워드 매칭 중 높은 값 + 보너스
         finalScore = max(wordOverlapScore, bestScore)
@@ -256,10 +306,10 @@ class GroundingGate:
             # 2. 가격/숫자 토큰은 정확히 매칭해야 함
             if tokenType == "가격":
                 # 가격 패턴: 숫자+원
-                priceNum = re.sub(r'[^\d]', '', token)  # 숫자만 추출
+                priceNum = _NON_DIGIT_RE.sub('', token)  # 숫자만 추출
                 if len(priceNum) >= 3:  # 최소 3자리 숫자 (100원 이상)
                     # 컨텍스트에서 동일 숫자 찾기
-                    contextNumbers = re.findall(r'\d[\d,]*', context)
+                    contextNumbers = _NUMBER_RE.findall(context)
                     found = False
                     for ctxNum in contextNumbers:
                         ctxClean = ctxNum.replace(',', '')
@@ -273,7 +323,7 @@ class GroundingGate:
                 tokenPattern = re.escape(token)
                 if not re.search(tokenPattern, context, re.IGNORECASE):
                     # 숫자 부분만 추출해서 재검색
-                    numPart = re.search(r'\d+', token)
+                    numPart = _DIGITS_RE.search(token)
                     if numPart:
                         numStr = numPart.group()
                         # 컨텍스트에서 동일 숫자+단위 조합 찾기
@@ -291,7 +341,7 @@ class GroundingGate:
                                 unverified.append(f"{token} ({tokenType})")
             elif tokenType == "층수":
                 # 층수 정확 매칭 필요
-                numPart = re.search(r'\d+', token)
+                numPart = _DIGITS_RE.search(token)
                 if numPart:
                     floorNum = numPart.group()
                     if not re.search(rf'{floorNum}\s*층', context):
@@ -318,14 +368,14 @@ class GroundingGate:
         for line in lines:
             line = line.strip()
             # 불릿 포인트 제거
-            line = re.sub(r'^[-•*]\s*', '', line)
+            line = _BULLET_PREFIX_RE.sub('', line)
             if len(line) >= 5:  # 최소 5자 이상
                 claims.append(line)
 
         # 2. 줄바꿈으로 분리된 게 없으면 문장 단위 분리
         if len(claims) <= 1:
             claims = []
-            sentences = re.split(r'[.。]\s*', answer)
+            sentences = _CLAIM_SPLIT_RE.split(answer)
             for s in sentences:
                 s = s.strip()
                 if len(s) >= 5:
@@ -357,20 +407,20 @@ class GroundingGate:
         if not answerPhones:
             return True, []
 
+        # 컨텍스트 쪽 숫자열은 답변 전화번호 수와 무관 → 1회만 계산
+        contextPhoneDigits = {_NON_DIGIT_RE.sub('', ctxPhone) for ctxPhone in phoneCompiled.findall(context)}
+        contextDigits = None
+
         for phone in answerPhones:
             # 숫자만 추출하여 비교 (구분자 무시)
-            phoneDigits = re.sub(r'[^\d]', '', phone)
+            phoneDigits = _NON_DIGIT_RE.sub('', phone)
             # 컨텍스트에서 동일 숫자열 찾기
-            contextPhones = phoneCompiled.findall(context)
-            found = False
-            for ctxPhone in contextPhones:
-                ctxDigits = re.sub(r'[^\d]', '', ctxPhone)
-                if phoneDigits == ctxDigits:
-                    found = True
-                    break
+            found = phoneDigits in contextPhoneDigits
             if not found:
                 # 컨텍스트에서 숫자 연속열로도 재검색
-                if phoneDigits in re.sub(r'[^\d]', '', context):
+                if contextDigits is None:
+                    contextDigits = _NON_DIGIT_RE.sub('', context)
+                if phoneDigits in contextDigits:
                     found = True
             if not found and len(phoneDigits) >= 8:
                 unverified.append(f"{phone} (전화번호)")
@@ -384,12 +434,8 @@ class GroundingGate:
         """
         unverified = []
 
-        # 연월일 패턴
-        fullDatePattern = r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일'
-        monthDayPattern = r'(\d{1,2})월\s*(\d{1,2})일'
-
         # 연월일 검증
-        for match in re.finditer(fullDatePattern, answer):
+        for match in _FULL_DATE_RE.finditer(answer):
             dateStr = match.group(0)
             year, month, day = match.group(1), match.group(2), match.group(3)
             # 컨텍스트에서 동일 날짜 찾기 (구분자 유연)
@@ -401,8 +447,8 @@ class GroundingGate:
                     unverified.append(f"{dateStr} (날짜)")
 
         # 월일만 있는 경우 (연월일 패턴에 이미 매칭된 것 제외)
-        contextWithoutFullDate = re.sub(fullDatePattern, '', answer)
-        for match in re.finditer(monthDayPattern, contextWithoutFullDate):
+        contextWithoutFullDate = _FULL_DATE_RE.sub('', answer)
+        for match in _MONTH_DAY_RE.finditer(contextWithoutFullDate):
             dateStr = match.group(0)
             month, day = match.group(1), match.group(2)
             ctxPattern = rf'{int(month)}\s*[월./-]\s*{int(day)}\s*일?'
@@ -426,21 +472,18 @@ class GroundingGate:
             # claim에 긍정어가 있고, context의 해당 맥락에 부정어가 있는 경우
             if posWord in claimLower and negWord not in claimLower:
                 # claim의 주제어 추출 (긍정어 주변 키워드)
-                claimWordsKo = set(re.findall(r'[가-힣]{2,}', claimLower))
+                claimWordsKo = set(_KO_WORD_RE.findall(claimLower))
                 claimWordsKo.discard(posWord)  # 긍정어 자체는 제외
 
                 if not claimWordsKo:
                     continue
 
                 # 컨텍스트에서 부정어가 포함된 문장 찾기
-                contextSentences = re.split(r'[.\n]', context)
-                for ctxSent in contextSentences:
-                    ctxSentLower = ctxSent.lower().strip()
-                    if not ctxSentLower or negWord not in ctxSentLower:
+                for ctxSentLower, sentWordsKo in _analyzeContext(context).lowerSentences:
+                    if negWord not in ctxSentLower:
                         continue
 
                     # 부정어 문장에 claim 주제어가 포함되면 → 역전 의심
-                    sentWordsKo = set(re.findall(r'[가-힣]{2,}', ctxSentLower))
                     topicOverlap = claimWordsKo & sentWordsKo
                     if len(topicOverlap) >= 2:
                         return False, f"뉘앙스 역전 의심: 컨텍스트 '{negWord}' → 답변 '{posWord}' (주제: {topicOverlap})"
@@ -450,7 +493,7 @@ class GroundingGate:
     def verifyProperNouns(self, text: str, context: str) -> tuple[bool, list[str]]:
         """고유명사가 컨텍스트에 존재하는지 검증"""
         unverified = []
-        contextLower = context.lower()
+        contextLower = _analyzeContext(context).lower
 
         for compiledPattern, nounType in self.PROPER_NOUN_PATTERNS:
             matches = compiledPattern.finditer(text)
@@ -745,11 +788,12 @@ class CategoryConsistencyChecker:
                 reason=f"'{targetCategory}' 카테고리 키워드 미정의"
             )
 
-        foreignKeywords = categoryKeywords["foreign"]
+        # 소문자 변환은 문장마다가 아니라 키워드당 1회 (원문 키워드는 결과 보고용)
+        foreignKeywords = [(kw, kw.lower()) for kw in categoryKeywords["foreign"]]
         answerLower = answer.lower()
 
         # 문장 단위로 분리
-        sentences = re.split(r'[.\n]', answer)
+        sentences = _SENTENCE_SPLIT_RE.split(answer)
         contaminatedSentences = []
         foreignFound = []
         cleanSentences = []
@@ -763,8 +807,8 @@ class CategoryConsistencyChecker:
             isContaminated = False
 
             # foreign 키워드 검사
-            for foreignKw in foreignKeywords:
-                if foreignKw.lower() in sentenceLower:
+            for foreignKw, foreignKwLower in foreignKeywords:
+                if foreignKwLower in sentenceLower:
                     isContaminated = True
                     foreignFound.append(foreignKw)
                     contaminatedSentences.append(sentence)
@@ -0,0 +1,74 @@
+"""
+다중 키워드 그룹 매칭 (Aho-Corasick)
+- 그룹별 키워드 목록을 하나의 오토마톤으로 컴파일 → 질문 1회 선형 탐색으로 매칭 그룹 산출
+- pyahocorasick 설치 시 C 구현 오토마톤, 미설치 시 부분 문자열 검사 폴백
+- 결과는 그룹 정의 순서 유지 (기존 dict 순회 + 첫 매칭 break 동작과 동일)
+- 키워드는 소문자로 저장 → 입력도 소문자 문자열로 전달
+"""
+
+from typing import Optional
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:  # pyahocorasick은 선택 의존성 (pip install pyahocorasick)
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordMatcher:
+    """키워드 그룹 매처
+
+    Args:
+        groups: {그룹 키: 키워드 목록} 또는 키워드 목록 (단일 그룹)
+    """
+
+    def __init__(self, groups):
+        if not isinstance(groups, dict):
+            groups = {None: groups}
+
+        self._groupKeys = list(groups)
+        self._groups = [
+            tuple(dict.fromkeys(kw.lower() for kw in keywords if kw))
+            for keywords in groups.values()
+        ]
+
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and any(self._groups):
+            automaton = ahocorasick.Automaton()
+            for idx, keywords in enumerate(self._groups):
+                for kw in keywords:
+                    # 같은 키워드가 여러 그룹에 속할 수 있음 → 그룹 인덱스 튜플 누적
+                    automaton.add_word(kw, automaton.get(kw, ()) + (idx,))
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def _matchedIndices(self, textLower: str) -> list[int]:
+        if self._automaton is not None:
+            found = set()
+            for _, indices in self._automaton.iter(textLower):
+                found.update(indices)
+            return sorted(found)
+        return [
+            idx for idx, keywords in enumerate(self._groups)
+            if any(kw in textLower for kw in keywords)
+        ]
+
+    def matchedGroups(self, textLower: str) -> list:
+        """매칭된 그룹 키 목록 (그룹 정의 순서)"""
+        return [self._groupKeys[idx] for idx in self._matchedIndices(textLower)]
+
+    def firstGroup(self, textLower: str) -> Optional[str]:
+        """정의 순서상 첫 번째 매칭 그룹 (없으면 None)"""
+        if self._automaton is None:
+            for idx, keywords in enumerate(self._groups):
+                if any(kw in textLower for kw in keywords):
+                    return self._groupKeys[idx]
+            return None
+        indices = self._matchedIndices(textLower)
+        return self._groupKeys[indices[0]] if indices else None
+
+    def matches(self, textLower: str) -> bool:
+        """키워드가 하나라도 포함되어 있는지"""
+        if self._automaton is not None:
+            return next(self._automaton.iter(textLower), None) is not None
+        return any(kw in textLower for keywords in self._groups for kw in keywords)
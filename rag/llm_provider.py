@@ -2,32 +2,58 @@
 LLM Provider 추상화
 - 로컬: Ollama (timeout 30초)
 - 클라우드: Groq API (무료 tier)
+- OpenAI 호환 추론 서버 (vLLM 등, continuous batching)
 - 최대 2회 재시도
 - LRU 캐싱: 동일/유사 쿼리 재사용으로 응답 속도 향상
+- 비동기 호출: 동시 사용자 요청을 Ollama 병렬 슬롯(OLLAMA_NUM_PARALLEL)에 분산
 """
 
+import logging
 import os
+import re
 import time
+import asyncio
 import hashlib
 import threading
 from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 from typing import Optional, Callable
 
+logger = logging.getLogger(__name__)
+
 # Groq 사용 여부 (환경변수로 제어)
 USE_GROQ = os.getenv("USE_GROQ", "false").lower() == "true"
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+
+# OpenAI 호환 추론 서버 (vLLM 등): continuous batching으로 동시 사용자 요청을 한 배치에서 처리
+# 설정 시 Ollama 대신 사용 (예: http://localhost:8001/v1/chat/completions)
+OPENAI_COMPAT_URL = os.getenv("OPENAI_COMPAT_URL", "")
+OPENAI_COMPAT_MODEL = os.getenv("OPENAI_COMPAT_MODEL", "")
+OPENAI_COMPAT_API_KEY = os.getenv("OPENAI_COMPAT_API_KEY", "")
+
+# HTTP(OpenAI 호환 chat completions) 백엔드 사용 여부: Groq 또는 OpenAI 호환 서버
+_USE_HTTP_BACKEND = bool(USE_GROQ and GROQ_API_KEY) or bool(OPENAI_COMPAT_URL)
 
 # Ollama timeout (초)
 LLM_TIMEOUT = int(os.getenv("LLM_TIMEOUT", "30"))
 LLM_MAX_RETRIES = 2
 
 # Ollama 성능 최적화 설정
-OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "exaone3.5:7.8b")  # LG EXAONE 3.5 한국어 최적화 모델
+# LG EXAONE 3.5 한국어 최적화 모델 (기본 태그 = Q4_K_M 양자화, 디코드 대역폭 FP16 대비 1/4)
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "exaone3.5:7.8b")
+# 쿼리 재작성 전용 모델: 한 문장 재작성은 소형 양자화 모델로 충분 (미지정 시 OLLAMA_MODEL 공용)
+# 예: OLLAMA_REWRITE_MODEL=qwen2.5:1.5b-instruct-q4_K_M (사전에 ollama pull 필요)
+OLLAMA_REWRITE_MODEL = os.getenv("OLLAMA_REWRITE_MODEL") or OLLAMA_MODEL
 OLLAMA_NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX", "4096"))  # 기본 32768 → 4096 (KV 캐시 1/8)
 OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "60m")  # 60분 메모리 상주 (기본 5분)
 OLLAMA_NUM_THREAD = int(os.getenv("OLLAMA_NUM_THREAD", "8"))  # CPU 스레드 수 (M5 10코어)
+# 동시 처리 슬롯 수: Ollama 서버도 같은 값으로 실행해야 함 (OLLAMA_NUM_PARALLEL=4 ollama serve)
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+
+# 생성 중단 시퀀스: 프롬프트 섹션 헤더 재생성/빈 줄 반복 등 답변 이탈 시 디코드 조기 종료
+LLM_STOP_SEQUENCES = ["[질문]", "[참고 정보]", "\n\n\n"]
 
 # LLM 응답 캐시 설정
 LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
@@ -51,23 +77,67 @@ def _getStreamCallback() -> Optional[Callable]:
     return getattr(_streamLocal, 'callback', None)
 
 
-def _generateCacheKey(prompt: str, system: str, temperature: float, maxTokens: int = 512) -> str:
-    """캐시 키 생성 (프롬프트 + 시스템 + temperature + maxTokens 해시)"""
-    content = f"{prompt}|{system}|{temperature}|{maxTokens}"
+# 스트리밍 조기 중단 패턴: 3글자 이상 연속 한자 (qwen 계열 중국어 이탈)
+# 답변 후처리(_cleanLLMAnswer)가 이 지점부터 잘라내므로 이후 토큰은 생성할 필요 없음
+_STREAM_ABORT_RE = re.compile(r'[\u4e00-\u9fff]{3,}')
+
+# 동기 호출용 Ollama 클라이언트 (프로세스 공용, HTTP 연결 재사용)
+_ollamaClient = None
+_ollamaClientLock = threading.Lock()
+
+
+def _getOllamaClient():
+    """공용 ollama.Client 반환 (첫 호출 시 생성)
+
+    HTTP timeout을 LLM_TIMEOUT보다 약간 길게 설정하여, 타임아웃으로
+    버려진 워커 스레드가 응답 없는 연결에 무기한 묶이지 않도록 한다.
+    """
+    global _ollamaClient
+    if _ollamaClient is None:
+        with _ollamaClientLock:
+            if _ollamaClient is None:
+                import ollama
+                _ollamaClient = ollama.Client(timeout=LLM_TIMEOUT + 5)
+    return _ollamaClient
+
+
+# 비동기 호출용 클라이언트/슬롯 (이벤트 루프별로 생성 — asyncio.run 반복 호출 대응)
+_asyncLoop = None
+_asyncClient = None
+_asyncSlots: Optional[asyncio.Semaphore] = None
+
+
+def _ensureAsyncResources():
+    """현재 이벤트 루프에 묶인 AsyncClient/세마포어 준비"""
+    global _asyncLoop, _asyncClient, _asyncSlots
+    loop = asyncio.get_running_loop()
+    if _asyncLoop is not loop:
+        import ollama
+        _asyncLoop = loop
+        _asyncClient = ollama.AsyncClient(timeout=LLM_TIMEOUT + 5)
+        _asyncSlots = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+
+
+def _generateCacheKey(prompt: str, system: str, temperature: float, maxTokens: int = 512,
+                      stop: tuple = (), model: str = None) -> str:
+    """캐시 키 생성 (프롬프트 + 시스템 + temperature + maxTokens + 추가 중단 시퀀스 + 모델 해시)"""
+    content = f"{prompt}|{system}|{temperature}|{maxTokens}|{stop}|{model}"
     return hashlib.md5(content.encode('utf-8')).hexdigest()
 
 
 # LRU 캐시 데코레이터를 사용한 내부 호출 함수
 @lru_cache(maxsize=LLM_CACHE_SIZE)
-def _cachedLLMCall(cacheKey: str, prompt: str, system: str, temperature: float, maxTokens: int = 512) -> str:
+def _cachedLLMCall(cacheKey: str, prompt: str, system: str, temperature: float, maxTokens: int = 512,
+                   stop: tuple = (), model: str = None) -> str:
     """캐시 가능한 LLM 호출 (내부용)"""
-    if USE_GROQ and GROQ_API_KEY:
-        return _callGroq(prompt, system, temperature, maxTokens)
+    if _USE_HTTP_BACKEND:
+        return _callHTTPBackend(prompt, system, temperature, maxTokens, stop)
     else:
-        return _callOllamaWithTimeout(prompt, system, temperature, maxTokens)
+        return _callOllamaWithTimeout(prompt, system, temperature, maxTokens, stop=stop, model=model)
 
 
-def callLLM(prompt: str, system: str = "", temperature: float = 0.1, maxTokens: int = 512, numCtx: int = None) -> str:
+def callLLM(prompt: str, system: str = "", temperature: float = 0.1, maxTokens: int = 512, numCtx: int = None,
+            stop: tuple = (), model: str = None) -> str:
     """
     LLM 호출 (Ollama 또는 Groq) - 캐싱 지원
 
@@ -77,6 +147,8 @@ def callLLM(prompt: str, system: str = "", temperature: float = 0.1, maxTokens:
         temperature: 생성 온도 (0.0 ~ 1.0)
         maxTokens: 최대 생성 토큰 수 (기본 512)
         numCtx: 컨텍스트 윈도우 크기 (None이면 기본값 OLLAMA_NUM_CTX 사용)
+        stop: 추가 중단 시퀀스 (LLM_STOP_SEQUENCES에 덧붙임, 짧은 출력 노드의 디코드 조기 종료)
+        model: Ollama 모델 (None이면 OLLAMA_MODEL, HTTP 백엔드에서는 무시)
 
     Returns:
         생성된 텍스트
@@ -84,71 +156,73 @@ def callLLM(prompt: str, system: str = "", temperature: float = 0.1, maxTokens:
     startTime = time.time()
     effectiveCtx = numCtx or OLLAMA_NUM_CTX
 
-    # 스트리밍 콜백 활성 → 캐시 우회, 직접 스트리밍
+    # 스트리밍 콜백 활성 → 캐시 우회, 직접 스트리밍 (Ollama 전용)
     streamCallback = _getStreamCallback()
-    if streamCallback:
+    if streamCallback and not _USE_HTTP_BACKEND:
         try:
-            result = _callOllamaStream(prompt, system, temperature, maxTokens, streamCallback, effectiveCtx)
+            result = _callOllamaStream(prompt, system, temperature, maxTokens, streamCallback, effectiveCtx, stop,
+                                       model)
             elapsed = time.time() - startTime
-            print(f"[LLM 스트리밍] 완료 ({elapsed:.1f}s, maxTokens={maxTokens}, numCtx={effectiveCtx})")
+            logger.debug("[LLM 스트리밍] 완료 (%.1fs, maxTokens=%s, numCtx=%s)", elapsed, maxTokens, effectiveCtx)
             return result
         except Exception as e:
-            print(f"[LLM 스트리밍] 실패, 일반 호출로 전환: {e}")
+            logger.warning("[LLM 스트리밍] 실패, 일반 호출로 전환: %s", e)
             # 스트리밍 실패 시 일반 호출로 폴백
 
     if not LLM_CACHE_ENABLED:
-        if USE_GROQ and GROQ_API_KEY:
-            result = _callGroq(prompt, system, temperature, maxTokens)
+        if _USE_HTTP_BACKEND:
+            result = _callHTTPBackend(prompt, system, temperature, maxTokens, stop)
         else:
-            result = _callOllamaWithTimeout(prompt, system, temperature, maxTokens, effectiveCtx)
+            result = _callOllamaWithTimeout(prompt, system, temperature, maxTokens, effectiveCtx, stop, model)
         elapsed = time.time() - startTime
-        print(f"[LLM] 호출 완료 ({elapsed:.1f}s, maxTokens={maxTokens}, numCtx={effectiveCtx})")
+        logger.debug("[LLM] 호출 완료 (%.1fs, maxTokens=%s, numCtx=%s)", elapsed, maxTokens, effectiveCtx)
         return result
 
     # 캐싱 활성화 시
-    cacheKey = _generateCacheKey(prompt, system, temperature, maxTokens)
+    cacheKey = _generateCacheKey(prompt, system, temperature, maxTokens, stop, model)
 
     try:
-        result = _cachedLLMCall(cacheKey, prompt, system, temperature, maxTokens)
+        result = _cachedLLMCall(cacheKey, prompt, system, temperature, maxTokens, stop, model)
         elapsed = time.time() - startTime
         cacheInfo = _cachedLLMCall.cache_info()
         hitRate = (cacheInfo.hits / (cacheInfo.hits + cacheInfo.misses) * 100) if (cacheInfo.hits + cacheInfo.misses) > 0 else 0
 
         if cacheInfo.hits > 0:
-            print(f"[LLM 캐시] HIT ({elapsed:.1f}s, 적중률: {hitRate:.1f}%)")
+            logger.debug("[LLM 캐시] HIT (%.1fs, 적중률: %.1f%%)", elapsed, hitRate)
 
         return result
     except (TimeoutError, FuturesTimeout) as e:
         # LLM 타임아웃은 재시도 무의미 (Ollama 과부하) → 즉시 전파
-        print(f"[LLM] 타임아웃 — 재시도 없이 즉시 실패: {e}")
+        logger.warning("[LLM] 타임아웃 — 재시도 없이 즉시 실패: %s", e)
         raise
     except Exception as e:
-        print(f"[LLM 캐시] 오류, 직접 호출로 전환: {e}")
-        if USE_GROQ and GROQ_API_KEY:
-            return _callGroq(prompt, system, temperature, maxTokens)
+        logger.warning("[LLM 캐시] 오류, 직접 호출로 전환: %s", e)
+        if _USE_HTTP_BACKEND:
+            return _callHTTPBackend(prompt, system, temperature, maxTokens, stop)
         else:
-            return _callOllamaWithTimeout(prompt, system, temperature, maxTokens, effectiveCtx)
+            return _callOllamaWithTimeout(prompt, system, temperature, maxTokens, effectiveCtx, stop, model)
 
 
-def _callOllamaWithTimeout(prompt: str, system: str, temperature: float, maxTokens: int = 512, numCtx: int = None) -> str:
+def _callOllamaWithTimeout(prompt: str, system: str, temperature: float, maxTokens: int = 512, numCtx: int = None,
+                           stop: tuple = (), model: str = None) -> str:
     """Ollama 호출 (timeout + retry, shutdown 대기 없음)"""
     effectiveCtx = numCtx or OLLAMA_NUM_CTX
     lastError = None
     for attempt in range(1, LLM_MAX_RETRIES + 1):
         executor = ThreadPoolExecutor(max_workers=1)
         try:
-            future = executor.submit(_callOllama, prompt, system, temperature, maxTokens, effectiveCtx)
+            future = executor.submit(_callOllama, prompt, system, temperature, maxTokens, effectiveCtx, stop, model)
             result = future.result(timeout=LLM_TIMEOUT)
             executor.shutdown(wait=False)
             return result
         except FuturesTimeout:
             lastError = f"Ollama 응답 시간 초과 ({LLM_TIMEOUT}초)"
-            print(f"[LLM] timeout (시도 {attempt}/{LLM_MAX_RETRIES})")
+            logger.warning("[LLM] timeout (시도 %s/%s)", attempt, LLM_MAX_RETRIES)
             # shutdown(wait=False): 타임아웃된 스레드 대기하지 않음
             executor.shutdown(wait=False)
         except Exception as e:
             lastError = str(e)
-            print(f"[LLM] 오류 (시도 {attempt}/{LLM_MAX_RETRIES}): {e}")
+            logger.warning("[LLM] 오류 (시도 %s/%s): %s", attempt, LLM_MAX_RETRIES, e)
             executor.shutdown(wait=False)
         if attempt < LLM_MAX_RETRIES:
             time.sleep(1)
@@ -156,27 +230,37 @@ def _callOllamaWithTimeout(prompt: str, system: str, temperature: float, maxToke
     raise TimeoutError(f"LLM 호출 실패 ({LLM_MAX_RETRIES}회 시도): {lastError}")
 
 
-def _callOllama(prompt: str, system: str, temperature: float, maxTokens: int = 512, numCtx: int = None) -> str:
-    """Ollama 로컬 LLM 호출"""
-    import ollama
+def _stopSequences(stop: tuple = ()) -> list:
+    """공통 중단 시퀀스 + 호출별 추가 중단 시퀀스"""
+    return LLM_STOP_SEQUENCES + list(stop) if stop else LLM_STOP_SEQUENCES
+
+
+def _buildOllamaOptions(temperature: float, maxTokens: int, numCtx: int, stop: tuple = ()) -> dict:
+    """Ollama 생성 옵션 (동기/스트리밍/비동기 공통)"""
+    return {
+        "temperature": temperature,
+        "num_predict": maxTokens,
+        "num_ctx": numCtx,
+        "num_thread": OLLAMA_NUM_THREAD,
+        "num_gpu": -1,       # GPU(Metal) 전체 레이어 오프로드
+        "num_batch": 512,    # 프롬프트 처리 배치 크기 (기본 128→512)
+        "stop": _stopSequences(stop),
+    }
+
 
+def _callOllama(prompt: str, system: str, temperature: float, maxTokens: int = 512, numCtx: int = None,
+                stop: tuple = (), model: str = None) -> str:
+    """Ollama 로컬 LLM 호출"""
     effectiveCtx = numCtx or OLLAMA_NUM_CTX
     messages = []
     if system:
         messages.append({"role": "system", "content": system})
     messages.append({"role": "user", "content": prompt})
 
-    response = ollama.chat(
-        model=OLLAMA_MODEL,
+    response = _getOllamaClient().chat(
+        model=model or OLLAMA_MODEL,
         messages=messages,
-        options={
-            "temperature": temperature,
-            "num_predict": maxTokens,
-            "num_ctx": effectiveCtx,
-            "num_thread": OLLAMA_NUM_THREAD,
-            "num_gpu": -1,       # GPU(Metal) 전체 레이어 오프로드
-            "num_batch": 512,    # 프롬프트 처리 배치 크기 (기본 128→512)
-        },
+        options=_buildOllamaOptions(temperature, maxTokens, effectiveCtx, stop),
         keep_alive=OLLAMA_KEEP_ALIVE,
     )
 
@@ -185,27 +269,18 @@ def _callOllama(prompt: str, system: str, temperature: float, maxTokens: int = 5
 
 def _callOllamaStream(prompt: str, system: str, temperature: float,
                        maxTokens: int, callback: Callable[[str], None],
-                       numCtx: int = None) -> str:
+                       numCtx: int = None, stop: tuple = (), model: str = None) -> str:
     """Ollama 스트리밍 호출 (토큰 단위 콜백)"""
-    import ollama
-
     effectiveCtx = numCtx or OLLAMA_NUM_CTX
     messages = []
     if system:
         messages.append({"role": "system", "content": system})
     messages.append({"role": "user", "content": prompt})
 
-    response = ollama.chat(
-        model=OLLAMA_MODEL,
+    response = _getOllamaClient().chat(
+        model=model or OLLAMA_MODEL,
         messages=messages,
-        options={
-            "temperature": temperature,
-            "num_predict": maxTokens,
-            "num_ctx": effectiveCtx,
-            "num_thread": OLLAMA_NUM_THREAD,
-            "num_gpu": -1,       # GPU(Metal) 전체 레이어 오프로드
-            "num_batch": 512,    # 프롬프트 처리 배치 크기 (기본 128→512)
-        },
+        options=_buildOllamaOptions(temperature, maxTokens, effectiveCtx, stop),
         keep_alive=OLLAMA_KEEP_ALIVE,
         stream=True,
     )
@@ -214,19 +289,114 @@ def _callOllamaStream(prompt: str, system: str, temperature: float,
     for chunk in response:
         token = chunk["message"]["content"]
         fullResponse += token
+
+        # 새 토큰 주변만 검사 (누적 텍스트 전체 재검사 방지)
+        abortMatch = _STREAM_ABORT_RE.search(fullResponse, max(0, len(fullResponse) - len(token) - 2))
+        if abortMatch:
+            logger.debug("[LLM 스트리밍] 한자 이탈 감지 → 생성 중단 (%s자)", len(fullResponse))
+            fullResponse = fullResponse[:abortMatch.start()]
+            # 스트림을 닫으면 HTTP 연결이 끊겨 Ollama도 생성을 멈춤
+            if hasattr(response, "close"):
+                response.close()
+            break
+
         callback(token)
 
     return fullResponse
 
 
-def _callGroq(prompt: str, system: str, temperature: float, maxTokens: int = 512) -> str:
-    """Groq API 호출 (클라우드 배포용)"""
+async def callLLMAsync(prompt: str, system: str = "", temperature: float = 0.1,
+                       maxTokens: int = 512, numCtx: int = None, stop: tuple = (),
+                       model: str = None) -> str:
+    """
+    LLM 비동기 호출 - 동시 요청을 Ollama 병렬 슬롯에 분산
+
+    동기 callLLM은 요청마다 스레드를 점유하므로, 이벤트 루프에서 여러 사용자의
+    요청을 동시에 Ollama로 보내려면 이 함수를 사용한다.
+    슬롯 수(OLLAMA_NUM_PARALLEL)를 넘는 요청은 클라이언트 측에서 대기시켜
+    서버 큐 대기 시간이 timeout에 포함되지 않도록 한다.
+
+    Args:
+        prompt: 사용자 프롬프트
+        system: 시스템 프롬프트
+        temperature: 생성 온도 (0.0 ~ 1.0)
+        maxTokens: 최대 생성 토큰 수 (기본 512)
+        numCtx: 컨텍스트 윈도우 크기 (None이면 기본값 OLLAMA_NUM_CTX 사용)
+        stop: 추가 중단 시퀀스 (LLM_STOP_SEQUENCES에 덧붙임)
+        model: Ollama 모델 (None이면 OLLAMA_MODEL, HTTP 백엔드에서는 무시)
+
+    Returns:
+        생성된 텍스트
+    """
+    # HTTP 백엔드는 동기 호출 → 스레드로 위임 (캐시 포함, 배칭은 서버 측에서 처리)
+    if _USE_HTTP_BACKEND:
+        return await asyncio.to_thread(callLLM, prompt, system, temperature, maxTokens, numCtx, stop, model)
+
+    _ensureAsyncResources()
+
+    startTime = time.time()
+    effectiveCtx = numCtx or OLLAMA_NUM_CTX
+    lastError = None
+    for attempt in range(1, LLM_MAX_RETRIES + 1):
+        try:
+            async with _asyncSlots:
+                result = await asyncio.wait_for(
+                    _callOllamaAsync(prompt, system, temperature, maxTokens, effectiveCtx, stop, model),
+                    timeout=LLM_TIMEOUT,
+                )
+            elapsed = time.time() - startTime
+            logger.debug("[LLM 비동기] 호출 완료 (%.1fs, maxTokens=%s, numCtx=%s)", elapsed, maxTokens, effectiveCtx)
+            return result
+        except asyncio.TimeoutError:
+            lastError = f"Ollama 응답 시간 초과 ({LLM_TIMEOUT}초)"
+            logger.warning("[LLM 비동기] timeout (시도 %s/%s)", attempt, LLM_MAX_RETRIES)
+        except Exception as e:
+            lastError = str(e)
+            logger.warning("[LLM 비동기] 오류 (시도 %s/%s): %s", attempt, LLM_MAX_RETRIES, e)
+        if attempt < LLM_MAX_RETRIES:
+            await asyncio.sleep(1)
+
+    raise TimeoutError(f"LLM 호출 실패 ({LLM_MAX_RETRIES}회 시도): {lastError}")
+
+
+async def _callOllamaAsync(prompt: str, system: str, temperature: float,
+                           maxTokens: int = 512, numCtx: int = None, stop: tuple = (),
+                           model: str = None) -> str:
+    """Ollama 비동기 호출 (AsyncClient)"""
+    effectiveCtx = numCtx or OLLAMA_NUM_CTX
+    messages = []
+    if system:
+        messages.append({"role": "system", "content": system})
+    messages.append({"role": "user", "content": prompt})
+
+    response = await _asyncClient.chat(
+        model=model or OLLAMA_MODEL,
+        messages=messages,
+        options=_buildOllamaOptions(temperature, maxTokens, effectiveCtx, stop),
+        keep_alive=OLLAMA_KEEP_ALIVE,
+    )
+
+    return response["message"]["content"]
+
+
+def _callHTTPBackend(prompt: str, system: str, temperature: float, maxTokens: int = 512,
+                     stop: tuple = ()) -> str:
+    """OpenAI 호환 chat completions 호출 (Groq 우선, 없으면 OPENAI_COMPAT_URL 서버)"""
+    if USE_GROQ and GROQ_API_KEY:
+        return _callOpenAICompat(GROQ_API_URL, GROQ_API_KEY, GROQ_MODEL,
+                                 prompt, system, temperature, maxTokens, stop)
+    return _callOpenAICompat(OPENAI_COMPAT_URL, OPENAI_COMPAT_API_KEY, OPENAI_COMPAT_MODEL or OLLAMA_MODEL,
+                             prompt, system, temperature, maxTokens, stop)
+
+
+def _callOpenAICompat(url: str, apiKey: str, model: str, prompt: str, system: str,
+                      temperature: float, maxTokens: int = 512, stop: tuple = ()) -> str:
+    """OpenAI 호환 API 호출 (Groq 클라우드 / vLLM 등 로컬 추론 서버)"""
     import requests
 
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
+    headers = {"Content-Type": "application/json"}
+    if apiKey:
+        headers["Authorization"] = f"Bearer {apiKey}"
 
     messages = []
     if system:
@@ -234,21 +404,22 @@ def _callGroq(prompt: str, system: str, temperature: float, maxTokens: int = 512
     messages.append({"role": "user", "content": prompt})
 
     data = {
-        "model": GROQ_MODEL,
+        "model": model,
         "messages": messages,
         "temperature": temperature,
-        "max_tokens": maxTokens
+        "max_tokens": maxTokens,
+        "stop": _stopSequences(stop),
     }
 
     response = requests.post(
-        "https://api.groq.com/openai/v1/chat/completions",
+        url,
         headers=headers,
         json=data,
         timeout=30
     )
 
     if response.status_code != 200:
-        raise Exception(f"Groq API 오류: {response.status_code} - {response.text}")
+        raise Exception(f"LLM API 오류 ({url}): {response.status_code} - {response.text}")
 
     result = response.json()
     return result["choices"][0]["message"]["content"]
@@ -263,10 +434,11 @@ def checkLLMAvailable() -> tuple[bool, str]:
     """
     if USE_GROQ and GROQ_API_KEY:
         return True, f"Groq API ({GROQ_MODEL})"
+    if OPENAI_COMPAT_URL:
+        return True, f"OpenAI 호환 서버 ({OPENAI_COMPAT_MODEL or OLLAMA_MODEL})"
 
     try:
-        import ollama
-        ollama.list()
+        _getOllamaClient().list()
         return True, f"Ollama ({OLLAMA_MODEL})"
     except Exception:
         return False, "None"
@@ -294,4 +466,4 @@ def clearCache():
     """캐시 초기화"""
     if LLM_CACHE_ENABLED:
         _cachedLLMCall.cache_clear()
-        print("[LLM 캐시] 초기화 완료")
+        logger.info("[LLM 캐시] 초기화 완료")
@@ -1,12 +1,59 @@
 """답변 생성 노드: LLM 기반 자연어 답변 생성 + 청크 병합/교차참조"""
 
+import asyncio
+import hashlib
+import logging
 import re
 import time
 from typing import Optional
 
 from rag.state import RAGState
-from rag.llm_provider import callLLM
-from rag.constants import HOTEL_INFO, LLM_ENABLED
+from rag.llm_provider import callLLM, callLLMAsync
+from rag.semantic_cache import getSemanticCache, keywordKey
+from rag.keyword_matcher import KeywordMatcher
+from rag.constants import HOTEL_INFO, HOTEL_KEYWORDS_LOWER, LLM_ENABLED, ANSWER_TOKEN_BUDGET
+
+logger = logging.getLogger(__name__)
+
+# 호출마다 재컴파일/캐시 조회하지 않도록 미리 컴파일한 정규식
+_REF_RE = re.compile(r'\[REF:([0-9,\s]+)\]')
+_REF_STRIP_RE = re.compile(r'\s*\[REF:[0-9,\s]+\]')
+_KOREAN_WORD_RE = re.compile(r'[가-힣]{2,}')
+_SENTENCE_END_RE = re.compile(r'[.\n]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_TIME_RE = re.compile(r'\d{1,2}:\d{2}')
+_PRICE_RE = re.compile(r'[\d,]+\s*원')
+_LIST_ITEM_RE = re.compile(r'[-•]\s*[가-힣]')
+_LOCATION_HINT_RE = re.compile(r'(역|정류장|출구|도보|차량|층)')
+_POLICY_HINT_RE = re.compile(r'(가능|불가|금지|허용|필수|제한)')
+_FACILITY_NAME_RE = re.compile(r'[가-힣]{2,}(?:\s+[가-힣]+)*\s*(?:레스토랑|식당|카페|바|라운지|다이닝)')
+_FAQ_FORMAT_RE = re.compile(r'[QA]:|\?.*\n')
+_CHINESE_RUN_RE = re.compile(r'[\u4e00-\u9fff]{3,}')
+_CJK_CHARS_RE = re.compile(r'[\u4e00-\u9fff\u3040-\u30ff]+')
+_MULTI_SPACE_RE = re.compile(r'\s{2,}')
+_MULTI_DOT_RE = re.compile(r'\.{2,}')
+# LLM 답변 후처리: 한자 → 한글 대체어 + 전각 문장부호 → 반각 (str.translate 1회 스캔)
+_CJK_TO_KOREAN_TABLE = str.maketrans({
+    '휴': '휴식', '憩': '', '息': '', '食': '식',
+    '堂': '당', '館': '관', '室': '실', '場': '장',
+    '時': '시', '分': '분', '間': '간', '日': '일',
+    '月': '월', '年': '년', '名': '명', '人': '인',
+    '無': '무', '有': '유', '可': '가', '不': '불',
+    '。': '.', '，': ', ', '！': '!', '？': '?',
+})
+
+# 호텔 대표 연락처 질문 (HOTEL_INFO 템플릿 응답, LLM 생략)
+_CONTACT_QUERY_MATCHER = KeywordMatcher(["전화", "연락처", "대표번호", "전화번호"])
+# 명시적 대표번호 요청 ("대표번호", "대표 전화", "대표 연락처")
+_MAIN_CONTACT_RE = re.compile(r'대표\s*(?:번호|전화|연락처)')
+# 단순 "<호텔> 전화번호/연락처" 판정: 호텔명 제거 후 남는 토큰이 모두 연락처어/기능어여야 함
+_HOTEL_NAME_RE = re.compile("|".join(map(re.escape, sorted(
+    {kw for kws in HOTEL_KEYWORDS_LOWER.values() for kw in kws}
+    | {info["name"].lower() for info in HOTEL_INFO.values()},
+    key=len, reverse=True,
+))))
+_CONTACT_TOKEN_RE = re.compile(r'[가-힣a-z0-9]{2,}')
+_CONTACT_FILLER_RE = re.compile(r'^(?:대표|전화|연락처?|번호|알려|뭐|무엇|어떻게|좀|혹시|호텔|문의|주세요|궁금)')
 
 
 def answerComposeNode(state: RAGState) -> dict:
@@ -16,6 +63,40 @@ def answerComposeNode(state: RAGState) -> dict:
     - URL 메타데이터에서 핵심 상세 정보 추출하여 컨텍스트에 포함
     - 청크 간 보완 관계 분석으로 완성도 높은 답변 생성
     """
+    earlyResult, plan = _prepareCompose(state)
+    if earlyResult is not None:
+        return earlyResult
+
+    answer = None
+    if plan["useLLM"]:
+        answer = _generateWithLLM(plan["query"], plan["context"], plan["hotel"], maxTokens=plan["maxTokens"])
+
+    return _finishCompose(state, plan, answer)
+
+
+async def answerComposeNodeAsync(state: RAGState) -> dict:
+    """답변 생성 노드 (비동기): graph.ainvoke 경로에서 LLM 호출만 비동기로 수행
+
+    동시 요청이 Ollama 병렬 슬롯(OLLAMA_NUM_PARALLEL)에 분산되도록
+    callLLMAsync를 사용한다. 나머지 처리는 answerComposeNode와 동일.
+    """
+    earlyResult, plan = _prepareCompose(state)
+    if earlyResult is not None:
+        return earlyResult
+
+    answer = None
+    if plan["useLLM"]:
+        answer = await _generateWithLLMAsync(plan["query"], plan["context"], plan["hotel"], maxTokens=plan["maxTokens"])
+
+    return _finishCompose(state, plan, answer)
+
+
+def _prepareCompose(state: RAGState) -> tuple[Optional[dict], Optional[dict]]:
+    """LLM 호출 전 단계: 컨텍스트 구성 + 조기 종료 판단
+
+    Returns:
+        (조기 종료 결과, None) 또는 (None, LLM 호출 계획 dict)
+    """
     _start = time.time()
     chunks = state["retrieved_chunks"]
     query = state["normalized_query"]
@@ -23,16 +104,15 @@ def answerComposeNode(state: RAGState) -> dict:
 
     if not chunks:
         return {
-            **state,
             "answer": "",
             "sources": [],
-        }
+        }, None
 
     # === Phase 1: 청크 중복 제거 및 정보 병합 ===
     # 단순 싱글턴 질문만 상위 3개 (멀티턴은 맥락 유지를 위해 5개)
     history = state.get("history", [])
     maxChunks = 3 if len(query) < 20 and not history else 5
-    mergedChunks = _mergeChunkInfo(chunks[:maxChunks])
+    mergedChunks = _mergeChunkInfo(_filterRelevantChunks(chunks[:maxChunks]))
 
     # 컨텍스트 구성 + 출처 수집
     contextParts = []
@@ -42,7 +122,8 @@ def answerComposeNode(state: RAGState) -> dict:
     for i, chunk in enumerate(mergedChunks, 1):
         hotelName = chunk["metadata"].get("hotel_name", "")
         url = chunk["metadata"].get("url", "")
-        text = chunk["text"]
+        # 최상위 청크는 원문 유지, 나머지는 질문 관련 구간만 (LLM prefill 토큰 절감)
+        text = chunk["text"] if i == 1 else _trimToQueryWindow(chunk["text"], query)
 
         # === Phase 2: URL 메타데이터에서 핵심 정보 추출 ===
         urlDetails = _extractUrlDetails(url, chunk)
@@ -67,10 +148,16 @@ def answerComposeNode(state: RAGState) -> dict:
     insufficiencyResult = _checkContextSufficiency(query, chunks, hotel)
     if insufficiencyResult:
         return {
-            **state,
             "answer": insufficiencyResult,
             "sources": [src["url"] for src in sources],
-        }
+        }, None
+
+    # === 호텔 대표 연락처 질문: HOTEL_INFO 템플릿 응답 (LLM 생략) ===
+    contactResult = _tryContactAnswer(query, hotel, state)
+    if contactResult:
+        _elapsed = time.time() - _start
+        logger.debug("[타이밍] answerCompose: %.3fs (연락처 템플릿, LLM 생략)", _elapsed)
+        return contactResult, None
 
     # === 고점수 FAQ 직접 추출 (LLM 스킵으로 10~20초 절약) ===
     topScore = state.get("top_score", 0)
@@ -78,24 +165,43 @@ def answerComposeNode(state: RAGState) -> dict:
     if directExtractResult:
         directAnswer, directSources = directExtractResult
         _elapsed = time.time() - _start
-        print(f"[타이밍] answerCompose: {_elapsed:.3f}s (직접 추출, LLM 생략)")
+        logger.debug("[타이밍] answerCompose: %.3fs (직접 추출, LLM 생략)", _elapsed)
         return {
-            **state,
             "answer": directAnswer,
             "sources": directSources,
-        }
+        }, None
 
-    # LLM 사용 여부에 따라 분기
-    usedRefs = []
     llmFailed = state.get("llm_failed", False)
     if llmFailed:
-        print(f"[answerCompose] queryRewrite LLM 실패 감지 → LLM 건너뛰고 chunk 직접 추출")
+        logger.debug("[answerCompose] queryRewrite LLM 실패 감지 → LLM 건너뛰고 chunk 직접 추출")
+
+    # 동적 maxTokens: 짧은 단순 질문 → 256, 복합 질문 → 512
+    dynamicMaxTokens = 200 if len(query) < 15 else 256 if len(mergedChunks) <= 2 else 350
+    # 단답형 카테고리(체크인 시간, 주차 등)는 카테고리 상한 적용
+    category = state.get("effective_category") or state.get("category")
+    if category in ANSWER_TOKEN_BUDGET:
+        dynamicMaxTokens = min(dynamicMaxTokens, ANSWER_TOKEN_BUDGET[category])
+
+    return None, {
+        "start": _start,
+        "query": query,
+        "hotel": hotel,
+        "chunks": chunks,
+        "context": context,
+        "sources": sources,
+        "maxTokens": dynamicMaxTokens,
+        "useLLM": LLM_ENABLED and not llmFailed,
+    }
 
-    if LLM_ENABLED and not llmFailed:
-        # 동적 maxTokens: 짧은 단순 질문 → 256, 복합 질문 → 512
-        dynamicMaxTokens = 200 if len(query) < 15 else 256 if len(mergedChunks) <= 2 else 350
-        answer = _generateWithLLM(query, context, hotel, maxTokens=dynamicMaxTokens)
 
+def _finishCompose(state: RAGState, plan: dict, answer: Optional[str]) -> dict:
+    """LLM 호출 후 단계: 실패 fallback, 참조 파싱, 출처 필터링"""
+    query = plan["query"]
+    chunks = plan["chunks"]
+    sources = plan["sources"]
+    usedRefs = []
+
+    if plan["useLLM"]:
         # LLM 실패 감지 → top chunk 직접 추출 fallback
         llmFailed = "일시적인 오류로 답변을 생성하지 못했습니다" in answer
         if llmFailed and chunks:
@@ -106,22 +212,22 @@ def answerComposeNode(state: RAGState) -> dict:
                 if extracted and len(extracted) >= 10:
                     # raw dump 검증: 원시 청크 데이터가 아닌지 확인
                     if answerVerifier.isRawDump(extracted):
-                        print(f"[LLM 실패 Fallback] raw dump 감지 → 스킵: {extracted[:60]}...")
+                        logger.debug("[LLM 실패 Fallback] raw dump 감지 → 스킵: %s...", extracted[:60])
                         continue
                     chunkUrl = chunk.get("metadata", {}).get("url", chunk.get("url", ""))
                     answer = extracted
                     if chunkUrl:
                         answer += f"\n\n참고 정보: {chunkUrl}"
                     usedRefs = [1]
-                    print(f"[LLM 실패 Fallback] chunk에서 직접 추출: {extracted[:80]}...")
+                    logger.debug("[LLM 실패 Fallback] chunk에서 직접 추출: %s...", extracted[:80])
                     break
 
         # [REF:1,3] 형태의 참조 번호 파싱
-        refMatch = re.search(r'\[REF:([0-9,\s]+)\]', answer)
+        refMatch = _REF_RE.search(answer)
         if refMatch:
             refStr = refMatch.group(1)
             usedRefs = [int(r.strip()) for r in refStr.split(',') if r.strip().isdigit()]
-            answer = re.sub(r'\s*\[REF:[0-9,\s]+\]', '', answer).strip()
+            answer = _REF_STRIP_RE.sub('', answer).strip()
     else:
         # LLM 미사용 또는 LLM 실패 시 — chunk 직접 추출
         from rag.verify import answerVerifier
@@ -134,16 +240,14 @@ def answerComposeNode(state: RAGState) -> dict:
                 break
         if not answer:
             # raw chunk를 그대로 출력하지 않고 안전한 거부 응답 반환
-            print(f"[answerCompose] 직접 추출 실패 → raw dump 대신 거부 응답")
+            logger.debug("[answerCompose] 직접 추출 실패 → raw dump 대신 거부 응답")
             answer = "죄송합니다, 해당 내용에 대한 정확한 정보를 현재 자료에서 확인하기 어렵습니다."
         usedRefs = [1]
 
     # 사용된 참조의 URL만 필터링
-    usedSources = []
     if usedRefs:
-        for src in sources:
-            if src["index"] in usedRefs:
-                usedSources.append(src["url"])
+        usedRefSet = set(usedRefs)
+        usedSources = [src["url"] for src in sources if src["index"] in usedRefSet]
     else:
         usedSources = [src["url"] for src in sources]
 
@@ -152,10 +256,9 @@ def answerComposeNode(state: RAGState) -> dict:
     if redirectMsg and answer:
         answer = f"{redirectMsg}\n\n{answer}"
 
-    _elapsed = time.time() - _start
-    print(f"[타이밍] answerCompose: {_elapsed:.3f}s")
+    _elapsed = time.time() - plan["start"]
+    logger.debug("[타이밍] answerCompose: %.3fs", _elapsed)
     return {
-        **state,
         "answer": answer,
         "sources": usedSources,
     }
@@ -163,6 +266,60 @@ def answerComposeNode(state: RAGState) -> dict:
 
 # === 헬퍼 함수 ===
 
+def _isMainContactQuery(queryLower: str) -> bool:
+    """호텔 대표번호를 묻는 질문인지 (명시적 대표번호 요청 또는 호텔명+연락처어만 있는 질문)"""
+    if _MAIN_CONTACT_RE.search(queryLower):
+        return True
+    remainder = _HOTEL_NAME_RE.sub(" ", queryLower)
+    return all(_CONTACT_FILLER_RE.match(tok) for tok in _CONTACT_TOKEN_RE.findall(remainder))
+
+
+def _tryContactAnswer(query: str, hotel: str, state: RAGState) -> Optional[dict]:
+    """호텔 대표 전화번호 질문이면 HOTEL_INFO로 바로 답변
+
+    "대표번호" 요청이나 "<호텔> 전화번호/연락처"처럼 다른 대상이 없는 질문만 처리한다.
+    특정 카테고리(조식/다이닝 등), 레스토랑, 기타 대상("분실물 연락처", "룸서비스 전화번호",
+    "연락처 변경하려면?")이 함께 있으면 업장 번호나 다른 답일 수 있으므로 LLM 경로로 넘긴다.
+    """
+    hotelInfo = HOTEL_INFO.get(hotel)
+    if not hotelInfo or not hotelInfo.get("phone"):
+        return None
+    if state.get("category") or (state.get("restaurant_entity") or {}).get("matched_alias"):
+        return None
+    queryLower = query.lower()
+    if not _CONTACT_QUERY_MATCHER.matches(queryLower) or not _isMainContactQuery(queryLower):
+        return None
+
+    logger.debug("[직접 응답] 연락처 의도 → HOTEL_INFO 템플릿: %s", hotelInfo['name'])
+    locationUrl = hotelInfo.get("locationUrl", "")
+    return {
+        "answer": f"{hotelInfo['name']}의 대표 전화번호는 {hotelInfo['phone']}입니다.",
+        "sources": [locationUrl] if locationUrl else [],
+    }
+
+
+# FAQ 직접 추출: 질문 키워드에서 제외할 기능어/일반어
+_DIRECT_EXTRACT_STOPWORDS = frozenset({
+    "알려줘", "알려주세요", "알려", "어떻게", "언제", "얼마",
+    "무엇", "호텔", "안내", "정보", "문의",
+})
+# 시설 범주 키워드 (의도 매칭에서 제외 — 너무 범용적)
+_FACILITY_GENERICS = frozenset({
+    "레스토랑", "식당", "다이닝", "카페", "라운지", "수영장",
+    "피트니스", "스파", "객실", "시설",
+})
+# 질문 키워드 → FAQ Q: 매칭용 동의어
+_DIRECT_EXTRACT_SYNONYMS = {
+    "다이닝": ["dinner", "dining", "레스토랑", "식당"],
+    "조식": ["breakfast", "아침", "뷔페", "모닝"],
+    "수영장": ["pool", "swimming"],
+    "피트니스": ["fitness", "gym", "헬스"],
+    "스파": ["spa", "마사지"],
+    "체크인": ["check-in", "입실"],
+    "체크아웃": ["check-out", "퇴실"],
+}
+
+
 def _tryDirectExtraction(query: str, chunks: list, topScore: float,
                           hotel: str = None) -> Optional[tuple[str, list]]:
     """고점수 FAQ 직접 추출: LLM 호출 없이 chunk에서 바로 답변 추출
@@ -184,9 +341,9 @@ def _tryDirectExtraction(query: str, chunks: list, topScore: float,
     text = topChunk.get("text", "")
     url = topChunk.get("metadata", {}).get("url", "")
 
-    # FAQ 형식만 허용: "Q: ... A: ..." 패턴
+    # FAQ 형식: "Q: ... A: ..." 패턴 (그 외는 초고점수 짧은 청크만 직접 추출)
     if "Q:" not in text or "A:" not in text:
-        return None
+        return _tryHighConfidenceExtraction(query, topChunk, topScore)
 
     qPart = text.split("A:")[0].strip()  # Q: 부분
     aPart = text.split("A:")[-1].strip()  # A: 부분
@@ -196,30 +353,16 @@ def _tryDirectExtraction(query: str, chunks: list, topScore: float,
         return None
 
     # 질문 키워드가 Q: 부분에 포함되는지 검증 (오매칭 방지)
-    queryKeywords = set(re.findall(r'[가-힣]{2,}', query.lower()))
+    queryKeywords = set(_KOREAN_WORD_RE.findall(query.lower()))
     # 기능어/일반어 제거
-    queryKeywords -= {"알려줘", "알려주세요", "알려", "어떻게", "언제", "얼마",
-                      "무엇", "호텔", "안내", "정보", "문의"}
+    queryKeywords -= _DIRECT_EXTRACT_STOPWORDS
     qPartLower = qPart.lower()
 
-    # 시설 범주 키워드 (의도 매칭에서 제외 — 너무 범용적)
-    FACILITY_GENERICS = {"레스토랑", "식당", "다이닝", "카페", "라운지", "수영장",
-                         "피트니스", "스파", "객실", "시설"}
-
     # 동의어 확장 매칭 (다이닝↔dinner, 조식↔breakfast 등)
-    SYNONYM_PAIRS = {
-        "다이닝": ["dinner", "dining", "레스토랑", "식당"],
-        "조식": ["breakfast", "아침", "뷔페", "모닝"],
-        "수영장": ["pool", "swimming"],
-        "피트니스": ["fitness", "gym", "헬스"],
-        "스파": ["spa", "마사지"],
-        "체크인": ["check-in", "입실"],
-        "체크아웃": ["check-out", "퇴실"],
-    }
     expandedKeywords = set(queryKeywords)
     for kw in queryKeywords:
-        if kw in SYNONYM_PAIRS:
-            expandedKeywords.update(SYNONYM_PAIRS[kw])
+        if kw in _DIRECT_EXTRACT_SYNONYMS:
+            expandedKeywords.update(_DIRECT_EXTRACT_SYNONYMS[kw])
 
     matchCount = sum(1 for kw in expandedKeywords if kw in qPartLower)
     if matchCount < 1:
@@ -227,22 +370,102 @@ def _tryDirectExtraction(query: str, chunks: list, topScore: float,
 
     # 핵심 의도 키워드 검증: 시설 범주를 제외한 주제 키워드가 Q:에 있어야 함
     # 예: "레스토랑 운영시간" → 주제="운영", "시간" / "레스토랑 콜키지" → 주제="콜키지"
-    topicKeywords = queryKeywords - FACILITY_GENERICS
+    topicKeywords = queryKeywords - _FACILITY_GENERICS
     if topicKeywords:
         topicMatchCount = sum(1 for kw in topicKeywords if kw in qPartLower)
         if topicMatchCount == 0:
-            print(f"[직접 추출 거부] 주제 불일치: 쿼리 의도={topicKeywords}, FAQ Q='{qPart[:50]}...'")
+            logger.debug("[직접 추출 거부] 주제 불일치: 쿼리 의도=%s, FAQ Q='%s...'", topicKeywords, qPart[:50])
             return None  # 핵심 의도 키워드가 FAQ에 없음 → 주제 불일치
 
     # 첫 문장이 너무 짧으면 (단어만) LLM에 맡김
-    firstSentence = re.split(r'[.\n]', aPart)[0].strip()
+    firstSentence = _SENTENCE_END_RE.split(aPart)[0].strip()
     if len(firstSentence) < 8:
         return None
 
     sources = [url] if url else []
-    print(f"[직접 추출] FAQ 형식, score={topScore:.3f}, Q매칭={matchCount}/{len(queryKeywords)}, 답변 길이={len(aPart)}")
+    logger.debug("[직접 추출] FAQ 형식, score=%.3f, Q매칭=%s/%s, 답변 길이=%s", topScore, matchCount, len(queryKeywords), len(aPart))
     return aPart, sources
 
+
+# 초고점수 직접 추출 조건 (비 FAQ 청크)
+HIGH_CONFIDENCE_THRESHOLD = 0.90
+HIGH_CONFIDENCE_MAX_CHARS = 400
+# 여러 정보를 종합해야 하는 질문 → LLM 필요
+SYNTHESIS_KEYWORDS = ("비교", "추천", "차이", "어떤게", "어떤 게", "뭐가 나아", "장단점")
+_SYNTHESIS_MATCHER = KeywordMatcher(SYNTHESIS_KEYWORDS)
+
+
+def _tryHighConfidenceExtraction(query: str, topChunk: dict,
+                                 topScore: float) -> Optional[tuple[str, list]]:
+    """초고점수 짧은 청크 직접 추출: 청크 자체가 답인 경우 LLM 생략
+
+    score >= 0.90 이고 청크가 짧으면(400자 이하) 청크를 그대로 정리해 반환.
+    비교/추천 등 종합이 필요한 질문은 제외.
+
+    Returns:
+        (answer, sources) 또는 None (직접 추출 불가)
+    """
+    text = topChunk.get("text", "")
+    if topScore < HIGH_CONFIDENCE_THRESHOLD or len(text) > HIGH_CONFIDENCE_MAX_CHARS:
+        return None
+    if _SYNTHESIS_MATCHER.matches(query):
+        return None
+
+    from rag.verify import answerVerifier
+    extracted = answerVerifier.extractDirectAnswer(text, query)
+    if not extracted or answerVerifier.isRawDump(extracted):
+        return None
+
+    url = topChunk.get("metadata", {}).get("url", "")
+    sources = [url] if url else []
+    logger.debug("[직접 추출] 초고점수 청크, score=%.3f, 청크 길이=%s", topScore, len(text))
+    return extracted, sources
+
+
+# 컨텍스트 축소 조건
+CONTEXT_RELATIVE_SCORE = 0.7  # 최상위 점수 대비 이 비율 미만 청크는 컨텍스트에서 제외
+CONTEXT_CHUNK_MAX_CHARS = 400  # 보조 청크(2위 이하) 최대 길이
+_QUERY_TOKEN_RE = re.compile(r'[가-힣a-zA-Z0-9]{2,}')
+
+
+def _filterRelevantChunks(chunks: list) -> list:
+    """최상위 점수 대비 낮은 점수의 청크 제외 (최상위 청크는 항상 유지)"""
+    if len(chunks) <= 1:
+        return chunks
+    minScore = chunks[0].get("score", 0) * CONTEXT_RELATIVE_SCORE
+    return chunks[:1] + [c for c in chunks[1:] if c.get("score", 0) >= minScore]
+
+
+def _trimToQueryWindow(text: str, query: str, maxChars: int = CONTEXT_CHUNK_MAX_CHARS) -> str:
+    """긴 청크에서 질문 키워드가 가장 많이 등장하는 줄 주변만 maxChars 이내로 추출"""
+    if len(text) <= maxChars:
+        return text
+
+    # 조사/복합어 대응: 앞 2글자만 비교 ("주차요금" → "주차")
+    queryTokens = {tok[:2] for tok in _QUERY_TOKEN_RE.findall(query.lower())}
+    lines = [line for line in text.split('\n') if line.strip()]
+    if not queryTokens or not lines:
+        return text[:maxChars]
+
+    lineScores = [sum(tok in line.lower() for tok in queryTokens) for line in lines]
+    bestIdx = max(range(len(lines)), key=lineScores.__getitem__)
+
+    # 최적 줄에서 시작해 아래 → 위 순으로 확장
+    start, end = bestIdx, bestIdx + 1
+    total = len(lines[bestIdx])
+    while True:
+        if end < len(lines) and total + len(lines[end]) + 1 <= maxChars:
+            total += len(lines[end]) + 1
+            end += 1
+        elif start > 0 and total + len(lines[start - 1]) + 1 <= maxChars:
+            start -= 1
+            total += len(lines[start]) + 1
+        else:
+            break
+
+    return '\n'.join(lines[start:end])[:maxChars]
+
+
 def _mergeChunkInfo(chunks: list) -> list:
     """복수 청크의 중복 제거 및 정보 병합"""
     if len(chunks) <= 1:
@@ -319,7 +542,7 @@ def _deduplicateSentences(text: str, seenSentences: set) -> str:
             seenSentences.add(stripped)
             continue
 
-        normalized = re.sub(r'\s+', ' ', stripped).lower()
+        normalized = _WHITESPACE_RE.sub(' ', stripped).lower()
         if len(normalized) < 10:
             uniqueLines.append(line)
             continue
@@ -331,6 +554,38 @@ def _deduplicateSentences(text: str, seenSentences: set) -> str:
     return '\n'.join(uniqueLines)
 
 
+# URL 경로 → 페이지 설명 (첫 매칭 1개)
+_URL_PATH_LABELS = {
+    "/dining/": "다이닝 정보 페이지",
+    "/room/": "객실 정보 페이지",
+    "/package/": "패키지 상품 페이지",
+    "/facilities/": "부대시설 정보 페이지",
+    "/about/location": "위치/교통 안내 페이지",
+    "/event/": "이벤트/프로모션 페이지",
+    "/activity/": "액티비티 안내 페이지",
+    "/spa/": "스파/웰니스 페이지",
+    "/wedding/": "웨딩/연회 페이지",
+}
+# 청크 page_type → 라벨
+_PAGE_TYPE_LABELS = {
+    "dining_menu": "메뉴 상세",
+    "package": "패키지 상품",
+    "event": "이벤트",
+    "activity": "액티비티",
+    "pet_policy": "반려동물 정책",
+    "contact": "연락처",
+    "breakfast": "조식 정보",
+}
+# 호텔 서브도메인 → 호텔명
+_HOTEL_DOMAIN_NAMES = {
+    "jpg.josunhotel.com": "조선 팰리스",
+    "gjb.josunhotel.com": "그랜드 조선 부산",
+    "gjj.josunhotel.com": "그랜드 조선 제주",
+    "les.josunhotel.com": "레스케이프",
+    "grp.josunhotel.com": "그래비티 판교",
+}
+
+
 def _extractUrlDetails(url: str, chunk: dict) -> str:
     """URL 메타데이터에서 핵심 상세 정보 추출"""
     if not url:
@@ -340,45 +595,17 @@ def _extractUrlDetails(url: str, chunk: dict) -> str:
     urlLower = url.lower()
     metadata = chunk.get("metadata", {})
 
-    pageTypeMap = {
-        "/dining/": "다이닝 정보 페이지",
-        "/room/": "객실 정보 페이지",
-        "/package/": "패키지 상품 페이지",
-        "/facilities/": "부대시설 정보 페이지",
-        "/about/location": "위치/교통 안내 페이지",
-        "/event/": "이벤트/프로모션 페이지",
-        "/activity/": "액티비티 안내 페이지",
-        "/spa/": "스파/웰니스 페이지",
-        "/wedding/": "웨딩/연회 페이지",
-    }
-
-    for pathKey, pageDesc in pageTypeMap.items():
+    for pathKey, pageDesc in _URL_PATH_LABELS.items():
         if pathKey in urlLower:
             details.append(pageDesc)
             break
 
     pageType = metadata.get("page_type", "")
     if pageType and pageType not in ["faq", "general"]:
-        typeLabels = {
-            "dining_menu": "메뉴 상세",
-            "package": "패키지 상품",
-            "event": "이벤트",
-            "activity": "액티비티",
-            "pet_policy": "반려동물 정책",
-            "contact": "연락처",
-            "breakfast": "조식 정보",
-        }
-        label = typeLabels.get(pageType, pageType)
+        label = _PAGE_TYPE_LABELS.get(pageType, pageType)
         details.append(label)
 
-    hotelDomainMap = {
-        "jpg.josunhotel.com": "조선 팰리스",
-        "gjb.josunhotel.com": "그랜드 조선 부산",
-        "gjj.josunhotel.com": "그랜드 조선 제주",
-        "les.josunhotel.com": "레스케이프",
-        "grp.josunhotel.com": "그래비티 판교",
-    }
-    for domain, name in hotelDomainMap.items():
+    for domain, name in _HOTEL_DOMAIN_NAMES.items():
         if domain in urlLower:
             details.append(f"출처 호텔: {name}")
             break
@@ -396,15 +623,15 @@ def _buildCrossRefHint(chunks: list, query: str) -> str:
         text = chunk.get("text", "")
         infoTypes = []
 
-        if re.search(r'\d{1,2}:\d{2}', text):
+        if _TIME_RE.search(text):
             infoTypes.append("운영시간")
-        if re.search(r'[\d,]+\s*원', text):
+        if _PRICE_RE.search(text):
             infoTypes.append("가격")
-        if re.search(r'[-•]\s*[가-힣]', text) or text.count('\n') > 5:
+        if _LIST_ITEM_RE.search(text) or text.count('\n') > 5:
             infoTypes.append("항목목록")
-        if re.search(r'(역|정류장|출구|도보|차량|층)', text):
+        if _LOCATION_HINT_RE.search(text):
             infoTypes.append("위치/접근")
-        if re.search(r'(가능|불가|금지|허용|필수|제한)', text):
+        if _POLICY_HINT_RE.search(text):
             infoTypes.append("정책/규정")
 
         metadata = chunk.get("metadata", {})
@@ -452,13 +679,10 @@ def _checkContextSufficiency(query: str, chunks: list, hotel: str = None) -> Opt
 
     allChunkText = " ".join([c.get("text", "") for c in chunks[:5]])
 
-    hasSpecificTime = bool(re.search(r'\d{1,2}:\d{2}', allChunkText))
-    hasSpecificName = bool(re.search(
-        r'[가-힣]{2,}(?:\s+[가-힣]+)*\s*(?:레스토랑|식당|카페|바|라운지|다이닝)',
-        allChunkText
-    ))
-    hasSpecificPrice = bool(re.search(r'[\d,]+\s*원', allChunkText))
-    hasFaqFormat = bool(re.search(r'[QA]:|\?.*\n', allChunkText))
+    hasSpecificTime = bool(_TIME_RE.search(allChunkText))
+    hasSpecificName = bool(_FACILITY_NAME_RE.search(allChunkText))
+    hasSpecificPrice = bool(_PRICE_RE.search(allChunkText))
+    hasFaqFormat = bool(_FAQ_FORMAT_RE.search(allChunkText))
 
     if hasSpecificTime or hasSpecificName or hasSpecificPrice or hasFaqFormat:
         return None
@@ -468,12 +692,12 @@ def _checkContextSufficiency(query: str, chunks: list, hotel: str = None) -> Opt
     hotelPhone = hotelInfo.get("phone", "")
     contactInfo = f"{hotelName} ({hotelPhone})" if hotelPhone else "호텔 고객센터"
 
-    print(f"[맥락 충분성] 구체적 정보 부족 — 일반론만 존재, LLM 호출 생략")
+    logger.debug("[맥락 충분성] 구체적 정보 부족 — 일반론만 존재, LLM 호출 생략")
     return f"죄송합니다, 해당 내용에 대한 구체적인 정보를 현재 자료에서 확인하기 어렵습니다.\n자세한 사항은 {contactInfo}로 문의 부탁드립니다."
 
 
-def _generateWithLLM(query: str, context: str, hotel: str = None, maxTokens: int = 512) -> str:
-    """Ollama LLM으로 답변 생성"""
+def _buildSystemPrompt(hotel: str = None) -> str:
+    """호텔별 답변 생성 시스템 프롬프트"""
     hotelInfo = HOTEL_INFO.get(hotel, {})
     hotelName = hotelInfo.get("name", "")
     hotelPhone = hotelInfo.get("phone", "")
@@ -487,11 +711,21 @@ def _generateWithLLM(query: str, context: str, hotel: str = None, maxTokens: int
 - 다른 호텔 정보를 섞지 마세요
 - 문의 안내 시: {contactInfo}"""
 
-    systemPrompt = f"""조선호텔 AI 컨시어지. 존댓말 응대.{currentHotelNotice}
+    return f"""조선호텔 AI 컨시어지. 존댓말 응대.{currentHotelNotice}
 
 [원칙] 아래 참고 정보에 명시된 내용만 사용. 참고 정보에 없는 시설명, 레스토랑명, 교통편, 버스노선, 지하철역 절대 창작 금지. 가격/시간/번호는 참고 정보에서 정확히 인용. 추측("약","대략","아마") 금지. 참고 정보에 없으면 "{contactInfo}로 문의 부탁드립니다".
 [형식] 완성 문장, 첫 문장에 직접 답변, 추가정보는 불릿(-), 답변 끝 질문 금지."""
 
+
+# 호텔별 시스템 프롬프트 사전 생성 (호출마다 동일 바이트 → Ollama 프롬프트 prefix 캐시 재사용)
+_SYSTEM_PROMPTS = {hotelKey: _buildSystemPrompt(hotelKey) for hotelKey in HOTEL_INFO}
+_SYSTEM_PROMPTS[None] = _buildSystemPrompt(None)
+
+
+def _buildLLMPrompts(query: str, context: str, hotel: str = None) -> tuple[str, str]:
+    """답변 생성용 (시스템 프롬프트, 사용자 프롬프트) 구성"""
+    systemPrompt = _SYSTEM_PROMPTS.get(hotel) or _SYSTEM_PROMPTS[None]
+
     userPrompt = f"""[참고 정보]
 {context}
 
@@ -501,6 +735,86 @@ def _generateWithLLM(query: str, context: str, hotel: str = None, maxTokens: int
 중요: 위 참고 정보에 명시된 이름, 숫자, 사실만 사용하세요. 참고 정보에 없는 시설명이나 교통편을 만들어내지 마세요.
 답변 마지막에 사용한 참조 번호 표시: [REF:1,3]"""
 
+    return systemPrompt, userPrompt
+
+
+def _cleanLLMAnswer(answer: str) -> str:
+    """후처리: 중국어/일본어 문자 제거 (qwen 모델의 할루시네이션 방지)"""
+    # 1) 3글자 이상 연속 한자 → 해당 지점부터 잘라내기
+    chinesePart = _CHINESE_RUN_RE.search(answer)
+    if chinesePart:
+        cutIndex = chinesePart.start()
+        answer = answer[:cutIndex].strip()
+        if answer and not answer.endswith(('.', '다', '요', '!')):
+            answer = answer.rstrip(',.;:')
+            if answer:
+                answer += "."
+
+    # 2) 개별 한자/일본어 문자를 한글 대체어로, 전각 문장부호를 반각으로 치환
+    #    (전각 부호는 3)의 제거 범위 밖이고 대체어에도 없으므로 순서를 합쳐도 결과 동일)
+    answer = answer.translate(_CJK_TO_KOREAN_TABLE)
+
+    # 3) 남은 한자/일본어 문자 일괄 제거
+    answer = _CJK_CHARS_RE.sub('', answer)
+    answer = _MULTI_SPACE_RE.sub(' ', answer).strip()
+    answer = _MULTI_DOT_RE.sub('.', answer)
+
+    return answer
+
+
+def _llmErrorAnswer(hotel: str = None) -> str:
+    """LLM 호출 실패 시 안내 메시지"""
+    hotelInfo = HOTEL_INFO.get(hotel, {})
+    hotelName = hotelInfo.get("name", "")
+    hotelPhone = hotelInfo.get("phone", "")
+
+    if hotelName and hotelPhone:
+        return f"죄송합니다, 일시적인 오류로 답변을 생성하지 못했습니다.\n자세한 사항은 {hotelName} ({hotelPhone})로 문의 부탁드립니다."
+    return "죄송합니다, 일시적인 오류로 답변을 생성하지 못했습니다.\n잠시 후 다시 시도해 주세요."
+
+
+# 답변 캐시는 단일 버킷 (근거/질문 핵심어는 항목 키로 정확 일치 비교)
+_ANSWER_CACHE_SCOPE = ()
+
+
+def _answerCacheKey(query: str, context: str, hotel: str = None) -> tuple:
+    """답변 캐시 항목 키: 호텔 + 검색 컨텍스트 + 질문 핵심어
+
+    같은 근거라도 묻는 항목이 다르면("조식 시간은?" / "조식 가격은?") 재사용하지 않도록
+    질문 핵심어까지 일치해야 한다.
+    """
+    return (hotel, hashlib.md5(context.encode('utf-8')).hexdigest(), keywordKey(query))
+
+
+# 동일 LLM 오류의 스택 트레이스는 키별 최소 간격마다 1회만 기록 (장애 시 로그 폭주 방지)
+_LLM_ERROR_TRACE_INTERVAL = 60.0
+_llmErrorLastTraced = {}
+
+
+def _logLLMError(e: Exception):
+    """LLM 호출 오류 기록 (요약은 매번, 스택 트레이스는 같은 오류당 분당 1회)"""
+    errorKey = (type(e).__name__, str(e)[:64])
+    now = time.monotonic()
+    lastTraced = _llmErrorLastTraced.get(errorKey)
+    withTrace = lastTraced is None or now - lastTraced >= _LLM_ERROR_TRACE_INTERVAL
+    if withTrace:
+        if len(_llmErrorLastTraced) >= 256:  # 오류 메시지 변형이 많을 때 무한 증가 방지
+            _llmErrorLastTraced.clear()
+        _llmErrorLastTraced[errorKey] = now
+    logger.warning("[LLM 에러] %s: %s", type(e).__name__, e, exc_info=withTrace)
+
+
+def _generateWithLLM(query: str, context: str, hotel: str = None, maxTokens: int = 512) -> str:
+    """Ollama LLM으로 답변 생성"""
+    # 시맨틱 캐시: 같은 컨텍스트에 대한 유사 질문은 이전 답변 재사용 (LLM 생략)
+    semanticCache = getSemanticCache()
+    cacheKey = _answerCacheKey(query, context, hotel)
+    cachedAnswer = semanticCache.get("answer", _ANSWER_CACHE_SCOPE, query, cacheKey)
+    if cachedAnswer:
+        return cachedAnswer
+
+    systemPrompt, userPrompt = _buildLLMPrompts(query, context, hotel)
+
     try:
         try:
             answer = callLLM(
@@ -517,40 +831,37 @@ def _generateWithLLM(query: str, context: str, hotel: str = None, maxTokens: int
                 temperature=0.0
             ).strip()
 
-        # 후처리: 중국어/일본어 문자 제거 (qwen 모델의 할루시네이션 방지)
-        # 1) 3글자 이상 연속 한자 → 해당 지점부터 잘라내기
-        chinesePart = re.search(r'[\u4e00-\u9fff]{3,}', answer)
-        if chinesePart:
-            cutIndex = chinesePart.start()
-            answer = answer[:cutIndex].strip()
-            if answer and not answer.endswith(('.', '다', '요', '!')):
-                answer = answer.rstrip(',.;:')
-                if answer:
-                    answer += "."
-
-        # 2) 개별 한자/일본어 문자를 한글 대체어로 치환
-        chineseToKorean = {
-            '휴': '휴식', '憩': '', '息': '', '食': '식',
-            '堂': '당', '館': '관', '室': '실', '場': '장',
-            '時': '시', '分': '분', '間': '간', '日': '일',
-            '月': '월', '年': '년', '名': '명', '人': '인',
-            '無': '무', '有': '유', '可': '가', '不': '불',
-        }
-        for char, replacement in chineseToKorean.items():
-            answer = answer.replace(char, replacement)
-
-        # 3) 남은 한자/일본어 문자 일괄 제거
-        answer = re.sub(r'[\u4e00-\u9fff\u3040-\u30ff]+', '', answer)
-        answer = answer.replace('。', '.').replace('，', ', ').replace('！', '!').replace('？', '?')
-        answer = re.sub(r'\s{2,}', ' ', answer).strip()
-        answer = re.sub(r'\.{2,}', '.', answer)
-
+        answer = _cleanLLMAnswer(answer)
+        semanticCache.put("answer", _ANSWER_CACHE_SCOPE, query, answer, cacheKey)
         return answer
     except Exception as e:
-        import traceback
-        print(f"[LLM 에러] {type(e).__name__}: {e}")
-        traceback.print_exc()
+        _logLLMError(e)
+        return _llmErrorAnswer(hotel)
 
-        if hotelName and hotelPhone:
-            return f"죄송합니다, 일시적인 오류로 답변을 생성하지 못했습니다.\n자세한 사항은 {contactInfo}로 문의 부탁드립니다."
-        return "죄송합니다, 일시적인 오류로 답변을 생성하지 못했습니다.\n잠시 후 다시 시도해 주세요."
+
+async def _generateWithLLMAsync(query: str, context: str, hotel: str = None, maxTokens: int = 512) -> str:
+    """Ollama LLM으로 답변 생성 (비동기, 동시 요청 병렬 처리)"""
+    # 캐시 조회/저장의 질문 임베딩은 CPU 연산 → 스레드로 넘겨 이벤트 루프의 다른 요청을 막지 않음
+    semanticCache = getSemanticCache()
+    cacheKey = _answerCacheKey(query, context, hotel)
+    cachedAnswer = await asyncio.to_thread(semanticCache.get, "answer", _ANSWER_CACHE_SCOPE, query, cacheKey)
+    if cachedAnswer:
+        return cachedAnswer
+
+    systemPrompt, userPrompt = _buildLLMPrompts(query, context, hotel)
+
+    try:
+        answer = (await callLLMAsync(
+            prompt=userPrompt,
+            system=systemPrompt,
+            temperature=0.0,
+            maxTokens=maxTokens,
+            numCtx=2048  # 기본 4096의 절반, KV캐시 절감
+        )).strip()
+
+        answer = _cleanLLMAnswer(answer)
+        await asyncio.to_thread(semanticCache.put, "answer", _ANSWER_CACHE_SCOPE, query, answer, cacheKey)
+        return answer
+    except Exception as e:
+        _logLLMError(e)
+        return _llmErrorAnswer(hotel)
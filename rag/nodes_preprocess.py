@@ -1,18 +1,215 @@
 """전처리 노드: 쿼리 재작성, 입력 정규화, 명확화 체크"""
 
+import logging
 import re
 import time
 from typing import Optional
 
 from rag.state import RAGState
-from rag.llm_provider import callLLM
+from rag.llm_provider import callLLM, OLLAMA_REWRITE_MODEL
+from rag.semantic_cache import getSemanticCache, keywordKey, contextKey as historyContextKey
+from rag.keyword_matcher import KeywordMatcher
 from rag.entity import extractRestaurantEntity
 from rag.constants import (
-    HOTEL_KEYWORDS, CATEGORY_KEYWORDS, VALID_QUERY_KEYWORDS,
+    HOTEL_KEYWORDS_LOWER, CATEGORY_KEYWORDS_LOWER, VALID_QUERY_KEYWORDS_LOWER,
     INVALID_QUERY_PATTERNS, MIN_QUERY_LENGTH, HOTEL_INFO,
     AMBIGUOUS_PATTERNS, CONTEXT_CLARIFICATION,
 )
 
+logger = logging.getLogger(__name__)
+
+
+# 쿼리 재작성 시스템 프롬프트 (요청마다 동일 바이트 → Ollama 프롬프트 prefix 캐시 재사용)
+_REWRITE_SYSTEM_PROMPT = (
+    "한국어 질문 재작성 전문가. 반드시 한국어로만 응답. 질문 1문장만 출력.\n"
+    "이전 대화의 주제(장소/서비스명)를 포함하여 완전한 질문으로 재작성하세요. 다른 주제면 원본 유지."
+)
+
+# === 사전 컴파일 정규식 (모듈 로드 시 1회) ===
+
+# 맥락 참조 패턴 (대명사, 지시어, 암시적 후속 질문)
+_CONTEXT_PATTERNS = (
+    r'^그럼\s*',      # "그럼 ..."
+    r'^그러면\s*',    # "그러면 ..."
+    r'^그래서\s*',    # "그래서 ..."
+    r'^그것\s*',      # "그것 ..."
+    r'^그거\s*',      # "그거 ..."
+    r'^이것\s*',      # "이것 ..."
+    r'^이거\s*',      # "이거 ..."
+    r'^거기\s*',      # "거기 ..."
+    r'^위에\s*',      # "위에 ..."
+    r'^아까\s*',      # "아까 ..."
+    r'도\s*알려',     # "~도 알려줘"
+    r'는\s*어때',     # "~는 어때"
+    r'는\s*어떻게',   # "~는 어떻게"
+    r'^더\s*',        # "더 ..."
+    r'^다른\s*',      # "다른 ..."
+    r'대략|대충|약|정도',  # 추가 정보 요청
+    r'할\s*수\s*있',  # "~할 수 있어?"
+    r'되나요|돼나요',  # "~되나요?"
+    r'가능한가|가능해',  # "~가능한가요?"
+    r'안\s*되나|안\s*돼나',  # "~안 되나요?"
+    r'얼마|비용|가격',  # 비용 질문
+    r'어디|위치|장소',  # 위치 질문
+    r'몇\s*시|언제',  # 시간 질문
+)
+# 단일 alternation으로 결합 → 미매칭 쿼리도 정규식 1회 탐색으로 판정
+_CONTEXT_RE = re.compile("|".join(f"(?:{p})" for p in _CONTEXT_PATTERNS), re.IGNORECASE)
+
+# 블랙리스트 패턴 (단일 alternation)
+_INVALID_QUERY_RE = re.compile("|".join(f"(?:{p})" for p in INVALID_QUERY_PATTERNS), re.IGNORECASE)
+
+# 규칙 기반 재작성: 이전 대화 호텔명/시설명 추출
+_PREV_HOTEL_RE = re.compile(r'\[([^\]]*(?:팰리스|부산|제주|레스케이프|그래비티)[^\]]*)\]')
+_ASSISTANT_FACILITY_PATTERNS = (
+    re.compile(r'([\w가-힣]+\s*(?:레스토랑|식당|카페|바|라운지|뷔페|다이닝))'),
+    re.compile(r'((?:수영장|풀|피트니스|헬스|사우나|스파|키즈클럽|비즈니스\s*센터))'),
+    re.compile(r'((?:조식|석식|런치|디너|브런치))'),
+)
+_USER_FACILITY_PATTERNS = (
+    re.compile(r'([\w가-힣]+\s*(?:레스토랑|식당|카페|바|라운지|뷔페|다이닝))'),
+    re.compile(r'((?:수영장|풀|피트니스|헬스|사우나|스파|키즈클럽))'),
+    re.compile(r'((?:조식|석식|런치|디너|브런치))'),
+)
+_PLACE_FOLLOWUP_RE = re.compile(r'^거기\s+(.+)')
+_THEN_FOLLOWUP_RE = re.compile(r'^그럼\s+(.+)')
+_IF_SO_FOLLOWUP_RE = re.compile(r'^그러면\s+(.+)')
+# 짧은 후속 질문 → 이전 주체 + 속성
+_SHORT_FOLLOWUP_PATTERNS = (
+    (re.compile(r'^몇\s*시'), "운영시간"),
+    (re.compile(r'^얼마'), "가격"),
+    (re.compile(r'^어디'), "위치"),
+    (re.compile(r'^언제'), "운영시간"),
+    (re.compile(r'^예약'), "예약 방법"),
+)
+
+# 재작성 추가 중단 시퀀스 (빈 줄 이후는 설명/부연 → 어차피 버려지는 토큰)
+_REWRITE_STOP = ("\n\n",)
+# LLM 재작성 결과 접두사 제거
+_REWRITE_PREFIX_RE = re.compile(r'^(재작성된\s*질문[:\s]*|질문[:\s]*)')
+# 모호 질문 주체 추출: 조사/어미, 특수문자/공백
+_SUBJECT_PARTICLE_RE = re.compile(r'(에서|인가요|나요|은|는|이|가|의|에|를|을|도|만|야|요|까|어요|해|돼|되)')
+_SUBJECT_PUNCT_RE = re.compile(r'[?!.,~\s]+')
+# 주체 후보에서 제외할 일반어/동작어
+_SUBJECT_GENERIC_WORDS = frozenset({
+    # 일반 명사
+    "운영", "이용", "시설", "서비스", "정보", "안내", "문의",
+    "호텔", "여기", "거기", "저기", "뭐", "무엇", "어떻게", "얼마",
+    "그것", "이것", "그거", "이거", "좀", "혹시", "그런데",
+    # 동작어 (주체가 아닌 서술어)
+    "알려줘", "알려", "해줘", "보여줘", "말해줘", "찾아줘", "가르쳐줘",
+    "알고", "싶어", "싶어요", "싶은데", "궁금", "궁금해", "있나",
+    "없나", "하고", "싶다", "있어", "없어", "될까", "되나",
+})
+
+# === 키워드 그룹 매처 (Aho-Corasick, 질문 1회 탐색) ===
+
+# 주제 전환 감지용 주제 그룹
+_TOPIC_GROUPS = {
+    "객실": ["객실", "방", "룸", "room", "suite", "스위트", "디럭스", "키즈룸"],
+    "다이닝": ["레스토랑", "식당", "다이닝", "조식", "런치", "디너", "뷔페", "카페", "바"],
+    "시설": ["수영장", "풀", "피트니스", "헬스", "사우나", "스파", "키즈클럽"],
+    "교통": ["교통", "택시", "지하철", "버스", "공항", "셔틀", "리무진"],
+    "주차": ["주차"],
+    "반려동물": ["강아지", "반려", "펫", "pet", "개"],
+    "예약": ["예약", "취소", "변경", "환불"],
+    "체크인": ["체크인", "체크아웃", "입실", "퇴실"],
+    "위치": ["위치", "주소", "어디", "오시는길", "찾아오"],
+    "연락처": ["전화", "연락", "번호", "문의"],
+    "웨딩": ["웨딩", "연회", "결혼"],
+}
+_TOPIC_MATCHER = KeywordMatcher(_TOPIC_GROUPS)
+_HOTEL_MATCHER = KeywordMatcher(HOTEL_KEYWORDS_LOWER)
+_CATEGORY_MATCHER = KeywordMatcher(CATEGORY_KEYWORDS_LOWER)
+# 질문 유효성 키워드: 1글자 키워드("방" 등)는 오탐("방구")이 많아 제외
+_VALID_QUERY_MATCHER = KeywordMatcher([kw for kw in VALID_QUERY_KEYWORDS_LOWER if len(kw) >= 2])
+
+# 맥락 인식 명확화: 맥락 키워드 / 직접 검색 트리거
+_CLARIFY_CONTEXT_MATCHER = KeywordMatcher(
+    {key: info["keywords"] for key, info in CONTEXT_CLARIFICATION.items()}
+)
+_DIRECT_TRIGGER_MATCHERS = {
+    key: KeywordMatcher(info.get("direct_triggers", []))
+    for key, info in CONTEXT_CLARIFICATION.items()
+}
+
+# 맥락 + 구체적 대상 → 명확화 없이 검색
+# "반려동물 객실 투숙 정책" → 맥락(반려동물) + 구체적 대상(객실, 정책)
+_CONTEXT_SPECIFIC_TARGET_MATCHER = KeywordMatcher([
+    "객실", "방", "투숙", "숙박", "레스토랑", "다이닝", "로비",
+    "수영장", "풀", "피트니스", "스파", "사우나",
+    "정책", "규정", "패키지", "프로모션", "혜택",
+    "비용", "요금", "가격", "얼마", "무게", "kg", "킬로",
+])
+
+# 이미 구체적인 대상이 있는지 확인하는 키워드들
+_SPECIFIC_TARGET_MATCHER = KeywordMatcher([
+    # 체크인/아웃
+    "체크인", "체크아웃", "checkin", "checkout",
+    # 조식/다이닝
+    "조식", "아침식사", "아침밥", "아침", "브런치", "breakfast",
+    "중식", "점심", "석식", "저녁",
+    "뷔페", "buffet",
+    # 시설
+    "수영장", "풀", "pool", "피트니스", "헬스", "gym", "운동",
+    "스파", "spa", "마사지", "사우나", "찜질",
+    "레스토랑", "다이닝", "라운지", "키즈", "연회", "객실", "방",
+    # 서비스명
+    "주차", "발렛", "와이파이", "세탁", "컨시어지", "룸서비스",
+    # 다이닝 구체적
+    "홍연", "아리아", "콘스탄스", "팔레",
+    # 정책 관련 (명확한 질문)
+    "취소", "환불", "취소정책", "환불정책", "노쇼", "정책", "규정",
+    # 투숙/숙박
+    "투숙", "숙박", "묵", "예약",
+    # 패키지/프로모션
+    "패키지", "프로모션", "혜택", "할인", "이벤트", "특가",
+    # 반려동물/어린이 구체적
+    "반려동물", "애견", "강아지", "펫", "어린이", "키즈클럽",
+])
+
+# 모호 패턴(시간/가격/예약 등): 패턴별 모호 키워드 / 제외 키워드
+_AMBIGUOUS_KEYWORD_MATCHER = KeywordMatcher(
+    {key: info["keywords"] for key, info in AMBIGUOUS_PATTERNS.items()}
+)
+_AMBIGUOUS_EXCLUDE_MATCHER = KeywordMatcher(
+    {key: info.get("excludes", []) for key, info in AMBIGUOUS_PATTERNS.items()}
+)
+# 교통 패턴에서 주체로 보지 않는 단어 (출발지가 핵심)
+_TRANSPORT_NON_SUBJECTS = ("호텔", "숙소", "리조트", "호텔로", "호텔까지", "호텔에")
+
+
+def _messageTopics(text: str) -> tuple:
+    """메시지에서 감지되는 주제 그룹"""
+    return tuple(_TOPIC_MATCHER.matchedGroups(text.lower()))
+
+
+def _messageClarificationContexts(text: str) -> tuple:
+    """이전 명확화 응답에 포함된 맥락 키"""
+    return tuple(
+        key for key, info in CONTEXT_CLARIFICATION.items()
+        if info["question"] in text
+    )
+
+
+def _messageHasReferent(text: str) -> bool:
+    """메시지에 후속 질문이 가리킬 수 있는 대상(호텔/주제/시설/서비스명)이 있는지"""
+    textLower = text.lower()
+    return bool(
+        _HOTEL_MATCHER.matches(textLower)
+        or _TOPIC_MATCHER.matches(textLower)
+        or _CATEGORY_MATCHER.matches(textLower)
+        or _SPECIFIC_TARGET_MATCHER.matches(textLower)
+        or _PREV_HOTEL_RE.search(text)
+    )
+
+
+def _analyzeMessage(sessionCtx, kind: str, text: str, analyze) -> tuple:
+    """히스토리 메시지 분석 (세션이 있으면 세션 캐시 재사용)"""
+    if sessionCtx is not None:
+        return sessionCtx.cachedAnalysis(kind, text, analyze)
+    return analyze(text)
+
 
 def _tryRuleBasedRewrite(query: str, history: list) -> Optional[str]:
     """규칙 기반 쿼리 재작성: 단순 후속 질문은 LLM 호출 없이 재작성.
@@ -37,17 +234,12 @@ def _tryRuleBasedRewrite(query: str, history: list) -> Optional[str]:
         if msg.get("role") == "assistant":
             content = msg.get("content", "")
             # 호텔명 추출 ([] 안의 호텔명)
-            hotelMatch = re.search(r'\[([^\]]*(?:팰리스|부산|제주|레스케이프|그래비티)[^\]]*)\]', content)
+            hotelMatch = _PREV_HOTEL_RE.search(content)
             if hotelMatch:
                 prevHotel = hotelMatch.group(1)
             # 시설명 추출 (레스토랑, 수영장, 피트니스 등 핵심 시설)
-            facilityPatterns = [
-                r'([\w가-힣]+\s*(?:레스토랑|식당|카페|바|라운지|뷔페|다이닝))',
-                r'((?:수영장|풀|피트니스|헬스|사우나|스파|키즈클럽|비즈니스\s*센터))',
-                r'((?:조식|석식|런치|디너|브런치))',
-            ]
-            for fp in facilityPatterns:
-                m = re.search(fp, content)
+            for fp in _ASSISTANT_FACILITY_PATTERNS:
+                m = fp.search(content)
                 if m:
                     prevSubject = m.group(1).strip()
                     break
@@ -56,12 +248,8 @@ def _tryRuleBasedRewrite(query: str, history: list) -> Optional[str]:
         elif msg.get("role") == "user":
             # 이전 사용자 질문에서도 주체 추출
             userContent = msg.get("content", "")
-            for fp in [
-                r'([\w가-힣]+\s*(?:레스토랑|식당|카페|바|라운지|뷔페|다이닝))',
-                r'((?:수영장|풀|피트니스|헬스|사우나|스파|키즈클럽))',
-                r'((?:조식|석식|런치|디너|브런치))',
-            ]:
-                m = re.search(fp, userContent)
+            for fp in _USER_FACILITY_PATTERNS:
+                m = fp.search(userContent)
                 if m:
                     prevSubject = m.group(1).strip()
                     break
@@ -74,13 +262,13 @@ def _tryRuleBasedRewrite(query: str, history: list) -> Optional[str]:
     subject = prevSubject or prevHotel or ""
 
     # 패턴 1: "거기 X은/는?" → 호텔(장소) + X ("거기"는 장소 지시어이므로 호텔 우선)
-    m = re.match(r'^거기\s+(.+)', queryStrip)
+    m = _PLACE_FOLLOWUP_RE.match(queryStrip)
     if m:
         placeSubject = prevHotel or prevSubject or ""
         return f"{placeSubject} {m.group(1)}"
 
     # 패턴 2: "그럼 X는/은?" → 호텔 + X
-    m = re.match(r'^그럼\s+(.+)', queryStrip)
+    m = _THEN_FOLLOWUP_RE.match(queryStrip)
     if m:
         rest = m.group(1)
         if prevHotel:
@@ -88,23 +276,16 @@ def _tryRuleBasedRewrite(query: str, history: list) -> Optional[str]:
         return f"{subject} {rest}"
 
     # 패턴 3: "그러면 X" → 호텔 + X
-    m = re.match(r'^그러면\s+(.+)', queryStrip)
+    m = _IF_SO_FOLLOWUP_RE.match(queryStrip)
     if m:
         if prevHotel:
             return f"{prevHotel} {m.group(1)}"
         return f"{subject} {m.group(1)}"
 
     # 패턴 4: 짧은 후속 질문 (시간/가격/위치 등)
-    shortPatterns = [
-        (r'^몇\s*시.*', f"{subject} 운영시간"),
-        (r'^얼마.*', f"{subject} 가격"),
-        (r'^어디.*', f"{subject} 위치"),
-        (r'^언제.*', f"{subject} 운영시간"),
-        (r'^예약.*', f"{subject} 예약 방법"),
-    ]
-    for pattern, rewritten in shortPatterns:
-        if re.match(pattern, queryStrip):
-            return rewritten
+    for pattern, suffix in _SHORT_FOLLOWUP_PATTERNS:
+        if pattern.match(queryStrip):
+            return f"{subject} {suffix}"
 
     return None
 
@@ -118,38 +299,11 @@ def queryRewriteNode(state: RAGState) -> dict:
     # 히스토리가 없거나 비어있으면 원본 쿼리 유지
     if not history:
         return {
-            **state,
             "rewritten_query": query,
         }
 
     # 맥락 참조 패턴 감지 (대명사, 지시어, 암시적 후속 질문)
-    contextPatterns = [
-        r'^그럼\s*',      # "그럼 ..."
-        r'^그러면\s*',    # "그러면 ..."
-        r'^그래서\s*',    # "그래서 ..."
-        r'^그것\s*',      # "그것 ..."
-        r'^그거\s*',      # "그거 ..."
-        r'^이것\s*',      # "이것 ..."
-        r'^이거\s*',      # "이거 ..."
-        r'^거기\s*',      # "거기 ..."
-        r'^위에\s*',      # "위에 ..."
-        r'^아까\s*',      # "아까 ..."
-        r'도\s*알려',     # "~도 알려줘"
-        r'는\s*어때',     # "~는 어때"
-        r'는\s*어떻게',   # "~는 어떻게"
-        r'^더\s*',        # "더 ..."
-        r'^다른\s*',      # "다른 ..."
-        r'대략|대충|약|정도',  # 추가 정보 요청
-        r'할\s*수\s*있',  # "~할 수 있어?"
-        r'되나요|돼나요',  # "~되나요?"
-        r'가능한가|가능해',  # "~가능한가요?"
-        r'안\s*되나|안\s*돼나',  # "~안 되나요?"
-        r'얼마|비용|가격',  # 비용 질문
-        r'어디|위치|장소',  # 위치 질문
-        r'몇\s*시|언제',  # 시간 질문
-    ]
-
-    needsRewrite = any(re.search(p, query, re.IGNORECASE) for p in contextPatterns)
+    needsRewrite = bool(_CONTEXT_RE.search(query))
 
     # 질문이 짧으면 맥락 필요할 가능성 높음
     if len(query.strip()) < 20:
@@ -157,7 +311,6 @@ def queryRewriteNode(state: RAGState) -> dict:
 
     if not needsRewrite:
         return {
-            **state,
             "rewritten_query": query,
         }
 
@@ -165,35 +318,17 @@ def queryRewriteNode(state: RAGState) -> dict:
     ruleResult = _tryRuleBasedRewrite(query, history)
     if ruleResult:
         _elapsed = time.time() - _start
-        print(f"[쿼리 재작성] 규칙 기반: '{query}' → '{ruleResult}' ({_elapsed:.3f}s, LLM 스킵)")
+        logger.debug("[쿼리 재작성] 규칙 기반: '%s' → '%s' (%.3fs, LLM 스킵)", query, ruleResult, _elapsed)
         return {
-            **state,
             "rewritten_query": ruleResult,
         }
 
     # === 주제 전환 감지: 현재 질문이 이전 대화와 다른 주제면 재작성 차단 ===
-    topicGroups = {
-        "객실": ["객실", "방", "룸", "room", "suite", "스위트", "디럭스", "키즈룸"],
-        "다이닝": ["레스토랑", "식당", "다이닝", "조식", "런치", "디너", "뷔페", "카페", "바"],
-        "시설": ["수영장", "풀", "피트니스", "헬스", "사우나", "스파", "키즈클럽"],
-        "교통": ["교통", "택시", "지하철", "버스", "공항", "셔틀", "리무진"],
-        "주차": ["주차"],
-        "반려동물": ["강아지", "반려", "펫", "pet", "개"],
-        "예약": ["예약", "취소", "변경", "환불"],
-        "체크인": ["체크인", "체크아웃", "입실", "퇴실"],
-        "위치": ["위치", "주소", "어디", "오시는길", "찾아오"],
-        "연락처": ["전화", "연락", "번호", "문의"],
-        "웨딩": ["웨딩", "연회", "결혼"],
-    }
-
     queryLower = query.lower()
     currentTopic = None
     # 복합 주제 감지: "레스토랑 위치" → "다이닝" + "위치"
     # 구체적 대상(다이닝, 시설 등)이 우선하도록 전체 매칭 후 우선순위 적용
-    allMatchedTopics = []
-    for topic, keywords in topicGroups.items():
-        if any(kw in queryLower for kw in keywords):
-            allMatchedTopics.append(topic)
+    allMatchedTopics = _TOPIC_MATCHER.matchedGroups(queryLower)
 
     # 우선순위: 구체적 대상 > 일반 속성 (위치/교통은 수식어일 수 있음)
     generalTopics = {"위치", "교통", "연락처"}
@@ -205,60 +340,79 @@ def queryRewriteNode(state: RAGState) -> dict:
 
     # 현재 질문에 명확한 주제가 있으면 히스토리 주제와 비교
     if currentTopic:
+        sessionCtx = state.get("session_context")
         historyTopics = set()
         for msg in history[-4:]:
             if msg.get("role") == "user":
-                msgLower = msg.get("content", "").lower()
-                for topic, keywords in topicGroups.items():
-                    if any(kw in msgLower for kw in keywords):
-                        historyTopics.add(topic)
+                historyTopics.update(
+                    _analyzeMessage(sessionCtx, "topics", msg.get("content", ""), _messageTopics)
+                )
 
         # 현재 주제가 히스토리에 없으면 → 주제 전환, 재작성 불필요
         # 히스토리에서 주제 키워드를 추출할 수 없어도 (빈 set) 현재 쿼리에
         # 명확한 주제가 있으면 자체 완결형이므로 재작성 건너뜀
         if not historyTopics or currentTopic not in historyTopics:
-            print(f"[주제 전환 감지] 히스토리 '{historyTopics}' → 현재 '{currentTopic}', 재작성 건너뜀")
+            logger.debug("[주제 전환 감지] 히스토리 '%s' → 현재 '%s', 재작성 건너뜀", historyTopics, currentTopic)
             return {
-                **state,
                 "rewritten_query": query,
             }
 
         # 같은 주제 follow-up이지만 쿼리에 이미 구체적 시설/서비스명이 있으면 자체 완결형
         # 예: "피트니스는 몇시에 문을 열어?" → "피트니스" 포함 → 재작성 불필요
         # LLM 재작성이 오히려 무관한 맥락을 주입하여 검색 품질을 저하시키는 것을 방지
-        topicKeywordsInQuery = [kw for kw in topicGroups[currentTopic] if kw in queryLower]
+        topicKeywordsInQuery = [kw for kw in _TOPIC_GROUPS[currentTopic] if kw in queryLower]
         if topicKeywordsInQuery:
-            print(f"[자체 완결] '{query}' → 주제 키워드 '{topicKeywordsInQuery[0]}' 포함, 재작성 건너뜀")
+            logger.debug("[자체 완결] '%s' → 주제 키워드 '%s' 포함, 재작성 건너뜀", query, topicKeywordsInQuery[0])
             return {
-                **state,
                 "rewritten_query": query,
             }
 
-    # 최근 대화 맥락 구성 (최대 2턴 = 4메시지, 입력 토큰 절약)
-    recentHistory = history[-4:] if len(history) > 4 else history
+    # 최근 대화에 호텔/주제/시설 언급이 전혀 없으면 풀어낼 참조 대상이 없음 → LLM 재작성 생략
+    sessionCtx = state.get("session_context")
+    if not any(
+        _analyzeMessage(sessionCtx, "referent", msg.get("content", ""), _messageHasReferent)
+        for msg in history[-4:]
+    ):
+        logger.debug("[쿼리 재작성] 히스토리에 참조 대상 없음, 재작성 건너뜀: '%s'", query)
+        return {
+            "rewritten_query": query,
+        }
+
+    # 최근 대화 맥락 구성 (최대 2턴 = 4메시지, 입력 토큰 절약, 메시지당 150자로 자르기)
+    historyText = "".join(
+        f"{'Q' if msg.get('role') == 'user' else 'A'}: {msg.get('content', '')[:150]}\n"
+        for msg in history[-4:]
+    )
 
-    historyText = ""
-    for msg in recentHistory:
-        role = "Q" if msg.get("role") == "user" else "A"
-        content = msg.get("content", "")[:150]  # 짧게 자르기
-        historyText += f"{role}: {content}\n"
+    # 시맨틱 캐시: 같은 직전 발화에 대한 유사 후속 질문은 이전 재작성 결과 재사용
+    # (핵심어가 정확히 같아야 재사용 → "그럼 조식은?" / "그럼 석식은?" 혼동 방지)
+    semanticCache = getSemanticCache()
+    cacheScope = (state.get("hotel"), historyContextKey(history))
+    cacheKey = keywordKey(query)
+    cachedRewrite = semanticCache.get("rewrite", cacheScope, query, cacheKey)
+    if cachedRewrite:
+        _elapsed = time.time() - _start
+        logger.debug("[쿼리 재작성] 캐시: '%s' → '%s' (%.3fs, LLM 스킵)", query, cachedRewrite, _elapsed)
+        return {
+            "rewritten_query": cachedRewrite,
+        }
 
-    # LLM으로 쿼리 재작성 (경량화 프롬프트 + 시스템 한국어 강제)
-    rewriteSystem = "한국어 질문 재작성 전문가. 반드시 한국어로만 응답. 질문 1문장만 출력."
+    # LLM으로 쿼리 재작성 (고정 지시문은 시스템 프롬프트, 가변부만 사용자 프롬프트)
     rewritePrompt = f"""[대화]
 {historyText}
 [현재 질문] {query}
 
-이전 대화의 주제(장소/서비스명)를 포함하여 완전한 질문으로 재작성하세요. 다른 주제면 원본 유지.
 재작성:"""
 
     try:
         rewrittenQuery = callLLM(
             prompt=rewritePrompt,
-            system=rewriteSystem,
+            system=_REWRITE_SYSTEM_PROMPT,
             temperature=0.0,
             maxTokens=60,
-            numCtx=1024  # 입력 짧음, KV캐시 75% 절감
+            numCtx=1024,  # 입력 짧음, KV캐시 75% 절감
+            stop=_REWRITE_STOP,  # 질문 1문장 뒤 부연 설명 디코드 차단
+            model=OLLAMA_REWRITE_MODEL,
         ).strip()
 
         # 빈 응답이나 너무 긴 응답 방지
@@ -266,26 +420,25 @@ def queryRewriteNode(state: RAGState) -> dict:
             rewrittenQuery = query
 
         # 불필요한 접두사 제거
-        rewrittenQuery = re.sub(r'^(재작성된\s*질문[:\s]*|질문[:\s]*)', '', rewrittenQuery).strip()
+        rewrittenQuery = _REWRITE_PREFIX_RE.sub('', rewrittenQuery).strip()
 
-        print(f"[쿼리 재작성] '{query}' → '{rewrittenQuery}'")
+        logger.debug("[쿼리 재작성] '%s' → '%s'", query, rewrittenQuery)
+        semanticCache.put("rewrite", cacheScope, query, rewrittenQuery, cacheKey)
 
     except Exception as e:
-        print(f"[쿼리 재작성 오류] {e}")
+        logger.warning("[쿼리 재작성 오류] %s", e)
         rewrittenQuery = query
         # LLM 실패 플래그: answerCompose에서 LLM 재호출 방지 (연쇄 타임아웃 차단)
         _elapsed = time.time() - _start
-        print(f"[타이밍] queryRewrite: {_elapsed:.3f}s (LLM 실패)")
+        logger.debug("[타이밍] queryRewrite: %.3fs (LLM 실패)", _elapsed)
         return {
-            **state,
             "rewritten_query": rewrittenQuery,
             "llm_failed": True,
         }
 
     _elapsed = time.time() - _start
-    print(f"[타이밍] queryRewrite: {_elapsed:.3f}s")
+    logger.debug("[타이밍] queryRewrite: %.3fs", _elapsed)
     return {
-        **state,
         "rewritten_query": rewrittenQuery,
     }
 
@@ -295,41 +448,30 @@ def preprocessNode(state: RAGState) -> dict:
     _start = time.time()
     # 재작성된 쿼리 사용 (없으면 원본)
     query = (state.get("rewritten_query") or state["query"]).strip()
+    # 소문자 변환은 여기서 1회만 수행하고 state로 후속 노드와 공유
+    queryLower = query.lower()
     userHotel = state.get("hotel")
 
-    # 언어 감지
-    koreanChars = len(re.findall(r'[가-힣]', query))
+    # 언어 감지 (한글 음절 범위 비교로 집계, 매칭 리스트 생성 없음)
+    koreanChars = sum(1 for ch in query if '가' <= ch <= '힣')
     language = "ko" if koreanChars > len(query) * 0.3 else "en"
 
     # 호텔 감지 (사용자 지정 우선)
+    # 미지정 상태에서 2개 이상 호텔이 언급되면 특정 호텔로 고정하지 않고 후보로 전달
     detectedHotel = userHotel
+    candidateHotels = []
     if not detectedHotel:
-        queryLower = query.lower()
-        for hotelKey, keywords in HOTEL_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword.lower() in queryLower:
-                    detectedHotel = hotelKey
-                    break
-            if detectedHotel:
-                break
+        candidateHotels = _HOTEL_MATCHER.matchedGroups(queryLower)
+        if len(candidateHotels) == 1:
+            detectedHotel = candidateHotels[0]
+        elif candidateHotels:
+            logger.debug("[호텔 감지] 복수 호텔 언급: %s", candidateHotels)
 
     # 카테고리 감지
-    detectedCategory = None
-    queryLower = query.lower()
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword.lower() in queryLower:
-                detectedCategory = category
-                break
-        if detectedCategory:
-            break
+    detectedCategory = _CATEGORY_MATCHER.firstGroup(queryLower)
 
     # Phase 2: 블랙리스트 패턴 검사 (최우선)
-    isValidQuery = True
-    for pattern in INVALID_QUERY_PATTERNS:
-        if re.search(pattern, query, re.IGNORECASE):
-            isValidQuery = False
-            break
+    isValidQuery = not _INVALID_QUERY_RE.search(query)
 
     # 최소 길이 검사
     if isValidQuery and len(query.strip()) < MIN_QUERY_LENGTH:
@@ -342,24 +484,8 @@ def preprocessNode(state: RAGState) -> dict:
         # 대화 히스토리가 있으면 후속 질문으로 간주, 키워드 검사 생략
         pass
     elif isValidQuery:
-        hasValidKeyword = False
-        # 단어 경계 기반 매칭으로 개선 (ex: "방구"가 "방" 키워드에 매칭되지 않도록)
-        for keyword in VALID_QUERY_KEYWORDS:
-            # 한글 키워드: 단어 경계 없이 포함 여부 확인 (단, 최소 2글자)
-            # 영문 키워드: 대소문자 무시 포함 여부
-            keywordLower = keyword.lower()
-            if len(keyword) >= 2 and keywordLower in queryLower:
-                # "방" 같은 1글자 키워드는 정확한 단어 경계 확인
-                if len(keyword) == 1:
-                    # 1글자 키워드는 앞뒤에 다른 한글이 없어야 함
-                    pattern = rf'(?<![가-힣]){re.escape(keyword)}(?![가-힣])'
-                    if re.search(pattern, query):
-                        hasValidKeyword = True
-                        break
-                else:
-                    hasValidKeyword = True
-                    break
-        isValidQuery = hasValidKeyword
+        # 한글/영문 키워드 모두 소문자 질문에 포함 여부 확인 (최소 2글자)
+        isValidQuery = _VALID_QUERY_MATCHER.matches(queryLower)
 
     # 레스토랑 엔티티 추출 및 호텔 맥락 검증
     # 원본 쿼리 사용: LLM 재작성 시 히스토리 레스토랑명 주입으로 인한 오탐 방지
@@ -371,21 +497,23 @@ def preprocessNode(state: RAGState) -> dict:
         # 다른 호텔 1곳에만 존재 → 호텔 자동 전환 + 안내 메시지
         detectedHotel = entityResult["redirect_hotel"]
         restaurantRedirectMsg = entityResult["message"]
-        print(f"[엔티티 리다이렉트] {entityResult['matched_alias']} → {detectedHotel}")
+        logger.debug("[엔티티 리다이렉트] %s → %s", entityResult['matched_alias'], detectedHotel)
 
     elif entityResult["action"] == "clarify":
         # 2곳 이상 → 명확화 질문으로 전환
         restaurantRedirectMsg = entityResult["message"]
-        print(f"[엔티티 명확화] {entityResult['matched_alias']} → 호텔 선택 필요")
+        logger.debug("[엔티티 명확화] %s → 호텔 선택 필요", entityResult['matched_alias'])
 
     _elapsed = time.time() - _start
-    print(f"[타이밍] preprocess: {_elapsed:.3f}s")
+    logger.debug("[타이밍] preprocess: %.3fs", _elapsed)
     return {
-        **state,
         "language": language,
         "detected_hotel": detectedHotel,
+        "candidate_hotels": candidateHotels if not detectedHotel else [],
         "category": detectedCategory,
         "normalized_query": query,
+        "query_lower": queryLower,
+        "original_query_lower": originalQueryForEntity.lower(),
         "is_valid_query": isValidQuery,
         "restaurant_entity": entityResult,
         "restaurant_redirect_msg": restaurantRedirectMsg,
@@ -407,10 +535,10 @@ def clarificationCheckNode(state: RAGState) -> dict:
     _start = time.time()
     # 모호성 판단은 원본 쿼리 기준 (LLM 재작성이 추가한 키워드 무시)
     originalQuery = state.get("query", "").strip()
-    originalQueryLower = originalQuery.lower()
+    originalQueryLower = state.get("original_query_lower") or originalQuery.lower()
     # 맥락 감지/구체적 대상 체크는 재작성 쿼리 (맥락 보강 상태)
     query = state.get("normalized_query") or state.get("rewritten_query") or state["query"]
-    queryLower = query.lower()
+    queryLower = state.get("query_lower") or query.lower()
     hotel = state.get("detected_hotel")
 
     # 호텔 정보 (명확화 질문에 포함)
@@ -424,9 +552,8 @@ def clarificationCheckNode(state: RAGState) -> dict:
     if entityResult and entityResult.get("action") == "clarify":
         clarifyMsg = state.get("restaurant_redirect_msg", "")
         clarifyOptions = entityResult.get("clarify_options", [])
-        print(f"[엔티티 명확화] {clarifyMsg}")
+        logger.debug("[엔티티 명확화] %s", clarifyMsg)
         return {
-            **state,
             "needs_clarification": True,
             "clarification_question": clarifyMsg,
             "clarification_options": clarifyOptions,
@@ -440,25 +567,25 @@ def clarificationCheckNode(state: RAGState) -> dict:
     # 히스토리에서 이미 동일 맥락 명확화가 발생했으면 바로 검색
     # ========================================
     history = state.get("history") or []
+    sessionCtx = state.get("session_context")
     previousClarificationContexts = set()
     for msg in history:
         if msg.get("role") == "assistant":
-            content = msg.get("content", "")
-            # 이전 명확화 응답에서 맥락 키워드 감지
-            for contextKey in CONTEXT_CLARIFICATION:
-                contextInfo = CONTEXT_CLARIFICATION[contextKey]
-                if contextInfo["question"] in content:
-                    previousClarificationContexts.add(contextKey)
+            # 이전 명확화 응답에서 맥락 키워드 감지 (세션 캐시 재사용)
+            previousClarificationContexts.update(_analyzeMessage(
+                sessionCtx, "clarification", msg.get("content", ""), _messageClarificationContexts
+            ))
+
+    # 현재 질문에서 감지된 맥락 (CONTEXT_CLARIFICATION 정의 순서)
+    matchedContexts = _CLARIFY_CONTEXT_MATCHER.matchedGroups(queryLower)
 
     if previousClarificationContexts:
-        print(f"[루프 방지] 이전 명확화 감지: {previousClarificationContexts}")
+        logger.debug("[루프 방지] 이전 명확화 감지: %s", previousClarificationContexts)
         # 이미 명확화가 발생한 맥락이면 바로 검색 진행
         for contextKey in previousClarificationContexts:
-            keywords = CONTEXT_CLARIFICATION[contextKey]["keywords"]
-            if any(kw in queryLower for kw in keywords):
-                print(f"[루프 방지] '{query}' → {contextKey} 맥락 재명확화 차단, 직접 검색")
+            if contextKey in matchedContexts:
+                logger.debug("[루프 방지] '%s' → %s 맥락 재명확화 차단, 직접 검색", query, contextKey)
                 return {
-                    **state,
                     "needs_clarification": False,
                     "clarification_question": "",
                     "clarification_options": [],
@@ -467,108 +594,65 @@ def clarificationCheckNode(state: RAGState) -> dict:
 
     # ========================================
     # Phase 16-2: 구체적 대상이 명시된 맥락 질문은 바로 검색
-    # "반려동물 객실 투숙 정책" → 맥락(반려동물) + 구체적 대상(객실, 정책) → 검색
-    # ========================================
-    contextSpecificTargets = [
-        "객실", "방", "투숙", "숙박", "레스토랑", "다이닝", "로비",
-        "수영장", "풀", "피트니스", "스파", "사우나",
-        "정책", "규정", "패키지", "프로모션", "혜택",
-        "비용", "요금", "가격", "얼마", "무게", "kg", "킬로",
-    ]
-
-    for contextKey, contextInfo in CONTEXT_CLARIFICATION.items():
-        keywords = contextInfo["keywords"]
-        if any(kw in queryLower for kw in keywords):
-            # 맥락은 감지됨 — 추가로 구체적 대상도 있는지 확인
-            if any(target in queryLower for target in contextSpecificTargets):
-                print(f"[맥락+구체적 대상] '{query}' → {contextKey} 맥락 + 구체적 대상, 직접 검색")
-                return {
-                    **state,
-                    "needs_clarification": False,
-                    "clarification_question": "",
-                    "clarification_options": [],
-                    "detected_context": contextKey,
-                }
-
-    # ========================================
     # Phase 13: 맥락 인식 명확화 (맥락O + 구체적 대상X 일 때만)
     # ========================================
-    for contextKey, contextInfo in CONTEXT_CLARIFICATION.items():
-        keywords = contextInfo["keywords"]
-        directTriggers = contextInfo.get("direct_triggers", [])
-
-        # 맥락 키워드 매칭
-        if any(kw in queryLower for kw in keywords):
-            # 직접 답변 트리거 확인 (질문형이면 바로 검색)
-            if any(trigger in queryLower for trigger in directTriggers):
-                print(f"[맥락 감지] '{query}' → {contextKey} 맥락, 직접 검색")
-                return {
-                    **state,
-                    "needs_clarification": False,
-                    "clarification_question": "",
-                    "clarification_options": [],
-                    "detected_context": contextKey,
-                }
+    if matchedContexts:
+        contextKey = matchedContexts[0]
+        contextInfo = CONTEXT_CLARIFICATION[contextKey]
 
-            # 맥락 맞춤 명확화 질문 (트리거 없는 경우)
-            question = contextInfo["question"]
-            if hotelName:
-                question = f"[{hotelName}] {question}"
+        # 맥락은 감지됨 — 추가로 구체적 대상도 있는지 확인
+        if _CONTEXT_SPECIFIC_TARGET_MATCHER.matches(queryLower):
+            logger.debug("[맥락+구체적 대상] '%s' → %s 맥락 + 구체적 대상, 직접 검색", query, contextKey)
+            return {
+                "needs_clarification": False,
+                "clarification_question": "",
+                "clarification_options": [],
+                "detected_context": contextKey,
+            }
 
-            print(f"[맥락 명확화] '{query}' → {contextKey} 맥락, 추가 질문 필요")
+        # 직접 답변 트리거 확인 (질문형이면 바로 검색)
+        if _DIRECT_TRIGGER_MATCHERS[contextKey].matches(queryLower):
+            logger.debug("[맥락 감지] '%s' → %s 맥락, 직접 검색", query, contextKey)
             return {
-                **state,
-                "needs_clarification": True,
-                "clarification_question": question,
-                "clarification_options": contextInfo["options"],
-                "clarification_context": contextKey,
-                "clarification_type": contextKey,  # "반려동물", "어린이" 등
-                "evidence_passed": True,
-                "final_answer": question,
+                "needs_clarification": False,
+                "clarification_question": "",
+                "clarification_options": [],
+                "detected_context": contextKey,
             }
 
+        # 맥락 맞춤 명확화 질문 (트리거 없는 경우)
+        question = contextInfo["question"]
+        if hotelName:
+            question = f"[{hotelName}] {question}"
+
+        logger.debug("[맥락 명확화] '%s' → %s 맥락, 추가 질문 필요", query, contextKey)
+        return {
+            "needs_clarification": True,
+            "clarification_question": question,
+            "clarification_options": contextInfo["options"],
+            "clarification_context": contextKey,
+            "clarification_type": contextKey,  # "반려동물", "어린이" 등
+            "evidence_passed": True,
+            "final_answer": question,
+        }
+
     # ========================================
     # 기존 로직: 구체적 대상 체크
     # ========================================
-    # 이미 구체적인 대상이 있는지 확인하는 키워드들
-    specificTargets = [
-        # 체크인/아웃
-        "체크인", "체크아웃", "checkin", "checkout",
-        # 조식/다이닝
-        "조식", "아침식사", "아침밥", "아침", "브런치", "breakfast",
-        "중식", "점심", "석식", "저녁",
-        "뷔페", "buffet",
-        # 시설
-        "수영장", "풀", "pool", "피트니스", "헬스", "gym", "운동",
-        "스파", "spa", "마사지", "사우나", "찜질",
-        "레스토랑", "다이닝", "라운지", "키즈", "연회", "객실", "방",
-        # 서비스명
-        "주차", "발렛", "와이파이", "세탁", "컨시어지", "룸서비스",
-        # 다이닝 구체적
-        "홍연", "아리아", "콘스탄스", "팔레",
-        # 정책 관련 (명확한 질문)
-        "취소", "환불", "취소정책", "환불정책", "노쇼", "정책", "규정",
-        # 투숙/숙박
-        "투숙", "숙박", "묵", "예약",
-        # 패키지/프로모션
-        "패키지", "프로모션", "혜택", "할인", "이벤트", "특가",
-        # 반려동물/어린이 구체적
-        "반려동물", "애견", "강아지", "펫", "어린이", "키즈클럽",
-    ]
-
     # 질문에 이미 구체적인 대상이 있으면 명확화 불필요
     # 단, "교통" AMBIGUOUS_PATTERNS 키워드가 원본 쿼리에 있으면 교통 명확화 우선
-    transportKeywords = AMBIGUOUS_PATTERNS.get("교통", {}).get("keywords", [])
-    transportExcludes = AMBIGUOUS_PATTERNS.get("교통", {}).get("excludes", [])
-    hasTransportKeyword = any(kw in originalQueryLower for kw in transportKeywords)
-    hasTransportExclude = any(exc in originalQueryLower for exc in transportExcludes)
-    isTransportAmbiguous = hasTransportKeyword and not hasTransportExclude
+    # 원본 쿼리에 모호 키워드가 있는 패턴 (Phase 14 에서도 재사용, 패턴 정의 순서)
+    ambiguousCandidates = _AMBIGUOUS_KEYWORD_MATCHER.matchedGroups(originalQueryLower)
+    originalExcluded = (
+        set(_AMBIGUOUS_EXCLUDE_MATCHER.matchedGroups(originalQueryLower))
+        if ambiguousCandidates else set()
+    )
+    isTransportAmbiguous = "교통" in ambiguousCandidates and "교통" not in originalExcluded
 
-    hasSpecificTarget = any(target in queryLower for target in specificTargets)
+    hasSpecificTarget = _SPECIFIC_TARGET_MATCHER.matches(queryLower)
 
     if hasSpecificTarget and not isTransportAmbiguous:
         return {
-            **state,
             "needs_clarification": False,
             "clarification_question": "",
             "clarification_options": [],
@@ -584,15 +668,16 @@ def clarificationCheckNode(state: RAGState) -> dict:
     clarificationOptions = []
     patternKey = None
 
-    for patternKey, patternInfo in AMBIGUOUS_PATTERNS.items():
-        keywords = patternInfo["keywords"]
-        excludes = patternInfo.get("excludes", [])
+    # 모호 키워드가 있는 패턴만 후보, 제외 키워드는 원본 + 재작성 쿼리 모두 검사
+    excludedPatterns = set(originalExcluded)
+    if ambiguousCandidates:
+        excludedPatterns.update(_AMBIGUOUS_EXCLUDE_MATCHER.matchedGroups(queryLower))
 
-        # 제외 패턴 체크 (원본 + 재작성 쿼리 모두)
-        if any(exc in originalQueryLower for exc in excludes):
-            continue
-        if any(exc in queryLower for exc in excludes):
+    for patternKey in ambiguousCandidates:
+        if patternKey in excludedPatterns:
             continue
+        patternInfo = AMBIGUOUS_PATTERNS[patternKey]
+        keywords = patternInfo["keywords"]
 
         # ★ 원본 쿼리에서 모호 키워드 매칭 (LLM 재작성 결과 무시)
         matchedKeywords = [kw for kw in keywords if kw in originalQueryLower]
@@ -603,15 +688,13 @@ def clarificationCheckNode(state: RAGState) -> dict:
 
             # 교통 패턴: "호텔"은 주체가 아님 (출발지가 핵심)
             if patternKey == "교통" and subjectEntity:
-                transportNonSubjects = ["호텔", "숙소", "리조트", "호텔로", "호텔까지", "호텔에"]
-                if any(ns in subjectEntity for ns in transportNonSubjects):
+                if any(ns in subjectEntity for ns in _TRANSPORT_NON_SUBJECTS):
                     subjectEntity = None
 
             if subjectEntity:
                 # 주체가 있음 → 모호하지 않음 → 명확화 불필요, 바로 검색
-                print(f"[주체 감지] '{originalQuery}' → 주체: '{subjectEntity}', 명확화 건너뜀 → 검색 진행")
+                logger.debug("[주체 감지] '%s' → 주체: '%s', 명확화 건너뜀 → 검색 진행", originalQuery, subjectEntity)
                 return {
-                    **state,
                     "needs_clarification": False,
                     "clarification_question": "",
                     "clarification_options": [],
@@ -625,14 +708,13 @@ def clarificationCheckNode(state: RAGState) -> dict:
                 if hotelName:
                     clarificationQuestion = f"[{hotelName}] {clarificationQuestion}"
 
-                print(f"[일반 명확화] '{originalQuery}' → {clarificationQuestion}")
+                logger.debug("[일반 명확화] '%s' → %s", originalQuery, clarificationQuestion)
                 break
 
     if needsClarification:
         _elapsed = time.time() - _start
-        print(f"[타이밍] clarificationCheck: {_elapsed:.3f}s")
+        logger.debug("[타이밍] clarificationCheck: %.3fs", _elapsed)
         return {
-            **state,
             "needs_clarification": True,
             "clarification_question": clarificationQuestion,
             "clarification_options": clarificationOptions,
@@ -642,15 +724,33 @@ def clarificationCheckNode(state: RAGState) -> dict:
         }
 
     _elapsed = time.time() - _start
-    print(f"[타이밍] clarificationCheck: {_elapsed:.3f}s")
+    logger.debug("[타이밍] clarificationCheck: %.3fs", _elapsed)
     return {
-        **state,
         "needs_clarification": False,
         "clarification_question": "",
         "clarification_options": [],
     }
 
 
+def clarificationGateNode(state: RAGState) -> dict:
+    """명확화 합류 노드: clarification_check와 선행 검색(retrieve) 병렬 실행 후 합류
+
+    - 명확화 불필요(대부분): 선행 검색 결과 그대로 사용 → 검색 지연을 명확화 판정 뒤에 숨김
+    - 명확화 필요: 검색 결과 폐기 (세션 청크 캐시/주제 갱신에 반영되지 않도록)
+    """
+    if not state.get("needs_clarification", False):
+        return {}
+    logger.debug("[선행 검색] 명확화 필요 → 검색 결과 폐기")
+    return {
+        "retrieved_chunks": [],
+        "retrieved_chunks_count": 0,
+        "top_score": 0.0,
+        "conversation_topic": None,
+        "effective_category": None,
+        "rerank_quality": None,
+    }
+
+
 def _extractSubjectEntity(query: str, ambiguousKeywords: list[str]) -> Optional[str]:
     """모호한 질문에서 주체 엔티티 추출.
     모호 키워드와 조사를 제거한 뒤 남는 2글자 이상 단어를 주체로 반환.
@@ -663,26 +763,12 @@ def _extractSubjectEntity(query: str, ambiguousKeywords: list[str]) -> Optional[
         subject = subject.replace(kw.lower(), "")
 
     # 조사/어미 제거
-    subject = re.sub(
-        r'(에서|인가요|나요|은|는|이|가|의|에|를|을|도|만|야|요|까|어요|해|돼|되)',
-        '', subject
-    )
+    subject = _SUBJECT_PARTICLE_RE.sub('', subject)
     # 특수문자/공백 정리
-    subject = re.sub(r'[?!.,~\s]+', ' ', subject).strip()
+    subject = _SUBJECT_PUNCT_RE.sub(' ', subject).strip()
 
     # 일반어/동작어 필터 (주체가 아닌 단어)
-    genericWords = {
-        # 일반 명사
-        "운영", "이용", "시설", "서비스", "정보", "안내", "문의",
-        "호텔", "여기", "거기", "저기", "뭐", "무엇", "어떻게", "얼마",
-        "그것", "이것", "그거", "이거", "좀", "혹시", "그런데",
-        # 동작어 (주체가 아닌 서술어)
-        "알려줘", "알려", "해줘", "보여줘", "말해줘", "찾아줘", "가르쳐줘",
-        "알고", "싶어", "싶어요", "싶은데", "궁금", "궁금해", "있나",
-        "없나", "하고", "싶다", "있어", "없어", "될까", "되나",
-    }
-
-    words = [w for w in subject.split() if len(w) >= 2 and w not in genericWords]
+    words = [w for w in subject.split() if len(w) >= 2 and w not in _SUBJECT_GENERIC_WORDS]
 
     if words:
         return max(words, key=len)  # 가장 긴 단어 = 가장 구체적
@@ -1,15 +1,90 @@
 """검색 노드: 하이브리드 검색, 리랭킹, 근거 검증 게이트"""
 
+import heapq
+import logging
 import re
 import time
+from functools import lru_cache
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 
 from rag.state import RAGState
+from rag.keyword_matcher import KeywordMatcher
 from rag.constants import (
     EVIDENCE_THRESHOLD, RERANKER_ENABLED, MIN_CHUNKS_REQUIRED,
     HOTEL_KEYWORDS, HOTEL_INFO, SYNONYM_DICT,
 )
 
+logger = logging.getLogger(__name__)
+
+
+# 히스토리 주제 추출용 주제별 키워드 (정의 순서 = 우선순위)
+_CONVERSATION_TOPIC_MATCHER = KeywordMatcher({
+    "조식": ["조식", "breakfast", "아침식사", "뷔페", "아침밥", "모닝"],
+    "다이닝": ["레스토랑", "식당", "다이닝", "저녁", "점심", "런치", "디너",
+            "아리아", "홍연", "콘스탄스", "팔레"],
+    "수영장": ["수영", "pool", "풀", "swimming", "수영장"],
+    "피트니스": ["피트니스", "헬스", "gym", "fitness", "운동"],
+    "스파": ["스파", "spa", "마사지", "massage", "사우나"],
+    "주차": ["주차", "parking", "발렛", "valet", "파킹"],
+    "체크인/아웃": ["체크인", "체크아웃", "입실", "퇴실", "check-in", "check-out"],
+    "객실": ["객실", "방", "room", "침대", "bed", "뷰", "전망"],
+    "요금/결제": ["요금", "가격", "결제", "비용", "금액"],
+    "반려동물": ["강아지", "반려견", "pet", "펫", "반려동물", "애견"],
+})
+
+# 세션 주제 → 검색 쿼리 보강 키워드
+_SESSION_TOPIC_QUERY_TERMS = {
+    "조식": "조식", "다이닝": "레스토랑 다이닝", "수영장": "수영장",
+    "피트니스": "피트니스", "스파": "스파", "주차": "주차",
+    "체크인/아웃": "체크인 체크아웃", "객실": "객실",
+    "요금/결제": "요금 결제", "반려동물": "반려동물"
+}
+
+
+def _buildHotelStripPattern(hotel: str) -> re.Pattern:
+    """호텔별 키워드(+호텔 정식명)를 긴 순서로 합친 단일 제거 패턴 생성"""
+    hotelKws = list(HOTEL_KEYWORDS[hotel])
+    hotelName = HOTEL_INFO.get(hotel, {}).get("name")
+    if hotelName:
+        hotelKws.append(hotelName)
+
+    # 긴 키워드부터 시도 (부분 매칭 방지)
+    sortedKws = sorted(hotelKws, key=len, reverse=True)
+    return re.compile(
+        "(?:" + "|".join(map(re.escape, sortedKws)) + ")"
+        r'(에서|에서의|에|의|은|는|이|가|을|를|으로|로|과|와|도)?'
+    )
+
+
+# 쿼리 확장: 동의어 사전 용어 매처 + 소문자 동의어 (요청마다 사전 전체 순회/lower() 반복 방지)
+_SYNONYM_TERM_MATCHER = KeywordMatcher({term: [term] for term in SYNONYM_DICT})
+_SYNONYMS_LOWER = {
+    term: tuple((s, s.lower()) for s in synonyms)
+    for term, synonyms in SYNONYM_DICT.items()
+}
+
+# 검색 쿼리 호텔명 제거: 호텔별 단일 패턴 + 잔여 조사/공백 정리
+_HOTEL_STRIP_RES = {hotel: _buildHotelStripPattern(hotel) for hotel in HOTEL_KEYWORDS}
+_LEADING_PARTICLE_RE = re.compile(r'^\s*(에서|에|의|은|는|이|가|을|를|으로|로|과|와|도)\s+')
+_MID_PARTICLE_RE = re.compile(r'\s+(에서|에|의|은|는|이|가|을|를|으로|로|과|와|도)\s+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 캐시 청크 검색: 한글/영문 2글자 이상 토큰 (두 문자 집합은 겹치지 않아 1회 스캔으로 동일 결과)
+_CACHE_TOKEN_RE = re.compile(r'[가-힣]{2,}|[a-z]{2,}')
+# 세션 주제별 부스팅 키워드
+_CACHE_TOPIC_BOOST_KEYWORDS = {
+    "조식": {"조식", "breakfast", "아침식사", "뷔페", "아침밥"},
+    "다이닝": {"레스토랑", "식당", "다이닝", "dinner", "lunch"},
+    "수영장": {"수영", "pool", "수영장"},
+    "피트니스": {"피트니스", "헬스", "gym", "fitness"},
+    "스파": {"스파", "spa", "마사지"},
+    "주차": {"주차", "parking", "발렛"},
+    "체크인/아웃": {"체크인", "체크아웃", "입실", "퇴실"},
+    "객실": {"객실", "room", "침대"},
+    "반려동물": {"반려동물", "반려견", "pet", "강아지"},
+}
+
 
 def retrieveNode(state: RAGState, *, indexer=None) -> dict:
     """검색 노드: Vector DB에서 관련 청크 검색 (쿼리 확장 + 카테고리 필터)
@@ -19,6 +94,18 @@ def retrieveNode(state: RAGState, *, indexer=None) -> dict:
     - 카테고리 필터는 후속 질문에서만 적용 (컨텍스트 오염 방지)
     """
     _start = time.time()
+    # 유효하지 않은 질문은 evidence_gate에서 바로 거절됨 → 임베딩/검색 생략
+    if not state.get("is_valid_query", True):
+        logger.debug("[검색] 유효하지 않은 질문, 검색 생략")
+        return {
+            "retrieved_chunks": [],
+            "retrieved_chunks_count": 0,
+            "top_score": 0.0,
+            "conversation_topic": None,
+            "effective_category": None,
+            "rerank_quality": None,
+        }
+
     query = state["normalized_query"]
     hotel = state["detected_hotel"]
     detectedCategory = state.get("category")
@@ -34,28 +121,22 @@ def retrieveNode(state: RAGState, *, indexer=None) -> dict:
     # 키워드 추출 실패 시 세션의 현재 주제 사용
     if not conversationTopic and sessionCtx and sessionCtx.current_topic and history:
         conversationTopic = sessionCtx.current_topic
-        print(f"[세션 주제] 키워드 추출 실패 → 세션 주제 사용: {conversationTopic}")
+        logger.debug("[세션 주제] 키워드 추출 실패 → 세션 주제 사용: %s", conversationTopic)
 
     # 효과적 카테고리 결정 (리랭커가 있으므로 후속 질문에서는 필터 제거)
     effectiveCategory = None
     if history and conversationTopic:
         if detectedCategory and detectedCategory != conversationTopic:
-            print(f"[주제 전환] 히스토리 '{conversationTopic}' → 현재 쿼리 '{detectedCategory}'")
+            logger.debug("[주제 전환] 히스토리 '%s' → 현재 쿼리 '%s'", conversationTopic, detectedCategory)
 
     # === 세션 주제 기반 쿼리 보강 ===
     if (conversationTopic and history and sessionCtx
             and not detectedCategory
             and conversationTopic == sessionCtx.current_topic):
-        topicKeywords = {
-            "조식": "조식", "다이닝": "레스토랑 다이닝", "수영장": "수영장",
-            "피트니스": "피트니스", "스파": "스파", "주차": "주차",
-            "체크인/아웃": "체크인 체크아웃", "객실": "객실",
-            "요금/결제": "요금 결제", "반려동물": "반려동물"
-        }
-        topicKw = topicKeywords.get(conversationTopic, conversationTopic)
+        topicKw = _SESSION_TOPIC_QUERY_TERMS.get(conversationTopic, conversationTopic)
         if not any(kw in searchQuery for kw in topicKw.split()):
             searchQuery = f"{searchQuery} {topicKw}"
-            print(f"[세션 보강] 쿼리에 주제 키워드 추가: '{topicKw}' → '{searchQuery}'")
+            logger.debug("[세션 보강] 쿼리에 주제 키워드 추가: '%s' → '%s'", topicKw, searchQuery)
 
     # === 캐시 우선 검색 (같은 주제 후속 질문) ===
     cachedResults = None
@@ -70,16 +151,21 @@ def retrieveNode(state: RAGState, *, indexer=None) -> dict:
 
     # 캐시 결과가 충분하면 DB 검색 생략
     if cachedResults and len(cachedResults) >= 2 and cachedResults[0].get("score", 0) >= 0.7:
-        print(f"[캐시 히트] 이전 청크에서 {len(cachedResults)}개 관련 결과 발견")
+        logger.debug("[캐시 히트] 이전 청크에서 %s개 관련 결과 발견", len(cachedResults))
         results = cachedResults
     else:
-        # 1차 검색
-        results = indexer.search(
-            query=expandedQuery,
-            hotel=hotel,
-            category=effectiveCategory,
-            topK=5
-        )
+        # 1차 검색 (복수 호텔 후보 → 호텔별 병렬 검색)
+        candidateHotels = state.get("candidate_hotels") or []
+        if not hotel and len(candidateHotels) >= 2:
+            results = _searchHotelsParallel(indexer, expandedQuery, candidateHotels,
+                                            effectiveCategory, topK=5)
+        else:
+            results = indexer.search(
+                query=expandedQuery,
+                hotel=hotel,
+                category=effectiveCategory,
+                topK=5
+            )
 
         # 캐시 결과와 병합 (캐시에만 있는 관련 청크 추가)
         if cachedResults:
@@ -105,7 +191,7 @@ def retrieveNode(state: RAGState, *, indexer=None) -> dict:
     if RERANKER_ENABLED and results and len(results) >= 2:
         from rag.reranker import getReranker, Reranker
         if preRerankTopScore >= Reranker.SKIP_THRESHOLD:
-            print(f"[리랭커] 스킵 (top score {preRerankTopScore:.3f} >= {Reranker.SKIP_THRESHOLD})")
+            logger.debug("[리랭커] 스킵 (top score %.3f >= %s)", preRerankTopScore, Reranker.SKIP_THRESHOLD)
             rerankQuality = "skipped"
         else:
             try:
@@ -124,16 +210,16 @@ def retrieveNode(state: RAGState, *, indexer=None) -> dict:
                         if "original_score" in chunk:
                             chunk["score"] = chunk["original_score"]
             except Exception as e:
-                print(f"[리랭커 오류] {e}")
+                logger.warning("[리랭커 오류] %s", e)
 
     # 최고 점수 계산
     topScore = max((r["score"] for r in results), default=0.0) if results else 0.0
 
     _elapsed = time.time() - _start
-    print(f"[타이밍] retrieve: {_elapsed:.3f}s")
+    logger.debug("[타이밍] retrieve: %.3fs", _elapsed)
     return {
-        **state,
         "retrieved_chunks": results,
+        "retrieved_chunks_count": len(results),
         "top_score": topScore,
         "conversation_topic": conversationTopic,
         "effective_category": effectiveCategory,
@@ -152,18 +238,16 @@ def evidenceGateNode(state: RAGState) -> dict:
     # 질문 유효성 검사
     if not isValidQuery:
         return {
-            **state,
             "evidence_passed": False,
             "evidence_reason": "호텔 관련 질문이 아닙니다.",
         }
 
     # 리랭커 절대 품질 미달: 모든 검색 결과가 쿼리와 무관
     if rerankQuality == "poor":
-        print(f"[evidenceGate] 리랭커 품질 미달 → 근거 부족 판정")
+        logger.debug("[evidenceGate] 리랭커 품질 미달 → 근거 부족 판정")
         _elapsed = time.time() - _start
-        print(f"[타이밍] evidenceGate: {_elapsed:.3f}s")
+        logger.debug("[타이밍] evidenceGate: %.3fs", _elapsed)
         return {
-            **state,
             "evidence_passed": False,
             "evidence_reason": "검색 결과의 의미적 관련성이 낮습니다. (리랭커 품질: poor)",
         }
@@ -183,9 +267,8 @@ def evidenceGateNode(state: RAGState) -> dict:
         reason = "근거 검증 통과"
 
     _elapsed = time.time() - _start
-    print(f"[타이밍] evidenceGate: {_elapsed:.3f}s")
+    logger.debug("[타이밍] evidenceGate: %.3fs", _elapsed)
     return {
-        **state,
         "evidence_passed": passed,
         "evidence_reason": reason,
     }
@@ -195,28 +278,17 @@ def evidenceGateNode(state: RAGState) -> dict:
 
 def _stripHotelName(query: str, hotel: str) -> str:
     """검색 쿼리에서 호텔명/지역명을 제거하여 벡터 임베딩 왜곡 방지."""
-    if not hotel or hotel not in HOTEL_KEYWORDS:
+    hotelStripRe = _HOTEL_STRIP_RES.get(hotel)
+    if hotelStripRe is None:
         return query
 
-    hotelKws = HOTEL_KEYWORDS[hotel]
-    hotelInfo = HOTEL_INFO.get(hotel, {})
-    if hotelInfo.get("name"):
-        hotelKws = list(hotelKws) + [hotelInfo["name"]]
-
-    # 긴 키워드부터 제거 (부분 매칭 방지)
-    sortedKws = sorted(hotelKws, key=len, reverse=True)
-
-    stripped = query
-    for kw in sortedKws:
-        pattern = re.escape(kw) + r'(에서|에서의|에|의|은|는|이|가|을|를|으로|로|과|와|도)?'
-        stripped = re.sub(pattern, '', stripped)
-
-    stripped = re.sub(r'^\s*(에서|에|의|은|는|이|가|을|를|으로|로|과|와|도)\s+', '', stripped)
-    stripped = re.sub(r'\s+(에서|에|의|은|는|이|가|을|를|으로|로|과|와|도)\s+', ' ', stripped)
-    stripped = re.sub(r'\s+', ' ', stripped).strip()
+    stripped = hotelStripRe.sub('', query)
+    stripped = _LEADING_PARTICLE_RE.sub('', stripped)
+    stripped = _MID_PARTICLE_RE.sub(' ', stripped)
+    stripped = _WHITESPACE_RE.sub(' ', stripped).strip()
 
     if stripped != query.strip():
-        print(f"[호텔명 제거] '{query}' → '{stripped}'")
+        logger.debug("[호텔명 제거] '%s' → '%s'", query, stripped)
 
     if len(stripped) < 3:
         return query
@@ -229,20 +301,6 @@ def _extractConversationTopic(history: list[dict]) -> Optional[str]:
     if not history:
         return None
 
-    topicPriority = [
-        ("조식", ["조식", "breakfast", "아침식사", "뷔페", "아침밥", "모닝"]),
-        ("다이닝", ["레스토랑", "식당", "다이닝", "저녁", "점심", "런치", "디너",
-                  "아리아", "홍연", "콘스탄스", "팔레"]),
-        ("수영장", ["수영", "pool", "풀", "swimming", "수영장"]),
-        ("피트니스", ["피트니스", "헬스", "gym", "fitness", "운동"]),
-        ("스파", ["스파", "spa", "마사지", "massage", "사우나"]),
-        ("주차", ["주차", "parking", "발렛", "valet", "파킹"]),
-        ("체크인/아웃", ["체크인", "체크아웃", "입실", "퇴실", "check-in", "check-out"]),
-        ("객실", ["객실", "방", "room", "침대", "bed", "뷰", "전망"]),
-        ("요금/결제", ["요금", "가격", "결제", "비용", "금액"]),
-        ("반려동물", ["강아지", "반려견", "pet", "펫", "반려동물", "애견"]),
-    ]
-
     userMessages = [
         msg.get("content", "") for msg in history
         if msg.get("role") == "user"
@@ -252,10 +310,9 @@ def _extractConversationTopic(history: list[dict]) -> Optional[str]:
         return None
 
     for msg in reversed(userMessages[-3:]):
-        msgLower = msg.lower()
-        for topic, keywords in topicPriority:
-            if any(kw.lower() in msgLower for kw in keywords):
-                return topic
+        topic = _CONVERSATION_TOPIC_MATCHER.firstGroup(msg.lower())
+        if topic:
+            return topic
 
     return None
 
@@ -264,23 +321,17 @@ def _expandQuery(query: str) -> str:
     """쿼리 확장 (동의어 추가) - 가장 구체적인 매칭 1개만 확장"""
     queryLower = query.lower()
 
-    # 매칭되는 키워드 중 가장 긴(구체적인) 것 1개만 선택
-    bestMatch = None
-    bestLen = 0
-    for term in SYNONYM_DICT:
-        termLower = term.lower()
-        if termLower in queryLower and len(termLower) > bestLen:
-            bestMatch = term
-            bestLen = len(termLower)
-
-    if not bestMatch:
+    # 매칭되는 키워드 중 가장 긴(구체적인) 것 1개만 선택 (동일 길이는 사전 순서상 먼저 나온 것)
+    matchedTerms = _SYNONYM_TERM_MATCHER.matchedGroups(queryLower)
+    if not matchedTerms:
         return query
+    bestMatch = max(matchedTerms, key=lambda term: len(term.lower()))
 
     # 쿼리에 이미 포함된 단어 제외, 순서 고정 (리스트 유지)
     queryWords = set(queryLower.split())
     expandedTerms = []
-    for s in SYNONYM_DICT[bestMatch]:
-        if s.lower() not in queryLower and s.lower() not in queryWords:
+    for s, sLower in _SYNONYMS_LOWER[bestMatch]:
+        if sLower not in queryLower and sLower not in queryWords:
             expandedTerms.append(s)
         if len(expandedTerms) >= 3:
             break
@@ -291,36 +342,30 @@ def _expandQuery(query: str) -> str:
     return query
 
 
+@lru_cache(maxsize=256)
+def _chunkTokens(text: str) -> frozenset:
+    """캐시 청크 토큰 집합 (같은 청크는 후속 질문마다 재사용되므로 텍스트 단위 캐싱)
+
+    매 턴 새로 들어오는 질문은 여기에 넣지 않는다 (청크 항목이 질문 문자열에 밀려 제거되는 것 방지).
+    """
+    return frozenset(_CACHE_TOKEN_RE.findall(text.lower()))
+
+
 def _searchCachedChunks(query: str, cachedChunks: list,
                         sessionTopic: str = None) -> list:
     """캐시된 청크에서 쿼리 관련성 검색 (키워드 오버랩 + 주제 부스팅)"""
-    queryLower = query.lower()
-    queryTokens = set(re.findall(r'[가-힣]{2,}', queryLower))
-    queryTokens.update(re.findall(r'[a-z]{2,}', queryLower))
+    queryTokens = set(_CACHE_TOKEN_RE.findall(query.lower()))
 
     if not queryTokens:
         return []
 
     topicBoostKeywords = set()
     if sessionTopic:
-        topicMap = {
-            "조식": {"조식", "breakfast", "아침식사", "뷔페", "아침밥"},
-            "다이닝": {"레스토랑", "식당", "다이닝", "dinner", "lunch"},
-            "수영장": {"수영", "pool", "수영장"},
-            "피트니스": {"피트니스", "헬스", "gym", "fitness"},
-            "스파": {"스파", "spa", "마사지"},
-            "주차": {"주차", "parking", "발렛"},
-            "체크인/아웃": {"체크인", "체크아웃", "입실", "퇴실"},
-            "객실": {"객실", "room", "침대"},
-            "반려동물": {"반려동물", "반려견", "pet", "강아지"},
-        }
-        topicBoostKeywords = topicMap.get(sessionTopic, {sessionTopic})
+        topicBoostKeywords = _CACHE_TOPIC_BOOST_KEYWORDS.get(sessionTopic, {sessionTopic})
 
     scored = []
     for chunk in cachedChunks:
-        text = chunk.get("text", "").lower()
-        chunkTokens = set(re.findall(r'[가-힣]{2,}', text))
-        chunkTokens.update(re.findall(r'[a-z]{2,}', text))
+        chunkTokens = _chunkTokens(chunk.get("text", ""))
 
         overlap = queryTokens & chunkTokens
         overlapScore = len(overlap) / len(queryTokens) if queryTokens else 0
@@ -334,10 +379,43 @@ def _searchCachedChunks(query: str, cachedChunks: list,
         originalScore = chunk.get("original_score", chunk.get("score", 0.5))
         combinedScore = overlapScore * 0.3 + originalScore * 0.3 + topicBoost
 
-        scored.append({**chunk, "score": combinedScore, "source": "cache"})
+        scored.append((combinedScore, chunk))
+
+    # 상위 5개만 선별 후 복사 (nlargest는 안정 정렬 후 슬라이스와 동일 순서)
+    topScored = heapq.nlargest(5, scored, key=lambda x: x[0])
+    return [{**chunk, "score": score, "source": "cache"} for score, chunk in topScored]
+
+
+def _searchHotelsParallel(indexer, query: str, hotels: list, category: Optional[str],
+                          topK: int = 5) -> list:
+    """호텔별 검색을 병렬 실행 후 병합 (각 호텔 최상위 1개 보장, 나머지는 점수순)"""
+    # 질문 임베딩을 먼저 1회 계산해 캐시에 올림
+    # (캐시가 빈 상태로 호텔별 스레드가 동시에 시작하면 같은 질문을 호텔 수만큼 중복 인코딩)
+    try:
+        indexer.encodeQuery(query)
+    except Exception as e:
+        logger.warning("[검색] 질문 임베딩 사전 계산 실패: %s", e)
+
+    with ThreadPoolExecutor(max_workers=len(hotels)) as executor:
+        futures = {
+            hotelKey: executor.submit(indexer.search, query=query, hotel=hotelKey,
+                                      category=category, topK=topK)
+            for hotelKey in hotels
+        }
+        perHotel = []
+        for hotelKey, future in futures.items():
+            try:
+                perHotel.append(future.result())
+            except Exception as e:
+                logger.warning("[검색] %s 검색 실패: %s", hotelKey, e)
 
-    scored.sort(key=lambda x: x["score"], reverse=True)
-    return scored[:5]
+    # 호텔별 1위를 먼저 확보 → 한 호텔이 상위권을 독점하지 않도록
+    heads = [r[0] for r in perHotel if r]
+    rest = sorted((c for r in perHotel for c in r[1:]), key=lambda x: x["score"], reverse=True)
+    merged = heads + rest[:max(topK - len(heads), 0)]
+    merged.sort(key=lambda x: x["score"], reverse=True)
+    logger.debug("[검색] 호텔별 병렬 검색 (%s개 호텔) → %s개 결과", len(hotels), len(merged))
+    return merged
 
 
 def _mergeResults(primary: list, secondary: list, topK: int = 5) -> list:
@@ -351,5 +429,5 @@ def _mergeResults(primary: list, secondary: list, topK: int = 5) -> list:
             merged.append(r)
             seen.add(chunkId)
 
-    merged.sort(key=lambda x: x.get("score", 0), reverse=True)
-    return merged[:topK]
+    # 상위 topK만 선별 (nlargest는 안정 정렬 후 슬라이스와 동일 순서)
+    return heapq.nlargest(topK, merged, key=lambda x: x.get("score", 0))
@@ -1,16 +1,71 @@
 """검증 노드: 답변 검증, 정책 필터, 로깅"""
 
+import logging
 import re
-import json
 import time
+import queue
+import atexit
+import threading
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
+
 from rag.state import RAGState
-from rag.grounding import groundingGate, categoryChecker
+from rag.grounding import GroundingResult, groundingGate, categoryChecker
 from rag.verify import answerVerifier
+from rag.keyword_matcher import KeywordMatcher
 from rag.constants import HOTEL_INFO, FORBIDDEN_KEYWORDS
 
+logger = logging.getLogger(__name__)
+
+# 금지 키워드 단일 정규식 (키워드별 substring 스캔 → 1회 스캔)
+_FORBIDDEN_RE = re.compile("|".join(map(re.escape, FORBIDDEN_KEYWORDS)))
+
+# 호텔별 연락처 안내 문구 / 호텔 미지정 시 안내할 전체 대표번호 (HOTEL_INFO는 불변 → 1회 생성)
+_HOTEL_CONTACT_GUIDES = {
+    hotelKey: f"{info['name']} ({info['phone']})"
+    for hotelKey, info in HOTEL_INFO.items()
+    if info.get("name") and info.get("phone")
+}
+_ALL_CONTACTS_GUIDE = "각 호텔 대표번호({})".format(", ".join(
+    f"{info['name']} ({info['phone']})" for info in HOTEL_INFO.values()
+))
+
+# 답변 검증에서 매 요청 사용하는 정규식 (미리 컴파일)
+_QUERY_PERSON_RE = re.compile(r'([가-힣]{2,4})\s*(셰프|쉐프|대표|오너|총괄|매니저|소믈리에)')
+_PHONE_RE = re.compile(r'(\d{2,4}[-.]?\d{3,4}[-.]?\d{4})')
+_EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+_URL_RE = re.compile(r'https?://[^\s\n]+')
+
+# 질문 유형 판별 키워드 매처 (연락처, 오시는 길)
+_PHONE_QUERY_MATCHER = KeywordMatcher(["전화", "연락처", "대표번호", "전화번호", "번호"])
+_TRANSPORT_QUERY_MATCHER = KeywordMatcher(
+    ["가는 방법", "오시는 길", "오시는길", "어떻게 가", "찾아가는", "교통편", "가는 길", "가는길"]
+)
+# 거부(fallback) 답변 판별 매처 (한글 문구만 → 답변 소문자 변환 불필요)
+_REFUSAL_MATCHER = KeywordMatcher(
+    ["찾지 못했습니다", "찾을 수 없습니다", "확인하기 어렵습니다", "정확한 정보 확인을 위해", "문의 부탁드립니다"]
+)
+
+
+def _collapseNewlines(text: str) -> str:
+    """3줄 이상 연속 개행을 2줄로 축약 후 strip (대부분 해당 없음 → 부분 문자열 검사로 정규식 생략)"""
+    if "\n\n\n" in text:
+        text = _EXCESS_NEWLINES_RE.sub('\n\n', text)
+    return text.strip()
+
+
+@lru_cache(maxsize=128)
+def _verifyGrounding(answer: str, context: str, query: str) -> GroundingResult:
+    """Grounding 검증 결과 캐시 (결과는 읽기 전용으로 사용)
+
+    캐시 적중 답변·같은 청크 재검색·명확화 후 재실행 등 동일 (답변, 컨텍스트, 질문)의
+    claim 분리/근거 매칭을 다시 하지 않음. 검증은 입력만으로 결정되므로 결과 동일.
+    """
+    return groundingGate.verify(answer, context, query)
+
 
 def answerVerifyNode(state: RAGState) -> dict:
     """답변 검증 노드: Grounding Gate 기반 문장 단위 근거 검증 + 할루시네이션 탐지"""
@@ -24,7 +79,7 @@ def answerVerifyNode(state: RAGState) -> dict:
     hotelInfo = HOTEL_INFO.get(hotel, {})
     hotelName = hotelInfo.get("name", "")
     hotelPhone = hotelInfo.get("phone", "")
-    contactGuide = f"{hotelName} ({hotelPhone})" if hotelPhone else "호텔 고객센터"
+    contactGuide = _HOTEL_CONTACT_GUIDES.get(hotel, "호텔 고객센터")
 
     allIssues = []
 
@@ -33,7 +88,6 @@ def answerVerifyNode(state: RAGState) -> dict:
     if not relevancePassed:
         allIssues.append(f"관련성 부족: {relevanceReason}")
         return {
-            **state,
             "verification_passed": False,
             "verification_issues": allIssues,
             "verified_answer": f"죄송합니다, 해당 내용으로 정확한 정보를 찾을 수 없습니다.\n자세한 사항은 {contactGuide}로 문의 부탁드립니다.",
@@ -48,7 +102,6 @@ def answerVerifyNode(state: RAGState) -> dict:
     onlyForbiddenIssues = all("금지패턴" in i for i in qualityIssues) if qualityIssues else True
     if not qualityPassed and not onlyForbiddenIssues:
         return {
-            **state,
             "verification_passed": False,
             "verification_issues": allIssues,
             "verified_answer": f"죄송합니다, 해당 내용으로 정확한 정보를 찾을 수 없습니다.\n자세한 사항은 {contactGuide}로 문의 부탁드립니다.",
@@ -56,12 +109,13 @@ def answerVerifyNode(state: RAGState) -> dict:
             "query_intents": [],
         }
 
-    # 컨텍스트 구성
+    # 컨텍스트 구성 (소문자 버전은 고유명사/인물명 검사에서 공용)
     context = "\n".join([chunk["text"] for chunk in chunks[:5]])
+    contextLower = context.lower()
 
     # Phase 2: Grounding Gate 검증 (문장 단위 근거 검증)
     queryIntents = groundingGate.classifyIntent(query)
-    groundingResult = groundingGate.verify(answer, context, query)
+    groundingResult = _verifyGrounding(answer, context, query)
 
     groundingDict = {
         "passed": groundingResult.passed,
@@ -92,24 +146,22 @@ def answerVerifyNode(state: RAGState) -> dict:
     allIssues.extend(hallucinationIssues)
 
     # Phase 3.3: 고유명사 할루시네이션 검사
-    properNounPassed, properNounIssues, properNounCleaned = answerVerifier.checkProperNounHallucination(answer, context)
+    properNounPassed, properNounIssues, properNounCleaned = answerVerifier.checkProperNounHallucination(answer, context, contextLower)
     allIssues.extend(properNounIssues)
     if not properNounPassed:
         answer = properNounCleaned
-        print(f"[고유명사 검증] 할루시네이션 감지: {properNounIssues}")
+        logger.debug("[고유명사 검증] 할루시네이션 감지: %s", properNounIssues)
 
     # Phase 3.35: 쿼리 내 인물명 검증
     queryPersonRejected = False
-    queryPersonPattern = re.compile(r'([가-힣]{2,4})\s*(셰프|쉐프|대표|오너|총괄|매니저|소믈리에)')
-    queryPersonMatch = queryPersonPattern.search(query)
+    queryPersonMatch = _QUERY_PERSON_RE.search(query)
     if queryPersonMatch:
         personName = queryPersonMatch.group(1)
-        contextLower = context.lower()
         if personName.lower() not in contextLower:
             properNounPassed = False
             queryPersonRejected = True
             allIssues.append(f"쿼리 인물명 미검증: '{queryPersonMatch.group(0)}' — 컨텍스트에 없음")
-            print(f"[인물명 검증] 쿼리 내 '{queryPersonMatch.group(0)}' 컨텍스트 미검증 → 거부")
+            logger.debug("[인물명 검증] 쿼리 내 '%s' 컨텍스트 미검증 → 거부", queryPersonMatch.group(0))
 
     # Phase 3.4: 교통편/노선 날조 검사
     transportPassed, transportIssues, transportCleaned = answerVerifier.checkTransportationHallucination(answer, context, query)
@@ -129,22 +181,25 @@ def answerVerifyNode(state: RAGState) -> dict:
     # 검증 결과 종합
     passed = qualityPassed and hallucinationPassed and groundingResult.passed and properNounPassed and transportPassed
 
-    # 금지 패턴 제거
-    cleanedAnswer = answerVerifier.removeForbiddenPhrases(answer)
-    verifiedAnswer = cleanedAnswer
-
     # Phase 4: Grounding 기반 답변 재구성
+    # (금지 패턴 제거는 원 답변을 유지하는 분기에서만 수행 — 대체 응답 분기에서는 결과 미사용)
     if groundingResult.confidence == "근거없음":
         verifiedAnswer = groundingGate._buildFallbackResponse(
             groundingResult, hotelName, contactGuide
         )
     elif groundingResult.confidence == "불확실" and groundingResult.rejected_claims:
         if groundingResult.verified_claims:
-            verifiedAnswer = cleanedAnswer
-            for rejected in groundingResult.rejected_claims:
-                if rejected.has_numeric and not rejected.numeric_verified:
-                    verifiedAnswer = verifiedAnswer.replace(rejected.text, "")
-            verifiedAnswer = re.sub(r'\n{3,}', '\n\n', verifiedAnswer).strip()
+            verifiedAnswer = answerVerifier.removeForbiddenPhrases(answer)
+            # 수치 미검증 claim만 제거 (claim끼리 포함 관계가 있을 수 있어 순차 리터럴 치환 유지)
+            numericRejects = [
+                rejected.text for rejected in groundingResult.rejected_claims
+                if rejected.has_numeric and not rejected.numeric_verified
+            ]
+            if numericRejects:
+                for rejectedText in numericRejects:
+                    verifiedAnswer = verifiedAnswer.replace(rejectedText, "")
+                # 제거 없으면 금지 패턴 제거 결과가 이미 개행 축약/strip 상태
+                verifiedAnswer = _collapseNewlines(verifiedAnswer)
             if len(verifiedAnswer) < 10:
                 verifiedAnswer = groundingGate._buildFallbackResponse(
                     groundingResult, hotelName, contactGuide
@@ -154,7 +209,7 @@ def answerVerifyNode(state: RAGState) -> dict:
                 groundingResult, hotelName, contactGuide
             )
     else:
-        verifiedAnswer = cleanedAnswer
+        verifiedAnswer = answerVerifier.removeForbiddenPhrases(answer)
 
     # 심각한 이슈 최종 체크
     hasSeriousIssue = any(
@@ -170,23 +225,20 @@ def answerVerifyNode(state: RAGState) -> dict:
         verifiedAnswer = f"해당 정보를 확인하기 어렵습니다. {contactGuide}로 문의 부탁드립니다."
 
     # Phase 4.1: Fallback 답변 개선 — top chunk 직접 추출
-    refusalPatterns = ["찾지 못했습니다", "찾을 수 없습니다", "확인하기 어렵습니다",
-                      "정확한 정보 확인을 위해", "문의 부탁드립니다"]
     isFallback = (
         len(verifiedAnswer) < 100
-        and any(p in verifiedAnswer for p in refusalPatterns)
+        and _REFUSAL_MATCHER.matches(verifiedAnswer)
     )
     hallucinationRejected = not transportPassed or queryPersonRejected
 
     # Phase 4.1a: 연락처/전화번호 질문 시 HOTEL_INFO 단축 경로
-    phoneKeywords = ["전화", "연락처", "대표번호", "전화번호", "번호"]
-    isPhoneQuery = any(kw in query for kw in phoneKeywords)
+    isPhoneQuery = _PHONE_QUERY_MATCHER.matches(query.lower())
     if isFallback and isPhoneQuery and hotel and hotelPhone:
         verifiedAnswer = f"{hotelName}의 대표 전화번호는 {hotelPhone}입니다."
         locationUrl = hotelInfo.get("locationUrl", "")
         if locationUrl:
             verifiedAnswer += f"\n\n참고 정보: {locationUrl}"
-        print(f"[Fallback 연락처] HOTEL_INFO 단축 경로: {hotelName} {hotelPhone}")
+        logger.debug("[Fallback 연락처] HOTEL_INFO 단축 경로: %s %s", hotelName, hotelPhone)
         isFallback = False
 
     if isFallback and chunks and state.get("evidence_passed") and not hallucinationRejected:
@@ -195,14 +247,14 @@ def answerVerifyNode(state: RAGState) -> dict:
         if isPhoneQuery:
             for chunk in chunks[:5]:
                 chunkText = chunk.get("text", "")
-                phoneMatch = re.search(r'(\d{2,4}[-.]?\d{3,4}[-.]?\d{4})', chunkText)
+                phoneMatch = _PHONE_RE.search(chunkText)
                 if phoneMatch:
                     phonePatternMatch = phoneMatch.group(1)
                     chunkUrl = chunk.get("metadata", {}).get("url", chunk.get("url", ""))
                     verifiedAnswer = f"{hotelName}의 대표 전화번호는 {phonePatternMatch}입니다."
                     if chunkUrl:
                         verifiedAnswer += f"\n\n참고 정보: {chunkUrl}"
-                    print(f"[Fallback 전화번호] chunk에서 전화번호 추출: {phonePatternMatch}")
+                    logger.debug("[Fallback 전화번호] chunk에서 전화번호 추출: %s", phonePatternMatch)
                     break
 
         # Phase 4.1c: 일반 chunk 직접 추출 (주제 일치 검증 포함)
@@ -218,10 +270,10 @@ def answerVerifyNode(state: RAGState) -> dict:
                 if queryKeywords:
                     chunkLower = chunkText.lower()
                     for kw in queryKeywords:
-                        expanded = answerVerifier.CATEGORY_KEYWORD_MAP.get(kw, [kw])
-                        if not any(e.lower() in chunkLower for e in expanded):
+                        expanded = answerVerifier.CATEGORY_KEYWORD_MAP_LOWER.get(kw, (kw.lower(),))
+                        if not any(e in chunkLower for e in expanded):
                             topicMismatch = True
-                            print(f"[Fallback 주제 검증] '{kw}' chunk에 없음 → 스킵")
+                            logger.debug("[Fallback 주제 검증] '%s' chunk에 없음 → 스킵", kw)
                             break
                 if topicMismatch:
                     continue
@@ -229,7 +281,7 @@ def answerVerifyNode(state: RAGState) -> dict:
                 if extracted and len(extracted) >= 10:
                     # raw dump 검증: 네비게이션/UI 요소가 포함된 원시 데이터 스킵
                     if answerVerifier.isRawDump(extracted):
-                        print(f"[Fallback 직접 추출] raw dump 감지 → 스킵: {extracted[:60]}...")
+                        logger.debug("[Fallback 직접 추출] raw dump 감지 → 스킵: %s...", extracted[:60])
                         continue
                     directAnswer = extracted
                     bestUrl = chunkUrl
@@ -238,7 +290,7 @@ def answerVerifyNode(state: RAGState) -> dict:
             if directAnswer:
                 if bestUrl:
                     directAnswer += f"\n\n참고 정보: {bestUrl}"
-                print(f"[Fallback 직접 추출] 거부 → chunk에서 답변 추출: {directAnswer[:80]}...")
+                logger.debug("[Fallback 직접 추출] 거부 → chunk에서 답변 추출: %s...", directAnswer[:80])
                 verifiedAnswer = directAnswer
 
     # 금지 패턴만 있던 경우 통과 처리
@@ -250,12 +302,11 @@ def answerVerifyNode(state: RAGState) -> dict:
         passed = True
         allIssues = []
 
-    verifiedAnswer = re.sub(r'\n{3,}', '\n\n', verifiedAnswer).strip()
+    verifiedAnswer = _collapseNewlines(verifiedAnswer)
 
     _elapsed = time.time() - _start
-    print(f"[타이밍] answerVerify: {_elapsed:.3f}s")
+    logger.debug("[타이밍] answerVerify: %.3fs", _elapsed)
     return {
-        **state,
         "verification_passed": passed,
         "verification_issues": allIssues,
         "verified_answer": verifiedAnswer,
@@ -273,42 +324,27 @@ def policyFilterNode(state: RAGState) -> dict:
 
     _start = time.time()
     hotelInfo = HOTEL_INFO.get(hotel, {})
-    hotelName = hotelInfo.get("name", "")
-    hotelPhone = hotelInfo.get("phone", "")
-
-    if hotelName and hotelPhone:
-        contactGuide = f"{hotelName} ({hotelPhone})"
-    else:
-        allContacts = ", ".join([
-            f"{info['name']} ({info['phone']})"
-            for info in HOTEL_INFO.values()
-        ])
-        contactGuide = f"각 호텔 대표번호({allContacts})"
+    contactGuide = _HOTEL_CONTACT_GUIDES.get(hotel, _ALL_CONTACTS_GUIDE)
 
     # 금지 키워드 체크
-    for keyword in FORBIDDEN_KEYWORDS:
-        if keyword in query:
-            return {
-                **state,
-                "policy_passed": False,
-                "policy_reason": f"개인정보 관련 문의",
-                "final_answer": f"고객님의 소중한 개인정보(예약번호, 카드번호 등) 관련 문의는 보안상 챗봇에서 처리가 어렵습니다.\n자세한 사항은 {contactGuide}로 문의 부탁드립니다.",
-            }
+    if _FORBIDDEN_RE.search(query):
+        return {
+            "policy_passed": False,
+            "policy_reason": f"개인정보 관련 문의",
+            "final_answer": f"고객님의 소중한 개인정보(예약번호, 카드번호 등) 관련 문의는 보안상 챗봇에서 처리가 어렵습니다.\n자세한 사항은 {contactGuide}로 문의 부탁드립니다.",
+        }
 
     # 근거 검증 실패 시 기본 답변
     if not state["evidence_passed"]:
         fallbackAnswer = f"죄송합니다, 해당 내용으로 정확한 정보를 찾을 수 없습니다.\n자세한 사항은 {contactGuide}로 문의 부탁드립니다."
 
-        transportKeywords = ["가는 방법", "오시는 길", "오시는길", "어떻게 가", "찾아가는", "교통편", "가는 길", "가는길"]
-        queryLower = query.lower()
-        isTransportQuery = any(kw in queryLower for kw in transportKeywords)
+        isTransportQuery = _TRANSPORT_QUERY_MATCHER.matches(query.lower())
         if isTransportQuery:
             locationUrl = hotelInfo.get("locationUrl", "")
             if locationUrl:
                 fallbackAnswer = f"죄송합니다, 해당 출발지에서의 정확한 교통 정보를 찾을 수 없습니다.\n호텔 위치 및 오시는 길 안내 페이지를 참고해 주세요: {locationUrl}\n추가 문의는 {contactGuide}로 부탁드립니다."
 
         return {
-            **state,
             "policy_passed": True,
             "policy_reason": "근거 부족으로 기본 답변",
             "final_answer": fallbackAnswer,
@@ -317,7 +353,7 @@ def policyFilterNode(state: RAGState) -> dict:
     # 최종 안전망 (LLM의 [참조N] 형식은 허용, 시스템 오류 패턴만 차단)
     errorPatterns = ["[시스템 오류]", "검색된 정보:", "일시적인 오류로 답변을 생성하지 못했습니다"]
     if any(p in answer for p in errorPatterns):
-        print(f"[안전망] 답변에 오류 패턴 감지, fallback 교체")
+        logger.debug("[안전망] 답변에 오류 패턴 감지, fallback 교체")
         answer = f"죄송합니다, 일시적인 오류로 답변을 생성하지 못했습니다.\n자세한 사항은 {contactGuide}로 문의 부탁드립니다."
 
     # 출처 추가 (중복 방지)
@@ -328,21 +364,21 @@ def policyFilterNode(state: RAGState) -> dict:
         refIdx = finalAnswer.index("\n\n참고 정보:")
         existingRefSection = finalAnswer[refIdx:]
         finalAnswer = finalAnswer[:refIdx]
-        existingUrls = re.findall(r'https?://[^\s\n]+', existingRefSection)
+        existingUrls = _URL_RE.findall(existingRefSection)
         sources = list(sources) + existingUrls
 
     if sources:
-        uniqueSources = list(dict.fromkeys(sources))
+        # dict.fromkeys: C 수준 순서 보존 중복 제거 (별도 list 변환 없이 키를 그대로 사용)
+        uniqueSources = dict.fromkeys(sources)
         if len(uniqueSources) == 1:
-            finalAnswer += f"\n\n참고 정보: {uniqueSources[0]}"
+            finalAnswer += f"\n\n참고 정보: {next(iter(uniqueSources))}"
         else:
             sourceList = "\n".join(uniqueSources)
             finalAnswer += f"\n\n참고 정보:\n{sourceList}"
 
     _elapsed = time.time() - _start
-    print(f"[타이밍] policyFilter: {_elapsed:.3f}s")
+    logger.debug("[타이밍] policyFilter: %.3fs", _elapsed)
     return {
-        **state,
         "policy_passed": True,
         "policy_reason": "정상 처리",
         "final_answer": finalAnswer,
@@ -351,8 +387,9 @@ def policyFilterNode(state: RAGState) -> dict:
 
 def logNode(state: RAGState, *, logPath=None) -> dict:
     """로그 노드: 대화 기록 저장"""
+    now = datetime.now()
     logEntry = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now.isoformat(),
         "duration_s": round(time.time() - state.get("_pipeline_start", time.time()), 2),
         "query": state["query"],
         "hotel": state.get("detected_hotel"),
@@ -361,22 +398,98 @@ def logNode(state: RAGState, *, logPath=None) -> dict:
         "verification_passed": bool(state.get("verification_passed", True)),
         "verification_issues": state.get("verification_issues", []),
         "top_score": float(state["top_score"]),
-        "chunks_count": len(state["retrieved_chunks"]),
+        "chunks_count": state.get("retrieved_chunks_count", 0),
         "final_answer": state["final_answer"],
         "grounding_result": state.get("grounding_result"),
         "query_intents": state.get("query_intents", []),
     }
 
-    # 파일에 로그 저장
-    if logPath is None:
-        logPath = Path(__file__).parent.parent / "data" / "logs"
-        logPath.mkdir(parents=True, exist_ok=True)
-
-    logFile = logPath / f"chat_{datetime.now().strftime('%Y%m%d')}.jsonl"
-    with open(logFile, "a", encoding="utf-8") as f:
-        f.write(json.dumps(logEntry, ensure_ascii=False) + "\n")
+    # 로그 저장은 백그라운드 스레드에 위임 (응답 경로에서 파일 I/O 제거, 디렉토리 생성 포함)
+    logFile = (logPath or _DEFAULT_LOG_PATH) / f"chat_{now.strftime('%Y%m%d')}.jsonl"
+    _enqueueLog(logFile, logEntry)
 
     return {
-        **state,
         "log": logEntry,
     }
+
+
+# === 비동기 로그 기록 ===
+# logNode는 큐에 넣기만 하고, 데몬 스레드가 모아서 한 번에 기록한다.
+# 파일 핸들은 날짜별로 유지 (자정에 새 파일로 전환)
+
+LOG_BATCH_SIZE = 64
+_DEFAULT_LOG_PATH = Path(__file__).parent.parent / "data" / "logs"
+
+_logQueue: "queue.Queue" = queue.Queue()
+_logThread = None
+_logThreadLock = threading.Lock()
+
+
+def _enqueueLog(logFile: Path, logEntry: dict):
+    """로그 항목을 기록 큐에 추가 (필요 시 기록 스레드 시작)"""
+    global _logThread
+    if _logThread is None:
+        with _logThreadLock:
+            if _logThread is None:
+                _logThread = threading.Thread(target=_logWriter, name="chat-log-writer", daemon=True)
+                _logThread.start()
+                atexit.register(_flushLogsOnExit)
+    _logQueue.put((logFile, logEntry))
+
+
+def _logWriter():
+    """로그 기록 스레드: 배치 단위로 모아 파일당 write 1회"""
+    openFiles = {}  # logFile → 파일 핸들 (날짜가 바뀌면 이전 핸들 닫음)
+    while True:
+        item = _logQueue.get()
+        if item is None:
+            break
+        batch = [item]
+        stop = False
+        while len(batch) < LOG_BATCH_SIZE:
+            try:
+                item = _logQueue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+
+        # orjson: UTF-8 bytes 직접 생성 (json.dumps + encode 대비 수 배 빠름)
+        linesByFile = {}
+        for logFile, logEntry in batch:
+            try:
+                line = orjson.dumps(logEntry, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+            except TypeError as e:
+                logger.warning("[로그] 직렬화 실패: %s", e)
+                continue
+            linesByFile.setdefault(logFile, []).append(line)
+
+        for logFile, lines in linesByFile.items():
+            try:
+                f = openFiles.get(logFile)
+                if f is None:
+                    # 날짜 전환: 이전 날짜 파일 정리
+                    for oldFile in [k for k in openFiles if k.parent == logFile.parent]:
+                        openFiles.pop(oldFile).close()
+                    logFile.parent.mkdir(parents=True, exist_ok=True)
+                    f = open(logFile, "ab")
+                    openFiles[logFile] = f
+                f.write(b"".join(lines))
+                f.flush()
+            except Exception as e:
+                logger.warning("[로그] 기록 실패 (%s): %s", logFile.name, e)
+
+        if stop:
+            break
+
+    for f in openFiles.values():
+        f.close()
+
+
+def _flushLogsOnExit():
+    """프로세스 종료 시 남은 로그 기록"""
+    _logQueue.put(None)
+    if _logThread is not None:
+        _logThread.join(timeout=5)
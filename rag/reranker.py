@@ -7,12 +7,19 @@ Cross-Encoder 기반 리랭커 (transformers 직접 사용)
 - 쿼리별 점수 캐싱으로 중복 계산 방지
 """
 
+import logging
 import re
 import time
 import hashlib
 from functools import lru_cache
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+# 쿼리 키워드 추출용 정규식 (한글 2글자 이상 단어, 단어 끝 조사)
+_KOREAN_WORD_RE = re.compile(r'[가-힣]{2,}')
+_TRAILING_PARTICLE_RE = re.compile(r'(에서|에는|에도|해줘|해요|인가요|인지|입니까|할까|인데|하고|해도|대해|관해|은|는|이|가|을|를|의|도|만|에|로|으로)$')
+
 
 class Reranker:
     """Cross-Encoder 리랭커 (transformers 직접 사용)"""
@@ -31,6 +38,12 @@ class Reranker:
     ABSOLUTE_RAW_SCORE_FLOOR = -5.0
     # 추론 최적화
     MAX_LENGTH = 512  # 토크나이저 최대 길이 (원본 유지, MPS 가속으로 충분히 빠름)
+    # 쿼리 키워드 보존 판정에서 제외할 일반어
+    _KEYWORD_STOPWORDS = frozenset({
+        "어떻게", "언제", "어디", "무엇", "얼마", "여기", "거기",
+        "호텔", "정보", "안내", "문의", "운영", "이용", "서비스",
+        "레스토랑", "객실", "시설", "소개", "가능", "알려줘",
+    })
 
     def __init__(self, modelName: str = None, device: str = "cpu"):
         self.modelName = modelName or self.DEFAULT_MODEL
@@ -51,7 +64,7 @@ class Reranker:
             from transformers import AutoModelForSequenceClassification, AutoTokenizer
             import torch
 
-            print(f"[리랭커] 모델 로딩: {self.modelName}...")
+            logger.info("[리랭커] 모델 로딩: %s...", self.modelName)
             startTime = time.time()
 
             self._tokenizer = AutoTokenizer.from_pretrained(self.modelName)
@@ -66,15 +79,15 @@ class Reranker:
                 if torch.backends.mps.is_available():
                     self._model = self._model.to("mps")
                     self.device = "mps"
-                    print(f"[리랭커] MPS(Metal GPU) 가속 활성화")
+                    logger.info("[리랭커] MPS(Metal GPU) 가속 활성화")
             except Exception as e:
-                print(f"[리랭커] MPS 불가, CPU 유지: {e}")
+                logger.warning("[리랭커] MPS 불가, CPU 유지: %s", e)
 
             elapsed = time.time() - startTime
-            print(f"[리랭커] 로딩 완료 ({elapsed:.1f}초)")
+            logger.info("[리랭커] 로딩 완료 (%.1f초)", elapsed)
 
         except Exception as e:
-            print(f"[리랭커] 모델 로드 실패: {e}")
+            logger.warning("[리랭커] 모델 로드 실패: %s", e)
             self._loadFailed = True
 
     def _generateChunkKey(self, query: str, chunkText: str) -> str:
@@ -99,7 +112,7 @@ class Reranker:
         self._loadModel()
 
         if self._model is None:
-            print("[리랭커] 모델 없음, 원본 순서 유지")
+            logger.debug("[리랭커] 모델 없음, 원본 순서 유지")
             return chunks[:topK]
 
         # Cross-Encoder 점수 계산 (배치 처리 + 캐싱)
@@ -163,17 +176,17 @@ class Reranker:
             elapsed = time.time() - startTime
             totalRequests = self._cacheHits + self._cacheMisses
             hitRate = (self._cacheHits / totalRequests * 100) if totalRequests > 0 else 0
-            print(f"[리랭커] {len(chunks)}개 청크 점수 계산 ({elapsed * 1000:.0f}ms, 캐시: {self._cacheHits}/{totalRequests} = {hitRate:.1f}%)")
+            logger.debug("[리랭커] %s개 청크 점수 계산 (%.0fms, 캐시: %s/%s = %.1f%%)", len(chunks), elapsed * 1000, self._cacheHits, totalRequests, hitRate)
 
         except Exception as e:
-            print(f"[리랭커] 점수 계산 실패: {e}")
+            logger.warning("[리랭커] 점수 계산 실패: %s", e)
             return chunks[:topK]
 
         # 절대 품질 판정: 최고 raw score가 임계값 미만이면 전체 "저품질"
         bestRawScore = max(rawScores)
         isLowQuality = bestRawScore < self.ABSOLUTE_RAW_SCORE_FLOOR
         if isLowQuality:
-            print(f"[리랭커] 절대 품질 미달: 최고 raw={bestRawScore:.2f} < floor={self.ABSOLUTE_RAW_SCORE_FLOOR}")
+            logger.debug("[리랭커] 절대 품질 미달: 최고 raw=%.2f < floor=%s", bestRawScore, self.ABSOLUTE_RAW_SCORE_FLOOR)
 
         # min-max 정규화 (0~1 범위)
         scores = np.array(rawScores)
@@ -184,19 +197,21 @@ class Reranker:
             # 모든 점수가 비슷하면 균등 배분
             normalizedScores = np.ones_like(scores) * 0.5
 
-        # 청크에 점수 추가
-        scoredChunks = []
-        for i, chunk in enumerate(chunks):
-            scoredChunks.append({
-                **chunk,
+        # 리랭크 점수 내림차순 순열 (stable: 동점은 원래 검색 순서 유지)
+        order = np.argsort(-normalizedScores, kind="stable")
+        qualityLabel = "poor" if isLowQuality else "ok"
+
+        # 순열 순서대로 청크에 점수 추가
+        scoredChunks = [
+            {
+                **chunks[i],
                 "rerank_score": float(normalizedScores[i]),
                 "rerank_raw": float(rawScores[i]),
-                "original_score": chunk.get("score", 0),
-                "_rerank_quality": "poor" if isLowQuality else "ok",
-            })
-
-        # 리랭크 점수 기준 정렬
-        scoredChunks.sort(key=lambda x: x["rerank_score"], reverse=True)
+                "original_score": chunks[i].get("score", 0),
+                "_rerank_quality": qualityLabel,
+            }
+            for i in order
+        ]
 
         # 상대 임계값 필터링 (최고 점수 대비) + 쿼리 키워드 매칭
         topRerankScore = scoredChunks[0]["rerank_score"] if scoredChunks else 0
@@ -220,31 +235,28 @@ class Reranker:
         # 로그
         removed = len(chunks) - len(result)
         if removed > 0:
-            print(f"[리랭커] {removed}개 저관련 청크 제거")
-        for chunk in scoredChunks:
-            if chunk in result:
-                status = "K" if chunk.get("_kept_by_keyword") else "O"
-            else:
-                status = "X"
-            print(f"  [{status}] rerank={chunk['rerank_score']:.3f} raw={chunk['rerank_raw']:.2f} orig={chunk['original_score']:.3f} | {chunk['text'][:60]}...")
+            logger.debug("[리랭커] %s개 저관련 청크 제거", removed)
+        if logger.isEnabledFor(logging.DEBUG):
+            for chunk in scoredChunks:
+                if chunk in result:
+                    status = "K" if chunk.get("_kept_by_keyword") else "O"
+                else:
+                    status = "X"
+                logger.debug("  [%s] rerank=%.3f raw=%.2f orig=%.3f | %s...", status, chunk['rerank_score'], chunk['rerank_raw'], chunk['original_score'], chunk['text'][:60])
 
         return result
 
     def _extractQueryKeywords(self, query: str) -> list[str]:
         """쿼리에서 2글자 이상 한글 핵심 키워드 추출 (조사/일반어 제거)"""
         # 먼저 단어 추출 (한글 2글자 이상)
-        words = re.findall(r'[가-힣]{2,}', query)
+        words = _KOREAN_WORD_RE.findall(query)
         # 각 단어 끝의 조사만 제거 (단어 중간 글자 보호)
-        suffixes = r'(에서|에는|에도|해줘|해요|인가요|인지|입니까|할까|인데|하고|해도|대해|관해|은|는|이|가|을|를|의|도|만|에|로|으로)$'
         cleaned = []
         for w in words:
-            w = re.sub(suffixes, '', w)
+            w = _TRAILING_PARTICLE_RE.sub('', w)
             if len(w) >= 2:
                 cleaned.append(w)
-        stopwords = {"어떻게", "언제", "어디", "무엇", "얼마", "여기", "거기",
-                     "호텔", "정보", "안내", "문의", "운영", "이용", "서비스",
-                     "레스토랑", "객실", "시설", "소개", "가능", "알려줘"}
-        return [w for w in cleaned if w not in stopwords]
+        return [w for w in cleaned if w not in self._KEYWORD_STOPWORDS]
 
     def _hasQueryKeyword(self, chunk: dict, queryKeywords: list[str]) -> bool:
         """청크 텍스트에 쿼리 핵심 키워드가 포함되어 있는지 확인"""
@@ -276,7 +288,7 @@ class Reranker:
         self._scoreCache.clear()
         self._cacheHits = 0
         self._cacheMisses = 0
-        print("[리랭커] 캐시 초기화 완료")
+        logger.info("[리랭커] 캐시 초기화 완료")
 
 
 # 싱글톤 인스턴스 (lazy loading)
@@ -0,0 +1,210 @@
+"""
+시맨틱 캐시 (LLM 응답 재사용)
+- 질문 임베딩 코사인 유사도가 임계값 이상이면 이전 LLM 결과 재사용
+- 네임스페이스(노드) + 스코프(호텔/언어/직전 대화) 단위로 분리 → 잘못된 재사용 방지
+- 버킷별 항목 LRU 제거 + 버킷 수 상한(LRU), 스레드 안전
+- 버킷 임베딩 행렬은 사용량에 따라 증설 (스코프 대부분은 항목 1~2개)
+- 항목별 정확 일치 키(entryKey): 한 버킷 안에서 키가 같은 항목끼리만 유사도 비교
+- 임베딩 함수는 인덱서에서 주입 (setEncoder), 미주입 시 캐시 비활성
+- 유사도 커널(rag.similarity, numba)은 첫 사용 시 import (단발 질문만 처리하는 프로세스는 로딩 생략)
+"""
+
+import logging
+import os
+import re
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+# E5 임베딩은 무관한 문장끼리도 0.8 이상이 흔함 → 매우 보수적인 임계값
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))
+SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "256"))  # 버킷당 최대 항목 수
+# 최대 버킷 수: 재작성 스코프는 직전 발화마다 새로 생기므로 오래 안 쓴 버킷부터 제거
+SEMANTIC_CACHE_MAX_BUCKETS = int(os.getenv("SEMANTIC_CACHE_MAX_BUCKETS", "512"))
+
+
+def contextKey(history: list) -> str:
+    """직전 사용자 발화 해시 (멀티턴 질문의 캐시 스코프 구분용)"""
+    if not history:
+        return ""
+    for msg in reversed(history):
+        if msg.get("role") == "user":
+            return hashlib.md5(msg.get("content", "").encode('utf-8')).hexdigest()
+    return ""
+
+
+# 질문 핵심어 추출 (항목 키용): 2글자 이상 토큰, 기능어/일반어 제외
+_KEYWORD_TOKEN_RE = re.compile(r'[가-힣a-zA-Z0-9]{2,}')
+_KEYWORD_STOPWORDS = frozenset({
+    "알려줘", "알려주세요", "알려", "어떻게", "언제", "얼마",
+    "무엇", "호텔", "안내", "정보", "문의",
+})
+
+
+def keywordKey(text: str) -> frozenset:
+    """질문 핵심어 집합 (entryKey용)
+
+    토큰 앞 2글자만 사용해 조사 변형("조식은"/"조식")은 흡수하고,
+    임베딩이 가까운 다른 대상("조식은?"/"석식은?")은 다른 키가 되도록 한다.
+    """
+    return frozenset(
+        tok[:2] for tok in _KEYWORD_TOKEN_RE.findall(text.lower())
+        if tok not in _KEYWORD_STOPWORDS
+    )
+
+
+class _Bucket:
+    """(네임스페이스, 스코프)별 임베딩 행렬 + 값 저장소"""
+
+    _INITIAL_ROWS = 4  # 첫 할당 행 수 (가득 차면 capacity까지 2배씩 증설)
+
+    def __init__(self, dim: int, capacity: int):
+        self.capacity = capacity
+        self.embeddings = np.zeros((min(self._INITIAL_ROWS, capacity), dim), dtype=np.float32)
+        self.values = []
+        self.entryKeys = []
+        self.lastUsed = []
+
+    def lookup(self, embedding: np.ndarray, threshold: float, entryKey=None):
+        candidates = [i for i, key in enumerate(self.entryKeys) if key == entryKey]
+        if not candidates:
+            return None
+        from rag.similarity import topKCosine
+        if len(candidates) == len(self.values):
+            matrix = self.embeddings[:len(self.values)]
+        else:
+            matrix = self.embeddings[candidates]
+        idx, sims = topKCosine(embedding, matrix, 1)
+        if sims[0] < threshold:
+            return None
+        slot = candidates[idx[0]]
+        self.lastUsed[slot] = time.monotonic()
+        return self.values[slot]
+
+    def insert(self, embedding: np.ndarray, value, entryKey=None):
+        if len(self.values) < self.capacity:
+            slot = len(self.values)
+            if slot == len(self.embeddings):
+                grown = np.zeros((min(slot * 2, self.capacity), self.embeddings.shape[1]), dtype=np.float32)
+                grown[:slot] = self.embeddings
+                self.embeddings = grown
+            self.values.append(value)
+            self.entryKeys.append(entryKey)
+            self.lastUsed.append(0.0)
+        else:
+            # LRU: 가장 오래 사용되지 않은 항목 교체
+            slot = min(range(len(self.lastUsed)), key=self.lastUsed.__getitem__)
+            self.values[slot] = value
+            self.entryKeys[slot] = entryKey
+        self.embeddings[slot] = embedding
+        self.lastUsed[slot] = time.monotonic()
+
+
+class SemanticCache:
+    """임베딩 유사도 기반 LLM 응답 캐시"""
+
+    def __init__(self, threshold: float = SEMANTIC_CACHE_THRESHOLD,
+                 capacity: int = SEMANTIC_CACHE_SIZE,
+                 maxBuckets: int = SEMANTIC_CACHE_MAX_BUCKETS):
+        self.threshold = threshold
+        self.capacity = capacity
+        self.maxBuckets = maxBuckets
+        self._encoder: Optional[Callable[[str], list]] = None
+        self._buckets = OrderedDict()  # (네임스페이스, 스코프) → _Bucket, 최근 사용 순
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def setEncoder(self, encoder: Callable[[str], list]):
+        """임베딩 함수 주입 (텍스트 → 벡터)"""
+        self._encoder = encoder
+
+    def isAvailable(self) -> bool:
+        return SEMANTIC_CACHE_ENABLED and self._encoder is not None
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        from rag.similarity import normalizeRows
+        try:
+            return normalizeRows(self._encoder(text))
+        except Exception as e:
+            logger.warning("[시맨틱 캐시] 임베딩 실패: %s", e)
+            return None
+
+    def get(self, namespace: str, scope: tuple, text: str, entryKey=None):
+        """유사 질문의 캐시 값 조회 (없으면 None, entryKey가 같은 항목만 비교)"""
+        if not self.isAvailable():
+            return None
+        embedding = self._embed(text)
+        if embedding is None:
+            return None
+
+        with self._lock:
+            bucket = self._buckets.get((namespace, scope))
+            value = None
+            if bucket is not None:
+                self._buckets.move_to_end((namespace, scope))
+                value = bucket.lookup(embedding, self.threshold, entryKey)
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        if value is not None:
+            logger.debug("[시맨틱 캐시] HIT (%s)", namespace)
+        return value
+
+    def put(self, namespace: str, scope: tuple, text: str, value, entryKey=None):
+        """캐시 저장 (entryKey: 조회 시 정확히 일치해야 하는 항목 키)"""
+        if not self.isAvailable() or value is None:
+            return
+        embedding = self._embed(text)
+        if embedding is None:
+            return
+
+        with self._lock:
+            bucket = self._buckets.get((namespace, scope))
+            if bucket is None:
+                bucket = _Bucket(len(embedding), self.capacity)
+                self._buckets[(namespace, scope)] = bucket
+                if len(self._buckets) > self.maxBuckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end((namespace, scope))
+            bucket.insert(embedding, value, entryKey)
+
+    def getStats(self) -> dict:
+        """캐시 통계"""
+        total = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": f"{(self._hits / total * 100) if total > 0 else 0:.1f}%",
+            "buckets": len(self._buckets),
+            "entries": sum(len(b.values) for b in self._buckets.values()),
+        }
+
+    def clear(self):
+        """캐시 초기화"""
+        with self._lock:
+            self._buckets.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+# 싱글톤 인스턴스
+_semanticCacheInstance = None
+
+
+def getSemanticCache() -> SemanticCache:
+    """시맨틱 캐시 싱글톤 인스턴스 반환"""
+    global _semanticCacheInstance
+    if _semanticCacheInstance is None:
+        _semanticCacheInstance = SemanticCache()
+    return _semanticCacheInstance
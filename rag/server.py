@@ -8,13 +8,14 @@ FastAPI 기반 RAG 챗봇 서버
 
 import os
 import sys
-import json
+import logging
 import time
 import asyncio
 import threading
-import traceback
 from pathlib import Path
 
+import orjson
+
 # 프로젝트 루트를 path에 추가
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -34,6 +35,11 @@ from rag.graph import createRAGGraph
 # 환경변수에서 포트 가져오기 (Render 호환)
 PORT = int(os.getenv("PORT", 8000))
 
+# 로그 레벨 (운영 INFO, 개발 DEBUG → 노드별 진단/타이밍 로그 출력)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+logging.basicConfig(level=LOG_LEVEL, format="%(message)s")
+logger = logging.getLogger(__name__)
+
 # CORS 허용 도메인 (환경변수 ALLOWED_ORIGINS 설정 시 제한, 미설정 시 전체 허용)
 _envOrigins = os.getenv("ALLOWED_ORIGINS", "")
 ALLOWED_ORIGINS = _envOrigins.split(",") if _envOrigins else ["*"]
@@ -48,8 +54,14 @@ async def warmup():
     print("[Warm-up] 모델 사전 로딩 시작...")
     t0 = time.time()
 
-    # 1. RAG 그래프 초기화 (Embedding 모델 + Chroma + BM25)
-    getRagGraph()
+    # 1. RAG 그래프 초기화 (Embedding 모델 + Chroma + BM25) + 검색 경로 1회 실행
+    #    (첫 임베딩 추론/Chroma 쿼리 지연을 첫 사용자 요청에서 제거)
+    rag = getRagGraph()
+    try:
+        rag.indexer.search(query="체크인 시간", topK=1)
+        print(f"[Warm-up] 검색 경로 준비 완료")
+    except Exception as e:
+        print(f"[Warm-up] 검색 경로 준비 실패: {e}")
 
     # 2. 리랭커 모델 사전 로딩 (RERANKER_ENABLED=false면 스킵)
     from rag.constants import RERANKER_ENABLED
@@ -64,10 +76,22 @@ async def warmup():
     else:
         print(f"[Warm-up] 리랭커 비활성화 (RERANKER_ENABLED=false)")
 
-    # 3. Ollama LLM 모델 warm-up (keep_alive=-1로 메모리 상주)
+    # 3. 시맨틱 캐시 유사도 커널 JIT 컴파일 (numba 설치 시 첫 요청 컴파일 지연 제거)
     try:
-        from rag.llm_provider import callLLM
+        from rag.similarity import warmupKernels
+        warmupKernels()
+        print(f"[Warm-up] 유사도 커널 준비 완료")
+    except Exception as e:
+        print(f"[Warm-up] 유사도 커널 준비 실패: {e}")
+
+    # 4. Ollama LLM 모델 warm-up (keep_alive=-1로 메모리 상주)
+    try:
+        from rag.llm_provider import callLLM, OLLAMA_MODEL, OLLAMA_REWRITE_MODEL
         await asyncio.to_thread(callLLM, prompt="안녕", system="", temperature=0.0, maxTokens=5)
+        # 쿼리 재작성 전용 모델을 따로 지정했으면 함께 상주시킴
+        if OLLAMA_REWRITE_MODEL != OLLAMA_MODEL:
+            await asyncio.to_thread(callLLM, prompt="안녕", system="", temperature=0.0, maxTokens=5,
+                                    model=OLLAMA_REWRITE_MODEL)
         print(f"[Warm-up] LLM 모델 로딩 완료")
     except Exception as e:
         print(f"[Warm-up] LLM warm-up 실패 (서버는 정상 작동): {e}")
@@ -87,15 +111,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# RAG 그래프 인스턴스 (싱글톤)
+# RAG 그래프 인스턴스 (프로세스당 싱글톤, 그래프 compile + 인덱서 로딩 1회)
 ragGraph = None
+_ragGraphLock = threading.Lock()
 
 def getRagGraph():
     global ragGraph
     if ragGraph is None:
-        print("[서버] RAG 그래프 초기화 중...")
-        ragGraph = createRAGGraph()
-        print("[서버] RAG 그래프 초기화 완료")
+        # 동시 첫 요청(스레드풀)에서 중복 초기화 방지
+        with _ragGraphLock:
+            if ragGraph is None:
+                print("[서버] RAG 그래프 초기화 중...")
+                ragGraph = createRAGGraph()
+                print("[서버] RAG 그래프 초기화 완료")
     return ragGraph
 
 
@@ -156,13 +184,23 @@ async def health():
     return status
 
 
+# 스트리밍 답변 교체 판정용 정규식 (참조 태그 제거, 참고 정보 섹션 분리)
+_STREAM_REF_TAG_RE = _re.compile(r'\s*\[REF:[\d,\s]+\]')
+_REFERENCE_SECTION_RE = _re.compile(r'\n\n참고\s*정보')
+
+
+def _sseEvent(payload: dict) -> str:
+    """SSE data 이벤트 문자열 (orjson: UTF-8 직접 직렬화, 스트리밍 토큰마다 호출)"""
+    return f"data: {orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY).decode()}\n\n"
+
+
 @app.post("/chat/stream")
 async def chatStream(request: ChatRequest):
     """SSE 스트리밍 채팅 엔드포인트 (실시간 LLM 토큰 + TTS 병렬 생성)"""
 
     # 노드 완료 → 다음 단계 시작 메시지 (forward-looking)
     STAGE_MESSAGES = {
-        "clarification_check": "관련 정보를 검색하고 있습니다...",  # → retrieve 시작
+        "preprocess": "관련 정보를 검색하고 있습니다...",           # → retrieve/clarification_check 병렬 시작
         "evidence_gate": "답변을 생성하고 있습니다...",            # → answer_compose 시작
         "answer_compose": "답변을 검증하고 있습니다...",           # → answer_verify 시작
     }
@@ -174,7 +212,7 @@ async def chatStream(request: ChatRequest):
             sessionCtx = sessionStore.getOrCreate(request.sessionId)
 
             # 즉시 첫 상태 이벤트 전송
-            yield f"data: {json.dumps({'event': 'status', 'stage': 'analyzing', 'message': '질문을 분석하고 있습니다...'}, ensure_ascii=False)}\n\n"
+            yield _sseEvent({'event': 'status', 'stage': 'analyzing', 'message': '질문을 분석하고 있습니다...'})
 
             rag = getRagGraph()
             loop = asyncio.get_running_loop()
@@ -221,8 +259,7 @@ async def chatStream(request: ChatRequest):
                     )
                 except Exception as e:
                     clearStreamCallback()
-                    print(f"[파이프라인 에러] {e}")
-                    traceback.print_exc()
+                    logger.warning("[파이프라인 에러] %s", e, exc_info=True)
                     loop.call_soon_threadsafe(
                         progressQueue.put_nowait, ("error", str(e))
                     )
@@ -240,35 +277,34 @@ async def chatStream(request: ChatRequest):
                 if eventType == "stage":
                     if data != lastMsg:
                         lastMsg = data
-                        yield f"data: {json.dumps({'event': 'status', 'stage': 'processing', 'message': data}, ensure_ascii=False)}\n\n"
+                        yield _sseEvent({'event': 'status', 'stage': 'processing', 'message': data})
                 elif eventType == "token":
-                    yield f"data: {json.dumps({'event': 'token', 'text': data}, ensure_ascii=False)}\n\n"
+                    yield _sseEvent({'event': 'token', 'text': data})
                 elif eventType == "result":
                     result = data
                     break
                 elif eventType == "error":
-                    yield f"data: {json.dumps({'event': 'error', 'message': '요청을 처리하는 중 오류가 발생했습니다.'}, ensure_ascii=False)}\n\n"
+                    yield _sseEvent({'event': 'error', 'message': '요청을 처리하는 중 오류가 발생했습니다.'})
                     return
 
             answer = result.get("answer", "응답을 생성할 수 없습니다.")
             needsClarification = result.get("needs_clarification", False)
 
             if needsClarification:
-                yield f"data: {json.dumps({'event': 'clarification', 'answer': answer, 'options': result.get('clarification_options', []), 'type': result.get('clarification_type'), 'originalQuery': result.get('original_query')}, ensure_ascii=False)}\n\n"
+                yield _sseEvent({'event': 'clarification', 'answer': answer, 'options': result.get('clarification_options', []), 'type': result.get('clarification_type'), 'originalQuery': result.get('original_query')})
             elif not gotRealTokens[0]:
                 # FAQ 직접 추출 등 LLM 미사용 → 기존 단어 단위 스트리밍
                 words = answer.split()
                 for i, word in enumerate(words):
                     separator = ' ' if i < len(words) - 1 else ''
-                    yield f"data: {json.dumps({'event': 'token', 'text': word + separator}, ensure_ascii=False)}\n\n"
+                    yield _sseEvent({'event': 'token', 'text': word + separator})
                     if i % 3 == 0:
                         await asyncio.sleep(0.02)
             elif gotRealTokens[0]:
                 # LLM 토큰이 스트리밍되었으나, 검증 후 답변이 크게 변경된 경우
-                import re as _re
                 streamedText = ''.join(streamedTokens)
-                streamedClean = _re.sub(r'\s*\[REF:[\d,\s]+\]', '', streamedText).strip()
-                answerCore = _re.split(r'\n\n참고\s*정보', answer)[0].strip()
+                streamedClean = _STREAM_REF_TAG_RE.sub('', streamedText).strip()
+                answerCore = _REFERENCE_SECTION_RE.split(answer, maxsplit=1)[0].strip()
 
                 # 스트리밍 텍스트와 최종 답변의 첫 50자 비교
                 isReplaced = (
@@ -278,13 +314,13 @@ async def chatStream(request: ChatRequest):
 
                 if isReplaced:
                     # 검증에서 거부됨 → replace 이벤트로 스트리밍 텍스트 초기화 후 재전송
-                    print(f"[스트리밍] 검증 후 답변 변경 감지 → replace 이벤트 전송")
-                    yield f"data: {json.dumps({'event': 'replace'}, ensure_ascii=False)}\n\n"
+                    logger.debug("[스트리밍] 검증 후 답변 변경 감지 → replace 이벤트 전송")
+                    yield _sseEvent({'event': 'replace'})
                     await asyncio.sleep(0.05)
                     words = answer.split()
                     for i, word in enumerate(words):
                         separator = ' ' if i < len(words) - 1 else ''
-                        yield f"data: {json.dumps({'event': 'token', 'text': word + separator}, ensure_ascii=False)}\n\n"
+                        yield _sseEvent({'event': 'token', 'text': word + separator})
                         if i % 3 == 0:
                             await asyncio.sleep(0.02)
 
@@ -296,14 +332,13 @@ async def chatStream(request: ChatRequest):
                 'score': result.get('score'),
                 'sessionId': sessionCtx.session_id,
             }
-            yield f"data: {json.dumps(doneData, ensure_ascii=False)}\n\n"
+            yield _sseEvent(doneData)
 
         except asyncio.TimeoutError:
-            yield f"data: {json.dumps({'event': 'error', 'message': '응답 시간이 초과되었습니다.'}, ensure_ascii=False)}\n\n"
+            yield _sseEvent({'event': 'error', 'message': '응답 시간이 초과되었습니다.'})
         except Exception as e:
-            print(f"[스트리밍 에러] {e}")
-            traceback.print_exc()
-            yield f"data: {json.dumps({'event': 'error', 'message': '요청을 처리하는 중 오류가 발생했습니다.'}, ensure_ascii=False)}\n\n"
+            logger.warning("[스트리밍 에러] %s", e, exc_info=True)
+            yield _sseEvent({'event': 'error', 'message': '요청을 처리하는 중 오류가 발생했습니다.'})
 
     return StreamingResponse(
         eventGenerator(),
@@ -327,9 +362,8 @@ async def chat(request: ChatRequest):
 
         rag = getRagGraph()
 
-        # asyncio.to_thread로 이벤트 루프 블로킹 방지
-        result = await asyncio.to_thread(
-            rag.chat,
+        # 비동기 그래프 실행 (동기 노드는 스레드풀, LLM은 Ollama 병렬 슬롯)
+        result = await rag.chatAsync(
             query=request.message,
             hotel=request.hotelId,
             history=request.history,
@@ -348,8 +382,7 @@ async def chat(request: ChatRequest):
         )
     except Exception as e:
         # 내부 에러 상세는 서버 로그에만 기록, 클라이언트에는 일반 메시지
-        print(f"[에러] {e}")
-        traceback.print_exc()
+        logger.warning("[에러] %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="요청을 처리하는 중 오류가 발생했습니다. 잠시 후 다시 시도해 주세요."
@@ -5,12 +5,18 @@
 - 대화 주제 추적, 검색 결과 캐시
 """
 
+import logging
 import time
 import uuid
 import threading
 from typing import Optional
 from dataclasses import dataclass, field
 
+logger = logging.getLogger(__name__)
+
+# 세션당 메시지 분석 캐시 최대 항목 수 (초과 시 비움)
+MESSAGE_ANALYSIS_CACHE_SIZE = 256
+
 
 @dataclass
 class ConversationContext:
@@ -22,6 +28,7 @@ class ConversationContext:
     last_query: str = ""                      # 이전 질문
     topic_turn_count: int = 0                 # 같은 주제 연속 턴 수
     last_active: float = 0.0                  # 마지막 활동 시각
+    message_analysis: dict = field(default_factory=dict)  # (분석 종류, 메시지) → 결과
 
     def updateTopic(self, topic: Optional[str], hotel: Optional[str]):
         """주제 업데이트
@@ -47,6 +54,21 @@ class ConversationContext:
         self.last_query = query
         self.last_active = time.time()
 
+    def cachedAnalysis(self, kind: str, text: str, analyze):
+        """히스토리 메시지 분석 결과 캐시
+
+        클라이언트는 매 턴 같은 히스토리를 다시 보내므로, 주제/명확화 맥락 등
+        메시지 단위 분석은 처음 한 번만 계산하고 이후 턴에서는 재사용한다.
+        """
+        key = (kind, text)
+        result = self.message_analysis.get(key)
+        if result is None:
+            if len(self.message_analysis) >= MESSAGE_ANALYSIS_CACHE_SIZE:
+                self.message_analysis.clear()
+            result = analyze(text)
+            self.message_analysis[key] = result
+        return result
+
     def reset(self):
         """세션 초기화 (새 대화)"""
         self.current_topic = None
@@ -54,6 +76,7 @@ class ConversationContext:
         self.last_chunks = []
         self.last_query = ""
         self.topic_turn_count = 0
+        self.message_analysis.clear()
 
 
 class SessionStore:
@@ -98,7 +121,7 @@ class SessionStore:
             for sid in expired:
                 del self._sessions[sid]
             if expired:
-                print(f"[세션 정리] {len(expired)}개 만료 세션 삭제, 현재 {len(self._sessions)}개")
+                logger.info("[세션 정리] %s개 만료 세션 삭제, 현재 %s개", len(expired), len(self._sessions))
 
     def _evictOldest(self):
         """가장 오래된 세션 제거 (lock 내부에서 호출)"""
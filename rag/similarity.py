@@ -0,0 +1,117 @@
+"""
+임베딩 유사도 계산 (클라이언트 측 코사인 검색)
+- 시맨틱 캐시 등 Chroma 밖에서 임베딩을 비교할 때 사용
+- numba 설치 시 JIT 커널 (행 단위 병렬 + fastmath), 미설치 시 numpy 행렬곱
+- 상위 k개는 argpartition으로 부분 정렬 (전체 argsort 회피)
+- int8 양자화 저장 지원 (메모리/대역폭 1/4, 쿼리는 float32 유지 → 비대칭 거리)
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba는 선택 의존성 (pip install numba)
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _dotRows(matrix, query):
+        """matrix(n, d) · query(d) → (n,) 유사도 (행 단위 병렬)"""
+        n, d = matrix.shape
+        sims = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            acc = np.float32(0.0)
+            for j in range(d):
+                acc += matrix[i, j] * query[j]
+            sims[i] = acc
+        return sims
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _dotRowsInt8(matrix, scales, query):
+        """int8 matrix(n, d) · float32 query(d) × scales(n) → (n,) 유사도"""
+        n, d = matrix.shape
+        sims = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            acc = np.float32(0.0)
+            for j in range(d):
+                acc += np.float32(matrix[i, j]) * query[j]
+            sims[i] = acc * scales[i]
+        return sims
+else:
+    def _dotRows(matrix, query):
+        """matrix(n, d) · query(d) → (n,) 유사도 (numpy BLAS)"""
+        return matrix @ query
+
+    def _dotRowsInt8(matrix, scales, query):
+        """int8 matrix(n, d) · float32 query(d) × scales(n) → (n,) 유사도"""
+        return (matrix.astype(np.float32) @ query) * scales
+
+
+def topKCosine(query: np.ndarray, matrix: np.ndarray, k: int,
+               scales: np.ndarray = None) -> tuple[np.ndarray, np.ndarray]:
+    """L2 정규화된 임베딩 행렬에서 코사인 유사도 상위 k개 검색
+
+    Args:
+        query: (d,) L2 정규화된 쿼리 임베딩
+        matrix: (n, d) L2 정규화된 임베딩 행렬 (scales 지정 시 quantizeRows의 int8 행렬)
+        k: 반환 개수
+        scales: (n,) int8 행렬의 행별 scale (quantizeRows 반환값)
+
+    Returns:
+        (인덱스 배열, 유사도 배열) — 유사도 내림차순
+    """
+    n = matrix.shape[0]
+    if n == 0 or k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    query = np.ascontiguousarray(query, dtype=np.float32)
+    if scales is not None:
+        sims = _dotRowsInt8(
+            np.ascontiguousarray(matrix, dtype=np.int8),
+            np.ascontiguousarray(scales, dtype=np.float32),
+            query,
+        )
+    else:
+        sims = _dotRows(np.ascontiguousarray(matrix, dtype=np.float32), query)
+
+    k = min(k, n)
+    if k < n:
+        idx = np.argpartition(-sims, k - 1)[:k]
+    else:
+        idx = np.arange(n)
+    idx = idx[np.argsort(-sims[idx])]
+    return idx, sims[idx]
+
+
+def normalizeRows(vectors) -> np.ndarray:
+    """임베딩을 float32 + L2 정규화 (코사인 = 내적이 되도록)"""
+    arr = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(arr, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return arr / norms
+
+
+def quantizeRows(vectors) -> tuple[np.ndarray, np.ndarray]:
+    """L2 정규화 후 행 단위 대칭 int8 양자화
+
+    유사도 오차는 대략 ±0.01 수준이므로, 양자화 행렬로 비교하는 쪽의
+    유사도 임계값은 float32 기준 값보다 약간 여유 있게 보정해서 사용한다.
+
+    Returns:
+        (int8 행렬 (n, d), 행별 scale (n,)) — topKCosine(..., scales=)에 전달
+    """
+    arr = normalizeRows(vectors)
+    scales = np.abs(arr).max(axis=-1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(arr / scales[..., None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def warmupKernels():
+    """JIT 컴파일 선행 (서버 시작 시 호출, 첫 요청 지연 제거)"""
+    dummy = normalizeRows(np.ones((2, 4), dtype=np.float32))
+    topKCosine(dummy[0], dummy, 1)
+    quantized, scales = quantizeRows(dummy)
+    topKCosine(dummy[0], quantized, 1, scales=scales)
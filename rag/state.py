@@ -4,7 +4,12 @@ from typing import TypedDict, Optional
 
 
 class RAGState(TypedDict):
-    """RAG 파이프라인 상태"""
+    """RAG 파이프라인 상태
+
+    노드는 변경한 키만 dict로 반환하고 LangGraph가 기존 상태에 병합한다
+    ({**state, ...} 전체 복사 금지). 모든 키는 단일 노드만 기록하므로
+    별도 reducer 없이 덮어쓰기 병합을 사용한다.
+    """
     # 입력
     query: str
     hotel: Optional[str]
@@ -16,8 +21,11 @@ class RAGState(TypedDict):
     # 전처리 결과
     language: str
     detected_hotel: Optional[str]
+    candidate_hotels: list[str]  # 호텔 미지정 + 복수 호텔 언급 시 후보 목록 (병렬 검색용)
     category: Optional[str]
     normalized_query: str
+    query_lower: str  # normalized_query 소문자 (키워드 매칭 공용, preprocess에서 1회 계산)
+    original_query_lower: str  # 원본 질문 소문자 (모호성 판단용)
     is_valid_query: bool  # 호텔 관련 질문인지 여부
 
     # 명확화 질문 (모호한 질문 처리)
@@ -29,6 +37,7 @@ class RAGState(TypedDict):
 
     # 검색 결과
     retrieved_chunks: list[dict]
+    retrieved_chunks_count: int  # 검색 청크 수 (로그용, 청크 본문 참조 없이 사용)
     top_score: float
     rerank_quality: Optional[str]  # 리랭커 품질 신호 (ok/poor/skipped)
 
@@ -10,11 +10,15 @@ answerVerifyNode에서 사용하는 검증 메서드를 분리.
 - 금지 표현 제거
 """
 
+import logging
 import re
 import json
 import os
 
 from rag.constants import SUSPICIOUS_PATTERNS, HOTEL_INFO
+from rag.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
 
 
 # 설정 파일 경로
@@ -35,6 +39,7 @@ class AnswerVerifier:
     _RE_AGES = re.compile(r'\d+\s*세')
     _RE_FULL_DATES = re.compile(r'\d{4}년\s*\d{1,2}월\s*\d{1,2}일')
     _RE_MONTH_DAYS = re.compile(r'\d{1,2}월\s*\d{1,2}일')
+    _RE_ANY_DIGIT = re.compile(r'\d')
 
     # 사전 컴파일 정규식 — checkResponseQuality 의미없는 패턴
     _MEANINGLESS_PATTERNS = [
@@ -45,6 +50,8 @@ class AnswerVerifier:
         (re.compile(r'！！+'), "반복 느낌표"),
         (re.compile(r'\.\.\.\.+'), "과도한 말줄임"),
     ]
+    # 전체 패턴 단일 alternation: 대부분의 정상 답변은 1회 스캔으로 통과, 매칭 시에만 개별 패턴 확인
+    _RE_MEANINGLESS_ANY = re.compile("|".join(f"(?:{p.pattern})" for p, _ in _MEANINGLESS_PATTERNS))
 
     # 사전 컴파일 정규식 — checkResponseQuality 금지 패턴
     _FORBIDDEN_PATTERNS = [
@@ -59,6 +66,9 @@ class AnswerVerifier:
         (re.compile(r'^\s*-\s*-\s*$', re.IGNORECASE | re.MULTILINE), "빈 내용"),
         (re.compile(r'정보가\s*없습니다.*문의', re.IGNORECASE | re.MULTILINE), "잘못된 안내"),
     ]
+    _RE_FORBIDDEN_ANY = re.compile(
+        "|".join(f"(?:{p.pattern})" for p, _ in _FORBIDDEN_PATTERNS), re.IGNORECASE | re.MULTILINE
+    )
 
     # 카테고리별 확장 키워드 (관련성 검증 + Fallback 주제 검증 공용)
     CATEGORY_KEYWORD_MAP = {
@@ -77,6 +87,13 @@ class AnswerVerifier:
         "패키지": ["패키지", "package", "프로모션", "상품", "숙박권"],
         "이벤트": ["이벤트", "event", "행사", "프로모션", "할인", "특가"],
     }
+    # 소문자 확장 키워드 (청크 본문 포함 검사용, 요청마다 kw.lower() 반복 방지)
+    CATEGORY_KEYWORD_MAP_LOWER = {
+        category: tuple(kw.lower() for kw in keywords)
+        for category, keywords in CATEGORY_KEYWORD_MAP.items()
+    }
+    # 질문 → 카테고리 매칭 오토마톤 (카테고리 정의 순서 유지)
+    _CATEGORY_KEYWORD_MATCHER = KeywordMatcher(CATEGORY_KEYWORD_MAP)
 
     # 사전 컴파일 정규식 — checkTransportationHallucination
     _TRANSPORT_PATTERNS = [
@@ -86,6 +103,9 @@ class AnswerVerifier:
         (re.compile(r'[가-힣]+역에서\s*[가-힣]+역'), "지하철 경로"),
         (re.compile(r'환승|갈아타'), "환승 안내"),
     ]
+    # 주제 이탈 검사: 답변 내 교통 키워드 / 교통 관련 질문 판별 키워드
+    _OFFTOPIC_TRANSPORT_KEYWORDS = ("지하철", "버스", "택시", "노선", "호선", "교통편", "환승")
+    _TRANSPORT_QUERY_KEYWORDS = ("교통", "오시는", "셔틀", "공항에서", "어떻게 가")
 
     # 네비게이션/UI 요소 패턴 (raw dump 감지용)
     _NAV_ELEMENTS = [
@@ -106,9 +126,84 @@ class AnswerVerifier:
     # 과도한 영문 대문자 블록 (RESTAURANT=10, INFORMATION=11 등 호텔 도메인 단어 허용)
     _RE_UPPERCASE_BLOCK = re.compile(r'[A-Z]{20,}')
 
+    # 사전 컴파일 정규식 — 문자 종류 / 형식 감지
+    _RE_HANGUL = re.compile(r'[가-힣]')
+    # 중국어/일본어 문자를 1회 스캔으로 분류 (lastgroup으로 문자 종류 판별)
+    _RE_FOREIGN_SCRIPT = re.compile(r'(?P<chinese>[\u4e00-\u9fff])|(?P<japanese>[\u3040-\u30ff])')
+    _RE_BULLET = re.compile(r'[-•]\s*[가-힣]')
+
+    # 사전 컴파일 정규식 — 문장 분리 / 공백 정리
+    _RE_SENTENCE_SPLIT = re.compile(r'(?<=[.!?다요])\s+')
+    _RE_LINE_SPLIT = re.compile(r'(?<=[.!?\n])\s*')
+    _RE_EXCESS_NEWLINES = re.compile(r'\n{3,}')
+    _RE_TRAILING_SPACES = re.compile(r'[ \t]+\n')
+
+    # 사전 컴파일 정규식 — checkResponseQuality 한글 비율 정규화
+    _RE_TIME_RANGES = re.compile(r'\d{1,2}:\d{2}\s*[-~]\s*\d{1,2}:\d{2}')
+    _RE_BREAK_TIME = re.compile(r'BREAK\s*TIME', re.IGNORECASE)
+    _HOTEL_TERMS = [
+        'KIDS', 'Superior', 'Deluxe', 'Suite', 'Premier', 'Standard',
+        'Twin', 'Double', 'King', 'Queen', 'Pool', 'Spa', 'Fitness',
+        'Andish', 'Zerovity', 'Aria', 'Constans', 'Eat2O',
+        'VAT', 'URL', 'http', 'https', 'do', 'josunhotel', 'com',
+    ]
+    _RE_HOTEL_TERMS = re.compile(r'\b(?:' + '|'.join(_HOTEL_TERMS) + r')\b', re.IGNORECASE)
+    _RE_SYMBOLS = re.compile(r'[\d\-:~/.,@#$%^&*()_+=\[\]{}|\\<>]')
+
+    # 사전 컴파일 정규식 — extractDirectAnswer
+    _RE_FAQ_ANSWER = re.compile(r'A:\s*(.+?)(?=\nQ:|\Z)', re.DOTALL)
+    _RE_RESTAURANT_HEADER = re.compile(r'레스토랑[:\s]+([가-힣a-zA-Z\'\s]+)')
+    _RE_FACILITY_HEADER = re.compile(r'([가-힣]+(?:\s+[가-힣]+)*)\s*(?:안내|상세)')
+    _RE_MENU_DESC = re.compile(r'(?:BUFFET|뷔페|시푸드|Seafood|그릴|Grill)[^\n]*', re.IGNORECASE)
+    _RE_OPERATION_HOURS = re.compile(
+        r'(?:HOURS?\s*(?:OF\s*)?OPERATION|운영\s*시간)\s*[:：]?\s*(\d{1,2}:\d{2}\s*[-~]\s*\d{1,2}:\d{2})',
+        re.IGNORECASE
+    )
+    _RE_LOCATION = re.compile(r'(?:LOCATION|위치)\s*[:：]?\s*(.+?)(?:\n|PERIOD|HOURS|INQUIRY|$)', re.IGNORECASE)
+    _RE_INQUIRY = re.compile(r'(?:INQUIRY|문의/?예약|문의)\s*[:：]?\s*([\d\.\-\s,]+)', re.IGNORECASE)
+
+    # 사전 컴파일 정규식 — checkHallucination / checkProperNounHallucination
+    _SUSPICIOUS_PATTERNS = [(re.compile(pattern), issueType) for pattern, issueType in SUSPICIOUS_PATTERNS]
+    _RE_NUM_SEPARATORS = re.compile(r'[\s,]')
+    # 컨텍스트 쉼표/공백 제거용 변환표 (str.translate 1회 스캔)
+    _COMPACT_TABLE = str.maketrans('', '', ', ')
+    # 한글 고유명사 최대 4단어 제한 (문장 전체 greedy 매칭 방지)
+    _RE_BILINGUAL_NAME = re.compile(r'([가-힣]{2,}(?:\s+[가-힣]+){0,3})\s*\(([A-Za-z][A-Za-z\s&\'-]+)\)')
+    _RE_QUOTED_NAME = re.compile(r"['\"]([가-힣A-Za-z][가-힣A-Za-z\s&\'-]+)['\"]")
+    _RE_FACILITY_NAME = re.compile(
+        r'([가-힣A-Za-z]{2,}(?:\s+[가-힣A-Za-z]+)*)\s*(?:레스토랑|식당|라운지|풀|센터|카페|바|클럽|스파|사우나)'
+    )
+
+    # 사전 컴파일 정규식 — 전화번호/URL/가격 검증
+    _RE_NON_DIGITS = re.compile(r'[^\d]')
+    _RE_URLS = re.compile(r'https?://[^\s\)\]>\"\']+|www\.[^\s\)\]>\"\']+')
+    _RE_PRICE_AMOUNTS = re.compile(r'([\d,]+)\s*원')
+
+    # 고유명사 후보에서 제외할 접속사/일반어/지역명
+    _COMMON_WORDS = frozenset({
+        "하지만", "그리고", "또한", "그래서", "따라서", "다만", "그러나", "그런데",
+        "그렇게", "이렇게", "그곳에", "이곳에", "해당", "물론", "참고로", "특히",
+        "다양한", "일반적", "기본적", "대표적", "실내외", "실내", "실외",
+        "해운대", "강남", "판교", "명동", "제주", "부산", "서울", "인천",
+        "투숙객", "고객님", "이용객", "방문객",
+    })
+    # 알려진 호텔 URL 도메인
+    _KNOWN_DOMAINS = frozenset({
+        "josunhotel.com", "jpg.josunhotel.com", "gjb.josunhotel.com",
+        "gjj.josunhotel.com", "les.josunhotel.com", "grp.josunhotel.com",
+    })
+
     def __init__(self):
         self.knownNames = self._loadKnownNames()
-        self.forbiddenPhrases = self._loadForbiddenPatterns()
+        # 고유명사 검사용 화이트리스트 오토마톤 (명사마다 전체 이름 부분 문자열 스캔 → 1회 선형 탐색)
+        self._knownNamesMatcher = KeywordMatcher(self.knownNames)
+        forbiddenPatterns = self._loadForbiddenPatterns()
+        self.forbiddenPhrases = [re.compile(p, re.IGNORECASE) for p in forbiddenPatterns]
+        # 사전 판정용 통합 패턴: 아무것도 매칭되지 않으면 패턴별 치환 생략
+        # (치환 순서에 의존하는 패턴이 있어 제거 자체는 순차 적용 유지)
+        self._forbiddenPhrasesAny = re.compile(
+            "|".join(f"(?:{p})" for p in forbiddenPatterns), re.IGNORECASE
+        ) if forbiddenPatterns else None
 
     def _loadKnownNames(self) -> set:
         """고유명사 화이트리스트 로딩 (data/config/known_names.json)"""
@@ -146,21 +241,21 @@ class AnswerVerifier:
         # 1) 네비게이션 요소 2개 이상 동시 출현
         navMatches = self._RE_NAV_ELEMENTS.findall(text)
         if len(navMatches) >= 2:
-            print(f"[isRawDump] 네비게이션 요소 {len(navMatches)}개 감지: {navMatches[:3]}")
+            logger.debug("[isRawDump] 네비게이션 요소 %s개 감지: %s", len(navMatches), navMatches[:3])
             return True
 
         # 2) 문장 완결성 검사: 한글 30자 이상인데 종결어미 0개이고 불릿/FAQ 형식도 아님
-        koreanChars = len(re.findall(r'[가-힣]', text))
+        koreanChars = len(self._RE_HANGUL.findall(text))
         hasSentenceEnding = bool(self._RE_SENTENCE_ENDINGS.search(text))
-        isBulletFormat = bool(re.search(r'[-•]\s*[가-힣]', text))
+        isBulletFormat = bool(self._RE_BULLET.search(text))
         isFaqFormat = "Q:" in text or "A:" in text
         if koreanChars >= 30 and not hasSentenceEnding and not isBulletFormat and not isFaqFormat:
-            print(f"[isRawDump] 문장 미완결: 한글 {koreanChars}자, 종결어미 없음")
+            logger.debug("[isRawDump] 문장 미완결: 한글 %s자, 종결어미 없음", koreanChars)
             return True
 
         # 3) 과도한 영문 대문자 블록 (10자 이상 연속)
         if self._RE_UPPERCASE_BLOCK.search(text):
-            print(f"[isRawDump] 과도한 영문 대문자 블록 감지")
+            logger.debug("[isRawDump] 과도한 영문 대문자 블록 감지")
             return True
 
         return False
@@ -169,20 +264,13 @@ class AnswerVerifier:
         """텍스트에서 네비게이션/UI 요소 제거"""
         cleaned = self._RE_NAV_ELEMENTS.sub('', text)
         # 정리: 빈 줄 축소, 양쪽 공백 제거
-        cleaned = re.sub(r'\n{3,}', '\n\n', cleaned)
-        cleaned = re.sub(r'[ \t]+\n', '\n', cleaned)
+        cleaned = self._RE_EXCESS_NEWLINES.sub('\n\n', cleaned)
+        cleaned = self._RE_TRAILING_SPACES.sub('\n', cleaned)
         return cleaned.strip()
 
     def extractQueryKeywords(self, query: str) -> list[str]:
-        """질문에서 핵심 키워드 추출 (CATEGORY_KEYWORD_MAP 기반 루프)"""
-        queryLower = query.lower()
-        foundKeywords = []
-
-        for category, keywords in self.CATEGORY_KEYWORD_MAP.items():
-            if any(kw.lower() in queryLower for kw in keywords):
-                foundKeywords.append(category)
-
-        return foundKeywords
+        """질문에서 핵심 키워드 추출 (CATEGORY_KEYWORD_MAP 카테고리, 정의 순서)"""
+        return self._CATEGORY_KEYWORD_MATCHER.matchedGroups(query.lower())
 
     def checkQueryContextRelevance(self, query: str, chunks: list) -> tuple[bool, str]:
         """질문 핵심 키워드가 검색된 청크에 있는지 검증"""
@@ -191,10 +279,15 @@ class AnswerVerifier:
         if not queryKeywords:
             return True, ""
 
-        chunkTexts = " ".join([c.get("text", "") for c in chunks[:5]])
-        chunkTextsLower = chunkTexts.lower()
-        chunkCategories = [c.get("metadata", {}).get("category", "").lower() for c in chunks[:5]]
-        chunkPageTypes = [c.get("metadata", {}).get("page_type", "").lower() for c in chunks[:5]]
+        topChunks = chunks[:5]
+        chunkCategories = []
+        chunkPageTypes = []
+        for c in topChunks:
+            metadata = c.get("metadata", {})
+            chunkCategories.append(metadata.get("category", "").lower())
+            chunkPageTypes.append(metadata.get("page_type", "").lower())
+        # 본문 결합/소문자화는 메타데이터로 판정되지 않는 키워드가 있을 때만 수행
+        chunkTextsLower = None
 
         for keyword in queryKeywords:
             keywordFound = False
@@ -211,14 +304,16 @@ class AnswerVerifier:
                         break
 
             if not keywordFound:
-                expandedKeywords = self.CATEGORY_KEYWORD_MAP.get(keyword, [keyword])
+                if chunkTextsLower is None:
+                    chunkTextsLower = " ".join([c.get("text", "") for c in topChunks]).lower()
+                expandedKeywords = self.CATEGORY_KEYWORD_MAP_LOWER.get(keyword, (keyword.lower(),))
                 for kw in expandedKeywords:
-                    if kw.lower() in chunkTextsLower:
+                    if kw in chunkTextsLower:
                         keywordFound = True
                         break
 
             if not keywordFound:
-                print(f"[관련성 검증] '{keyword}' 관련 정보 미발견 → 관련성 부족 판정")
+                logger.debug("[관련성 검증] '%s' 관련 정보 미발견 → 관련성 부족 판정", keyword)
                 return False, f"'{keyword}' 관련 정보가 검색 결과에 없습니다"
 
         return True, ""
@@ -226,6 +321,9 @@ class AnswerVerifier:
     def extractNumbers(self, text: str) -> set[str]:
         """텍스트에서 숫자 정보 추출 (가격, 시간, 전화번호, 층수, 날짜)"""
         numbers = set()
+        # 모든 패턴이 숫자를 포함 → 숫자가 없으면 10개 패턴 스캔 생략
+        if not self._RE_ANY_DIGIT.search(text):
+            return numbers
         numbers.update(self._RE_PRICES.findall(text))
         numbers.update(self._RE_TIMES.findall(text))
         numbers.update(self._RE_PHONES.findall(text))
@@ -243,52 +341,49 @@ class AnswerVerifier:
         issues = []
 
         # 1. 비정상 문자 탐지
-        chineseChars = re.findall(r'[\u4e00-\u9fff]', answer)
-        if len(chineseChars) > 2:
-            issues.append(f"비정상: 중국어 문자 포함 ({len(chineseChars)}자)")
-
-        japaneseChars = re.findall(r'[\u3040-\u30ff]', answer)
-        if len(japaneseChars) > 2:
-            issues.append(f"비정상: 일본어 문자 포함 ({len(japaneseChars)}자)")
+        scriptCounts = {"chinese": 0, "japanese": 0}
+        for match in self._RE_FOREIGN_SCRIPT.finditer(answer):
+            scriptCounts[match.lastgroup] += 1
+        if scriptCounts["chinese"] > 2:
+            issues.append(f"비정상: 중국어 문자 포함 ({scriptCounts['chinese']}자)")
+        if scriptCounts["japanese"] > 2:
+            issues.append(f"비정상: 일본어 문자 포함 ({scriptCounts['japanese']}자)")
 
         # 2. 한글 비율 검사
-        normalizedAnswer = answer
-        normalizedAnswer = re.sub(r'\d{1,2}:\d{2}\s*[-~]\s*\d{1,2}:\d{2}', '', normalizedAnswer)
-        normalizedAnswer = re.sub(r'\d{1,2}:\d{2}', '', normalizedAnswer)
-        normalizedAnswer = re.sub(r'BREAK\s*TIME', '', normalizedAnswer, flags=re.IGNORECASE)
-
-        hotelTerms = [
-            'KIDS', 'Superior', 'Deluxe', 'Suite', 'Premier', 'Standard',
-            'Twin', 'Double', 'King', 'Queen', 'Pool', 'Spa', 'Fitness',
-            'Andish', 'Zerovity', 'Aria', 'Constans', 'Eat2O',
-            'VAT', 'URL', 'http', 'https', 'do', 'josunhotel', 'com',
-        ]
-        for term in hotelTerms:
-            normalizedAnswer = re.sub(rf'\b{term}\b', '', normalizedAnswer, flags=re.IGNORECASE)
-
-        normalizedAnswer = re.sub(r'[\d\-:~/.,@#$%^&*()_+=\[\]{}|\\<>]', '', normalizedAnswer)
-
-        koreanChars = len(re.findall(r'[가-힣]', normalizedAnswer))
-        totalChars = len(normalizedAnswer.replace(' ', '').replace('\n', ''))
-
-        if totalChars > 5 and koreanChars / totalChars < 0.25:
-            issues.append(f"비정상: 한글 비율 낮음 ({koreanChars}/{totalChars})")
-
-        # 3. 의미 없는 패턴 탐지 (사전 컴파일 사용)
-        for compiledPattern, desc in self._MEANINGLESS_PATTERNS:
-            if compiledPattern.search(answer):
-                issues.append(f"비정상: {desc}")
-                break
+        # 정규화는 한글이 아닌 문자만 제거 → 한글 수는 그대로, 비율은 원문 이상.
+        # 원문 기준으로 이미 통과하면 정규화(5회 치환) 생략
+        koreanCount = len(self._RE_HANGUL.findall(answer))
+        rawTotalChars = len(answer.replace(' ', '').replace('\n', ''))
+        if rawTotalChars > 5 and koreanCount / rawTotalChars < 0.25:
+            normalizedAnswer = answer
+            normalizedAnswer = self._RE_TIME_RANGES.sub('', normalizedAnswer)
+            normalizedAnswer = self._RE_TIMES.sub('', normalizedAnswer)
+            normalizedAnswer = self._RE_BREAK_TIME.sub('', normalizedAnswer)
+            # 호텔 도메인 영문 용어 제거 (단일 alternation 1회 치환)
+            normalizedAnswer = self._RE_HOTEL_TERMS.sub('', normalizedAnswer)
+            normalizedAnswer = self._RE_SYMBOLS.sub('', normalizedAnswer)
+
+            totalChars = len(normalizedAnswer.replace(' ', '').replace('\n', ''))
+            if totalChars > 5 and koreanCount / totalChars < 0.25:
+                issues.append(f"비정상: 한글 비율 낮음 ({koreanCount}/{totalChars})")
+
+        # 3. 의미 없는 패턴 탐지 (통합 패턴 매칭 시에만 개별 패턴으로 사유 판별)
+        if self._RE_MEANINGLESS_ANY.search(answer):
+            for compiledPattern, desc in self._MEANINGLESS_PATTERNS:
+                if compiledPattern.search(answer):
+                    issues.append(f"비정상: {desc}")
+                    break
 
         # 4. 답변이 너무 짧거나 비어있음
         cleanAnswer = answer.strip()
         if len(cleanAnswer) < 5:
             issues.append("비정상: 답변이 너무 짧음")
 
-        # 5. 금지 패턴 탐지 (사전 컴파일 사용)
-        for compiledPattern, desc in self._FORBIDDEN_PATTERNS:
-            if compiledPattern.search(answer):
-                issues.append(f"금지패턴: {desc}")
+        # 5. 금지 패턴 탐지 (통합 패턴 매칭 시에만 개별 패턴으로 사유 수집)
+        if self._RE_FORBIDDEN_ANY.search(answer):
+            for compiledPattern, desc in self._FORBIDDEN_PATTERNS:
+                if compiledPattern.search(answer):
+                    issues.append(f"금지패턴: {desc}")
 
         # 6. 네비게이션/UI 요소 감지 (raw dump 방어)
         navMatches = self._RE_NAV_ELEMENTS.findall(answer)
@@ -296,9 +391,8 @@ class AnswerVerifier:
             issues.append(f"비정상: 네비게이션/UI 요소 포함 ({len(navMatches)}개)")
 
         # 7. 비문장형 답변 감지 (한글 50자 이상인데 종결어미 없는 단어 나열)
-        koreanCount = len(re.findall(r'[가-힣]', answer))
         hasEnding = bool(self._RE_SENTENCE_ENDINGS.search(answer))
-        isBullet = bool(re.search(r'[-•]\s*[가-힣]', answer))
+        isBullet = bool(self._RE_BULLET.search(answer))
         isFaq = "Q:" in answer or "A:" in answer
         if koreanCount >= 50 and not hasEnding and not isBullet and not isFaq:
             issues.append("비정상: 비문장형 답변 (종결어미 없는 단어 나열)")
@@ -311,7 +405,7 @@ class AnswerVerifier:
 
         # 1. Q&A 형식에서 A: 부분 추출 (다음 Q: 또는 텍스트 끝까지)
         if "A:" in topText:
-            aMatch = re.search(r'A:\s*(.+?)(?=\nQ:|\Z)', topText, re.DOTALL)
+            aMatch = self._RE_FAQ_ANSWER.search(topText)
             if aMatch:
                 directAnswer = aMatch.group(1).strip()
 
@@ -320,39 +414,33 @@ class AnswerVerifier:
             parts = []
 
             facilityName = ""
-            headerMatch = re.search(r'레스토랑[:\s]+([가-힣a-zA-Z\'\s]+)', topText)
+            headerMatch = self._RE_RESTAURANT_HEADER.search(topText)
             if headerMatch:
                 facilityName = headerMatch.group(1).strip()
             if not facilityName:
-                headerMatch = re.search(r'([가-힣]+(?:\s+[가-힣]+)*)\s*(?:안내|상세)', topText)
+                headerMatch = self._RE_FACILITY_HEADER.search(topText)
                 if headerMatch:
                     facilityName = headerMatch.group(1).strip()
 
             if facilityName:
                 parts.append(facilityName)
 
-            descMatch = re.search(r'(?:BUFFET|뷔페|시푸드|Seafood|그릴|Grill)[^\n]*', topText, re.IGNORECASE)
+            descMatch = self._RE_MENU_DESC.search(topText)
             if descMatch:
                 parts.append(descMatch.group(0).strip().rstrip('.'))
 
-            timeMatch = re.search(
-                r'(?:HOURS?\s*(?:OF\s*)?OPERATION|운영\s*시간)\s*[:：]?\s*(\d{1,2}:\d{2}\s*[-~]\s*\d{1,2}:\d{2})',
-                topText, re.IGNORECASE
-            )
+            timeMatch = self._RE_OPERATION_HOURS.search(topText)
             if timeMatch:
                 hours = timeMatch.group(1).strip()
                 parts.append(f"운영시간: {hours}")
 
-            locationMatch = re.search(
-                r'(?:LOCATION|위치)\s*[:：]?\s*(.+?)(?:\n|PERIOD|HOURS|INQUIRY|$)',
-                topText, re.IGNORECASE
-            )
+            locationMatch = self._RE_LOCATION.search(topText)
             if locationMatch:
                 loc = locationMatch.group(1).strip().rstrip('-').strip()
                 if loc:
                     parts.append(f"위치: {loc}")
 
-            inquiryMatch = re.search(r'(?:INQUIRY|문의/?예약|문의)\s*[:：]?\s*([\d\.\-\s,]+)', topText, re.IGNORECASE)
+            inquiryMatch = self._RE_INQUIRY.search(topText)
             if inquiryMatch:
                 phone = inquiryMatch.group(1).strip()
                 parts.append(f"문의: {phone}")
@@ -379,44 +467,38 @@ class AnswerVerifier:
                 if match not in context:
                     issues.append(f"교통편 날조: '{match}' ({desc}) — 컨텍스트에 없음")
 
-        if issues:
-            sentences = re.split(r'(?<=[.!?다요])\s+', cleanedAnswer)
-            filteredSentences = []
-            for sentence in sentences:
-                hasTransportFabrication = False
-                for compiledPattern, _ in self._TRANSPORT_PATTERNS:
-                    matches = compiledPattern.findall(sentence)
-                    for match in matches:
-                        if match not in context:
-                            hasTransportFabrication = True
-                            break
-                    if hasTransportFabrication:
-                        break
-                if not hasTransportFabrication:
-                    filteredSentences.append(sentence)
-
-            cleanedAnswer = " ".join(filteredSentences).strip()
-            print(f"[교통편 날조 검증] 감지: {issues}")
+        hasFabrication = bool(issues)
+        if hasFabrication:
+            logger.debug("[교통편 날조 검증] 감지: %s", issues)
 
         # 주제 이탈 검사
         queryLower = query.lower()
-        transportKeywords = ["지하철", "버스", "택시", "노선", "호선", "교통편", "환승"]
-        queryIsTransport = any(kw in queryLower for kw in ["교통", "오시는", "셔틀", "공항에서", "어떻게 가"])
-
-        if not queryIsTransport:
-            for kw in transportKeywords:
-                if kw in answer and kw not in context:
-                    issues.append(f"주제 이탈: 질문 '{query[:20]}...'에 교통 정보 혼입")
-                    sentences = re.split(r'(?<=[.!?다요])\s+', cleanedAnswer)
-                    cleanedAnswer = " ".join(
-                        s for s in sentences
-                        if not any(tk in s for tk in transportKeywords)
-                    ).strip()
-                    break
+        queryIsTransport = any(kw in queryLower for kw in self._TRANSPORT_QUERY_KEYWORDS)
+        isOffTopic = not queryIsTransport and any(
+            kw in answer and kw not in context for kw in self._OFFTOPIC_TRANSPORT_KEYWORDS
+        )
+        if isOffTopic:
+            issues.append(f"주제 이탈: 질문 '{query[:20]}...'에 교통 정보 혼입")
+
+        # 날조 문장 + (주제 이탈 시) 교통 키워드 문장을 한 번의 분리/결합으로 제거
+        if hasFabrication or isOffTopic:
+            cleanedAnswer = " ".join(
+                sentence for sentence in self._RE_SENTENCE_SPLIT.split(answer)
+                if not (hasFabrication and self._hasTransportFabrication(sentence, context))
+                and not (isOffTopic and any(kw in sentence for kw in self._OFFTOPIC_TRANSPORT_KEYWORDS))
+            ).strip()
 
         passed = len(issues) == 0
         return passed, issues, cleanedAnswer
 
+    def _hasTransportFabrication(self, sentence: str, context: str) -> bool:
+        """문장에 컨텍스트에 없는 교통편/노선 정보가 있는지"""
+        return any(
+            match not in context
+            for compiledPattern, _ in self._TRANSPORT_PATTERNS
+            for match in compiledPattern.findall(sentence)
+        )
+
     def checkHallucination(self, answer: str, context: str) -> tuple[bool, list[str]]:
         """숫자 할루시네이션 검사"""
         issues = []
@@ -425,54 +507,43 @@ class AnswerVerifier:
         contextNumbers = self.extractNumbers(context)
 
         # 의심 패턴 검사 (constants.py에서 관리, chunk 원본 대조)
-        for pattern, issueType in SUSPICIOUS_PATTERNS:
-            match = re.search(pattern, answer)
+        for compiledPattern, issueType in self._SUSPICIOUS_PATTERNS:
+            match = compiledPattern.search(answer)
             if match:
                 if match.group() not in context:
                     issues.append(f"의심: {issueType} 발견")
 
-        # 답변에만 있고 컨텍스트에 없는 숫자 검사
+        # 답변에만 있고 컨텍스트에 없는 숫자 검사 (컨텍스트 측 정규화는 1회만)
+        contextNormNumbers = {self._RE_NUM_SEPARATORS.sub('', ctxNum) for ctxNum in contextNumbers}
+        compactContext = None
         for num in answerNumbers:
-            numNorm = re.sub(r'[\s,]', '', num)
-            found = False
-            for ctxNum in contextNumbers:
-                ctxNorm = re.sub(r'[\s,]', '', ctxNum)
-                if numNorm in ctxNorm or ctxNorm in numNorm:
-                    found = True
-                    break
+            numNorm = self._RE_NUM_SEPARATORS.sub('', num)
+            # 대부분 정규화 후 정확히 일치 → 집합 조회로 먼저 판정, 불일치 시에만 부분 문자열 비교
+            found = numNorm in contextNormNumbers or any(
+                numNorm in ctxNorm or ctxNorm in numNorm
+                for ctxNorm in contextNormNumbers
+            )
 
             if not found and len(numNorm) > 2:
-                if numNorm not in context.replace(',', '').replace(' ', ''):
+                if compactContext is None:
+                    compactContext = context.translate(self._COMPACT_TABLE)
+                if numNorm not in compactContext:
                     issues.append(f"검증실패: '{num}' - 컨텍스트에 없음")
 
         return len(issues) == 0, issues
 
-    def checkProperNounHallucination(self, answer: str, context: str) -> tuple[bool, list[str], str]:
-        """고유명사 할루시네이션 검사"""
+    def checkProperNounHallucination(self, answer: str, context: str,
+                                     contextLower: str = None) -> tuple[bool, list[str], str]:
+        """고유명사 할루시네이션 검사 (contextLower: 호출 측에서 이미 계산한 소문자 컨텍스트)"""
         issues = []
         cleanedAnswer = answer
 
-        # 한글 고유명사 최대 4단어 제한 (문장 전체 greedy 매칭 방지)
-        bilingualPattern = re.findall(
-            r'([가-힣]{2,}(?:\s+[가-힣]+){0,3})\s*\(([A-Za-z][A-Za-z\s&\'-]+)\)',
-            answer
-        )
-        quotedNames = re.findall(r"['\"]([가-힣A-Za-z][가-힣A-Za-z\s&\'-]+)['\"]", answer)
-        facilityPattern = re.findall(
-            r'([가-힣A-Za-z]{2,}(?:\s+[가-힣A-Za-z]+)*)\s*(?:레스토랑|식당|라운지|풀|센터|카페|바|클럽|스파|사우나)',
-            answer
-        )
+        bilingualPattern = self._RE_BILINGUAL_NAME.findall(answer)
+        quotedNames = self._RE_QUOTED_NAME.findall(answer)
+        facilityPattern = self._RE_FACILITY_NAME.findall(answer)
 
         properNouns = set()
 
-        commonWords = {
-            "하지만", "그리고", "또한", "그래서", "따라서", "다만", "그러나", "그런데",
-            "그렇게", "이렇게", "그곳에", "이곳에", "해당", "물론", "참고로", "특히",
-            "다양한", "일반적", "기본적", "대표적", "실내외", "실내", "실외",
-            "해운대", "강남", "판교", "명동", "제주", "부산", "서울", "인천",
-            "투숙객", "고객님", "이용객", "방문객",
-        }
-
         for koName, enName in bilingualPattern:
             properNouns.add(koName.strip())
             properNouns.add(enName.strip())
@@ -480,31 +551,38 @@ class AnswerVerifier:
             if len(name) >= 2:
                 properNouns.add(name.strip())
         for name in facilityPattern:
-            if len(name) >= 2 and name.strip() not in commonWords:
+            if len(name) >= 2 and name.strip() not in self._COMMON_WORDS:
                 properNouns.add(name.strip())
 
-        contextLower = context.lower()
+        if contextLower is None:
+            contextLower = context.lower()
+        # 문장 분리/소문자화는 첫 미검증 명사에서 1회만 수행, 이후 명사는 남은 문장 목록만 걸러냄
+        sentences = None
 
         for noun in properNouns:
-            nounLower = noun.lower()
-
-            if any(known.lower() == nounLower or known.lower() in nounLower for known in self.knownNames):
+            # 2글자 이하는 검사 제외 (화이트리스트 스캔 전에 판정)
+            if len(noun) <= 2:
                 continue
 
-            if len(noun) <= 2:
+            nounLower = noun.lower()
+            if self._knownNamesMatcher.matches(nounLower):
                 continue
 
             if nounLower not in contextLower:
                 issues.append(f"고유명사 미검증: '{noun}' — 컨텍스트에 없음")
 
-                sentences = re.split(r'(?<=[.!?\n])\s*', cleanedAnswer)
+                if sentences is None:
+                    sentences = [(s, s.lower()) for s in self._RE_LINE_SPLIT.split(answer) if s]
                 filteredSentences = []
-                for sentence in sentences:
-                    if noun in sentence or nounLower in sentence.lower():
+                for sentence, sentenceLower in sentences:
+                    if noun in sentence or nounLower in sentenceLower:
                         issues.append(f"할루시네이션 문장 제거: '{sentence[:60]}...'")
                     else:
-                        filteredSentences.append(sentence)
-                cleanedAnswer = " ".join(filteredSentences).strip()
+                        filteredSentences.append((sentence, sentenceLower))
+                sentences = filteredSentences
+
+        if sentences is not None:
+            cleanedAnswer = " ".join(s for s, _ in sentences).strip()
 
         passed = len(issues) == 0
         return passed, issues, cleanedAnswer
@@ -541,7 +619,7 @@ class AnswerVerifier:
                 issues.append(f"호텔 교차 오염: '{otherName}' 이(가) 답변에 포함 (대상: {currentHotelName})")
 
                 # 오염된 문장 제거
-                sentences = re.split(r'(?<=[.!?다요])\s+', cleanedAnswer)
+                sentences = self._RE_SENTENCE_SPLIT.split(cleanedAnswer)
                 filteredSentences = []
                 for sentence in sentences:
                     if otherName.lower() not in sentence.lower():
@@ -569,26 +647,25 @@ class AnswerVerifier:
         cleanedAnswer = answer
 
         # 전화번호 패턴 (다양한 형식)
-        phonePattern = r'\d{2,4}[-.]?\d{3,4}[-.]?\d{4}'
-        answerPhones = re.findall(phonePattern, answer)
+        answerPhones = self._RE_PHONES.findall(answer)
 
         if not answerPhones:
             return True, [], answer
 
-        contextPhones = re.findall(phonePattern, context)
+        contextPhones = self._RE_PHONES.findall(context)
         contextPhoneDigits = set()
         for ctxPhone in contextPhones:
-            contextPhoneDigits.add(re.sub(r'[^\d]', '', ctxPhone))
+            contextPhoneDigits.add(self._RE_NON_DIGITS.sub('', ctxPhone))
 
         # 알려진 호텔 전화번호 (화이트리스트)
         knownPhoneDigits = set()
         for info in HOTEL_INFO.values():
-            phoneDigits = re.sub(r'[^\d]', '', info.get("phone", ""))
+            phoneDigits = self._RE_NON_DIGITS.sub('', info.get("phone", ""))
             if phoneDigits:
                 knownPhoneDigits.add(phoneDigits)
 
         for phone in answerPhones:
-            phoneDigits = re.sub(r'[^\d]', '', phone)
+            phoneDigits = self._RE_NON_DIGITS.sub('', phone)
             if len(phoneDigits) < 8:
                 continue  # 짧은 숫자는 전화번호가 아닐 수 있음
 
@@ -599,7 +676,7 @@ class AnswerVerifier:
             if not inContext and not isKnown:
                 issues.append(f"전화번호 할루시네이션: '{phone}' — 컨텍스트에 없음")
                 # 전화번호가 포함된 문장 제거
-                sentences = re.split(r'(?<=[.!?\n])\s*', cleanedAnswer)
+                sentences = self._RE_LINE_SPLIT.split(cleanedAnswer)
                 filteredSentences = []
                 for sentence in sentences:
                     if phone not in sentence:
@@ -618,16 +695,12 @@ class AnswerVerifier:
         cleanedAnswer = answer
 
         # URL 패턴
-        urlPattern = r'https?://[^\s\)\]>\"\']+|www\.[^\s\)\]>\"\']+'
-        answerUrls = re.findall(urlPattern, answer)
+        answerUrls = self._RE_URLS.findall(answer)
 
         if not answerUrls:
             return True, [], answer
 
-        contextUrls = set(re.findall(urlPattern, context))
-        # 알려진 호텔 URL 도메인
-        knownDomains = {"josunhotel.com", "jpg.josunhotel.com", "gjb.josunhotel.com",
-                        "gjj.josunhotel.com", "les.josunhotel.com", "grp.josunhotel.com"}
+        contextUrls = set(self._RE_URLS.findall(context))
 
         for url in answerUrls:
             # 정확 매칭 확인
@@ -635,7 +708,7 @@ class AnswerVerifier:
                 continue
 
             # 도메인이 알려진 조선호텔 도메인인지 확인
-            isKnownDomain = any(domain in url for domain in knownDomains)
+            isKnownDomain = any(domain in url for domain in self._KNOWN_DOMAINS)
 
             if not isKnownDomain:
                 issues.append(f"URL 할루시네이션: '{url[:60]}...' — 알 수 없는 도메인")
@@ -658,9 +731,8 @@ class AnswerVerifier:
         issues = []
 
         # 가격 추출
-        pricePattern = r'([\d,]+)\s*원'
-        answerPrices = re.findall(pricePattern, answer)
-        contextPrices = re.findall(pricePattern, context)
+        answerPrices = self._RE_PRICE_AMOUNTS.findall(answer)
+        contextPrices = self._RE_PRICE_AMOUNTS.findall(context)
 
         if not answerPrices or not contextPrices:
             return True, []
@@ -693,9 +765,12 @@ class AnswerVerifier:
     def removeForbiddenPhrases(self, answer: str) -> str:
         """금지 표현 제거"""
         cleanedAnswer = answer
-        for phrase in self.forbiddenPhrases:
-            cleanedAnswer = re.sub(phrase, '', cleanedAnswer, flags=re.IGNORECASE)
-        cleanedAnswer = re.sub(r'\n{3,}', '\n\n', cleanedAnswer).strip()
+        if self._forbiddenPhrasesAny is not None and self._forbiddenPhrasesAny.search(answer):
+            for compiledPhrase in self.forbiddenPhrases:
+                cleanedAnswer = compiledPhrase.sub('', cleanedAnswer)
+        if "\n\n\n" in cleanedAnswer:
+            cleanedAnswer = self._RE_EXCESS_NEWLINES.sub('\n\n', cleanedAnswer)
+        cleanedAnswer = cleanedAnswer.strip()
         return cleanedAnswer
 
 